@@ -0,0 +1,11 @@
+"""
+Benchmarks for the OpenVPN Prometheus Exporter
+
+Run from the repository root, e.g.:
+    python -m benchmarks.bench_collector
+
+The suite covers every status file format and records JSON results that
+can be compared across commits:
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --output after.json --compare before.json
+"""
@@ -0,0 +1,70 @@
+"""
+Compare the custom collector against re-inc()ing a persistent Counter registry
+
+The legacy path mirrors what the parser used to do on every scrape: one
+``.labels(**labels).inc(value)`` per client and counter, followed by
+``generate_latest``. The collector path renders the already parsed snapshot.
+"""
+
+import argparse
+import time
+
+from prometheus_client import CollectorRegistry, Counter, generate_latest
+
+from openvpn_exporter import CLIENT_LABELS, JOB_NAME, OpenVPNStatusParser
+from benchmarks.synthetic import server_status
+
+STATUS_PATH = '/var/log/openvpn/status.log'
+
+
+def legacy_scrape(registry: CollectorRegistry, received: Counter, sent: Counter, clients: dict) -> bytes:
+    for client in clients.values():
+        labels = {
+            'status_path': STATUS_PATH,
+            'common_name': client.common_name,
+            'real_address': client.real_address,
+            'virtual_address': client.virtual_address,
+            'username': client.username,
+            'job': JOB_NAME,
+            'connection_time': client.connection_time,
+        }
+        received.labels(**labels).inc(client.received_bytes)
+        sent.labels(**labels).inc(client.sent_bytes)
+    return generate_latest(registry)
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    status_parser = OpenVPNStatusParser([])
+    status_parser._parse_content(server_status(args.clients), STATUS_PATH)
+    clients = status_parser.snapshots[STATUS_PATH]['clients']
+
+    legacy_registry = CollectorRegistry()
+    received = Counter('openvpn_server_client_received_bytes_total', 'received', CLIENT_LABELS,
+                       registry=legacy_registry)
+    sent = Counter('openvpn_server_client_sent_bytes_total', 'sent', CLIENT_LABELS, registry=legacy_registry)
+
+    legacy = best_of(lambda: legacy_scrape(legacy_registry, received, sent, clients), args.repeat)
+    collector = best_of(lambda: generate_latest(status_parser.registry), args.repeat)
+
+    print(f"clients={args.clients}")
+    print(f"legacy labels().inc() + generate_latest: {legacy * 1000:8.1f} ms")
+    print(f"custom collector generate_latest:        {collector * 1000:8.1f} ms")
+    print(f"speedup: {legacy / collector:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare exposition formats: serialization time and payload size
+
+Renders the same collected metric families as Prometheus text, OpenMetrics
+(with per-client _created samples) and length-delimited protobuf, for a
+range of client counts.
+"""
+
+import argparse
+import gzip
+import time
+
+from openvpn_exporter import OpenVPNStatusParser, encode_families
+from benchmarks.synthetic import server_status
+
+STATUS_PATH = '/var/log/openvpn/status.log'
+FORMATS = ('text', 'openmetrics', 'protobuf')
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'format':<12} {'time':>10} {'size':>10} {'gzip':>9}")
+    for clients in args.clients:
+        status_parser = OpenVPNStatusParser([])
+        status_parser._parse_content(server_status(clients), STATUS_PATH)
+        families = list(status_parser.registry.collect())
+
+        for exposition_format in FORMATS:
+            elapsed = best_of(lambda: encode_families(families, exposition_format), args.repeat)
+            body = encode_families(families, exposition_format)
+            print(f"{clients:>8} {exposition_format:<12} {elapsed * 1000:8.1f}ms "
+                  f"{len(body) / 1e6:8.2f}MB {len(gzip.compress(body)) / 1e6:7.2f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Load test /metrics against the development server, gunicorn and the asyncio server
+
+Each server runs in a subprocess on a synthetic status file, with rate
+limiting lifted so that only serving throughput is measured. Concurrent
+clients issue keep-alive-free GET requests and report throughput and
+latency percentiles, alongside startup time and the resident memory of
+the server's process tree.
+"""
+
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+from benchmarks.synthetic import server_status
+
+STATUS_DIR = '/tmp/openvpn'  # One of SecurityValidator.ALLOWED_DIRS
+
+
+def wait_ready(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def load(port: int, concurrency: int, duration: float) -> List[float]:
+    latencies: List[float] = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        local = []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            conn.request('GET', '/metrics')
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            if response.status != 200:
+                errors.append(response.status)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise RuntimeError(f"{len(errors)} failed requests, e.g. HTTP {errors[0]}")
+    return latencies
+
+
+def tree_rss_kb(pid: int) -> int:
+    """Resident memory of a process and its descendants (Linux only)"""
+    total = 0
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            total += next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            children = [int(child) for child in f.read().split()]
+    except (OSError, StopIteration):
+        return total
+    return total + sum(tree_rss_kb(child) for child in children)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_server(name: str, server_args: List[str], status_path: str, port: int, args) -> None:
+    env = dict(os.environ, MAX_REQUESTS_PER_WINDOW=str(10 ** 9), LOG_LEVEL='ERROR')
+    command = [sys.executable, 'openvpn_exporter.py', '--web.listen-address', f'127.0.0.1:{port}',
+               '--openvpn.status_paths', status_path, '--collector.mode', args.collector_mode,
+               '--log-level', 'ERROR'] + server_args
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    start = time.perf_counter()
+    try:
+        wait_ready(port)
+        startup = time.perf_counter() - start
+        rss = tree_rss_kb(process.pid)
+        latencies = load(port, args.concurrency, args.duration)
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"{name:<32} {len(latencies) / args.duration:8.1f} req/s"
+          f"   p50 {percentile(latencies, 0.5) * 1000:7.1f} ms"
+          f"   p99 {percentile(latencies, 0.99) * 1000:7.1f} ms"
+          f"   startup {startup * 1000:6.0f} ms   rss {rss / 1024:6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--collector-mode', default='background', choices=['scrape', 'background'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--port', type=int, default=19176)
+    args = parser.parse_args()
+
+    os.makedirs(STATUS_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=STATUS_DIR, suffix='.status', delete=False) as f:
+        f.write(server_status(args.clients))
+    try:
+        print(f"clients={args.clients} concurrency={args.concurrency} collector={args.collector_mode}")
+        run_server('development server', ['--web.server', 'development'], f.name, args.port, args)
+        run_server('asyncio server', ['--web.server', 'async'], f.name, args.port + 3, args)
+        run_server(f'gunicorn 1 worker x {args.threads} threads',
+                   ['--web.server', 'gunicorn', '--web.workers', '1', '--web.threads', str(args.threads)],
+                   f.name, args.port + 1, args)
+        run_server(f'gunicorn {args.workers} workers x {args.threads} threads',
+                   ['--web.server', 'gunicorn', '--web.workers', str(args.workers),
+                    '--web.threads', str(args.threads)],
+                   f.name, args.port + 2, args)
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == '__main__':
+    main()
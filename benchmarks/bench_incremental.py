@@ -0,0 +1,65 @@
+"""
+Time re-rendering snapshots when only some clients changed between parses
+
+Each round rewrites the byte counters of a fraction of the clients, parses
+the new content and renders the text and OpenMetrics bodies. Renders
+reuse the samples and lines of unchanged series; the cold rows drop those
+caches first, as if every series had changed.
+"""
+
+import argparse
+import time
+
+from openvpn_exporter import OpenVPNExporter, SampleLineCache, encode_families
+from benchmarks.synthetic import server_status
+
+STATUS_PATH = '/var/log/openvpn/status.log'
+
+
+def with_changed_clients(content: str, fraction: float, round_number: int) -> str:
+    """Bump the bytes received of every 1/fraction-th client"""
+    step = max(1, int(1 / fraction)) if fraction > 0 else 0
+    lines = content.split('\n')
+    for index, line in enumerate(lines):
+        if step and line.startswith('CLIENT_LIST') and index % step == 0:
+            fields = line.split(',')
+            fields[5] = str(int(fields[5]) + round_number)
+            lines[index] = ','.join(fields)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--fractions', type=float, nargs='+', default=[0.0, 0.01, 0.1, 1.0])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    content = server_status(args.clients)
+    print(f"clients={args.clients}")
+    for cold in (True, False):
+        for fraction in args.fractions:
+            exporter = OpenVPNExporter([])
+            exporter.parser._parse_content(content, STATUS_PATH)
+            exporter.render_snapshot()
+            parse_times, render_times = [], []
+            for round_number in range(1, args.rounds + 1):
+                changed = with_changed_clients(content, fraction, round_number)
+                if cold:
+                    exporter.sample_lines = SampleLineCache()
+                    collector = exporter.parser.metrics_collector
+                    collector._client_samples, collector._route_samples = {}, {}
+                start = time.perf_counter()
+                exporter.parser._parse_content(changed, STATUS_PATH)
+                parsed = time.perf_counter()
+                snapshot = exporter.render_snapshot()
+                encode_families(snapshot.families, 'openmetrics', exporter.sample_lines)
+                parse_times.append(parsed - start)
+                render_times.append(time.perf_counter() - parsed)
+            diff = exporter.parser.snapshots[STATUS_PATH]['diff']
+            print(f"{'cold' if cold else 'incremental':<12} changed={fraction:>5.0%} ({diff.changed:>6} series)"
+                  f"   parse {min(parse_times) * 1000:7.1f} ms   render {min(render_times) * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Time the logging overhead of parsing CLIENT LIST status files
+
+Logs go through the exporter's structlog JSON chain to a discarded
+stream. Rows are parsed at INFO level and, at DEBUG level, with every
+n-th row traced. Run against different commits to compare.
+"""
+
+import argparse
+import io
+import logging
+import time
+
+import openvpn_exporter
+from openvpn_exporter import OpenVPNStatusParser, configure_logging
+from benchmarks.synthetic import client_list
+
+STATUS_PATH = '/var/log/openvpn/status.log'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--trace-every', type=int, nargs='+', default=[100, 1])
+    args = parser.parse_args()
+
+    sink = io.StringIO()
+    handler = logging.StreamHandler(sink)
+    logging.getLogger().addHandler(handler)
+    content = client_list(args.clients)
+    rows = content.count('\n')
+
+    runs = [('INFO', 0)] + [('DEBUG', every) for every in args.trace_every]
+    for level, every in runs:
+        # Tracing was added later; older commits take the level only
+        tracing = hasattr(openvpn_exporter, 'ROW_TRACE')
+        configure_logging(level, every, float('inf')) if tracing else configure_logging(level)
+        status_parser = OpenVPNStatusParser([])
+        timings = []
+        for _ in range(args.repeat):
+            sink.seek(0)
+            sink.truncate()
+            start = time.perf_counter()
+            status_parser._parse_content(content, STATUS_PATH)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        label = f"{level} trace every {every}" if every else level
+        print(f"{label:<24} clients={args.clients} total={best * 1000:8.1f} ms "
+              f"per_row={best / rows * 1e6:6.2f} us   logged {sink.getvalue().count(chr(10))} lines")
+
+
+if __name__ == '__main__':
+    main()
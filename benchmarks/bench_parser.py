@@ -0,0 +1,37 @@
+"""
+Time server status parsing per row on large synthetic status files
+
+Run against different commits to compare parser changes.
+"""
+
+import argparse
+import time
+
+from openvpn_exporter import OpenVPNStatusParser
+from benchmarks.synthetic import server_status
+
+STATUS_PATH = '/var/log/openvpn/status.log'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    status_parser = OpenVPNStatusParser([])
+    for name, separator in (('v2', ','), ('v3', '\t')):
+        content = server_status(args.clients, separator)
+        rows = content.count('\n')
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            status_parser._parse_content(content, STATUS_PATH)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{name}: clients={args.clients} rows={rows} "
+              f"total={best * 1000:.1f} ms per_row={best / rows * 1e6:.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Time suspicious content validation on large status file content
+
+Compares SecurityValidator.validate_file_content with the previous
+one-re.search-per-pattern scan, on whole inputs and on the streaming
+parser's batches.
+"""
+
+import argparse
+import re
+import time
+
+from openvpn_exporter import OpenVPNStatusParser, SecurityValidator
+from benchmarks.synthetic import server_status
+
+
+def sequential_scan(content: str) -> bool:
+    """The previous implementation: one full scan per pattern"""
+    for pattern in SecurityValidator.SUSPICIOUS_PATTERNS:
+        if re.search(pattern, content, re.IGNORECASE):
+            return False
+    return True
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    content = server_status(size // 100)
+    while len(content) < size:
+        content += content
+    content = content[:size]
+
+    batch_size = OpenVPNStatusParser.VALIDATION_BATCH_SIZE
+    batches = [content[i:i + batch_size] for i in range(0, len(content), batch_size)]
+    validator = SecurityValidator()
+
+    print(f"size={len(content) / 1024 / 1024:.1f}MB batches={len(batches)}")
+    for name, scan in (('sequential', sequential_scan), ('validate_file_content', validator.validate_file_content)):
+        whole = best_of(lambda: scan(content), args.repeat)
+        batched = best_of(lambda: [scan(batch) for batch in batches], args.repeat)
+        print(f"{name:<24} whole {whole * 1000:8.1f} ms   batched {batched * 1000:8.1f} ms"
+              f"   {len(content) / whole / 1e6:7.1f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
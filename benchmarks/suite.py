@@ -0,0 +1,163 @@
+"""
+Run the benchmark suite over every status file format and record the results as JSON
+
+For each synthetic status file (v2, v3 with shuffled columns and IPv6
+addresses, CLIENT LIST and client STATISTICS) this times
+parse_status_file, generate_latest on the parsed registry, and /metrics
+round trips through the Flask test client, both for an unchanged file
+(rendering only) and a changed one (parse and render). Results are
+written as JSON; pass a previous run with --compare to flag regressions
+between commits.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from prometheus_client import generate_latest
+
+from openvpn_exporter import VERSION, OpenVPNStatusParser, SecurityValidator, configure_logging, create_app
+from benchmarks.synthetic import client_list, client_statistics, server_status
+
+STATUS_DIR = '/tmp/openvpn'  # One of SecurityValidator.ALLOWED_DIRS
+
+
+def scenarios(clients: int, routes: int) -> Dict[str, str]:
+    """Status file content per scenario name"""
+    return {
+        'server-v2': server_status(clients, ',', routes=routes),
+        'server-v3-ipv6-shuffled': server_status(clients, '\t', routes=routes, ipv6=True, shuffle_columns=True),
+        'client-list': client_list(clients, routes=routes),
+        'client-statistics': client_statistics(),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int, before: Optional[Callable[[], None]] = None) -> List[float]:
+    """Durations of repeat calls of func, each preceded by an untimed call of before"""
+    timings = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_scenario(status_path: str, repeat: int) -> Dict[str, List[float]]:
+    parser = OpenVPNStatusParser([status_path])
+    results = {
+        # Drop the parse cache so every round parses the file
+        'parse_status_file': measure(lambda: parser.parse_status_file(status_path), repeat,
+                                     before=parser._parse_cache.clear),
+        'generate_latest': measure(lambda: generate_latest(parser.registry), repeat),
+    }
+
+    client = create_app([status_path]).test_client()
+
+    def get_metrics():
+        response = client.get('/metrics')
+        if response.status_code != 200:
+            raise RuntimeError(f"/metrics returned HTTP {response.status_code}")
+
+    def touch():
+        stat = os.stat(status_path)
+        os.utime(status_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+    get_metrics()
+    results['metrics_unchanged'] = measure(get_metrics, repeat)
+    results['metrics_changed'] = measure(get_metrics, repeat, before=touch)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    """Print the change of each best run against a previous run; return the number of regressions"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(result['scenario'], result['benchmark']): result for result in baseline['results']}
+    print(f"\ncompared with {baseline.get('revision') or baseline_path}:")
+    regressions = 0
+    for result in results:
+        before = previous.get((result['scenario'], result['benchmark']))
+        if before is None or before['clients'] != result['clients'] or before['routes'] != result['routes']:
+            continue
+        ratio = result['min_seconds'] / before['min_seconds']
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+        print(f"{result['scenario']:<26} {result['benchmark']:<20} {ratio:6.2f}x{'   REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--routes', type=int, default=None, help='Routing table entries (default: one per client)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--compare', metavar='RESULTS_JSON', help='Previous results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown of a best run reported as a regression')
+    args = parser.parse_args()
+    routes = args.clients if args.routes is None else args.routes
+
+    configure_logging('WARNING')
+    # Only serving is measured, not the rate limiter
+    SecurityValidator.MAX_REQUESTS_PER_WINDOW = 10 ** 9
+    os.makedirs(STATUS_DIR, exist_ok=True)
+
+    results = []
+    print(f"clients={args.clients} routes={routes} repeat={args.repeat}")
+    for scenario, content in scenarios(args.clients, routes).items():
+        with tempfile.NamedTemporaryFile('w', dir=STATUS_DIR, suffix='.status', delete=False) as f:
+            f.write(content)
+        try:
+            timings = bench_scenario(f.name, args.repeat)
+        finally:
+            os.unlink(f.name)
+        for benchmark, runs in timings.items():
+            results.append({
+                'scenario': scenario,
+                'benchmark': benchmark,
+                'clients': args.clients,
+                'routes': routes,
+                'bytes': len(content),
+                'min_seconds': min(runs),
+                'median_seconds': statistics.median(runs),
+                'runs': runs,
+            })
+            print(f"{scenario:<26} {benchmark:<20} min {min(runs) * 1000:9.2f} ms"
+                  f"   median {statistics.median(runs) * 1000:9.2f} ms")
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'revision': git_revision(),
+            'version': VERSION,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Synthetic OpenVPN status file generator for benchmarks
+"""
+
+import random
+from typing import List, Optional
+
+CLIENT_LIST_HEADER = ['Common Name', 'Real Address', 'Virtual Address', 'Virtual IPv6 Address', 'Bytes Received',
+                      'Bytes Sent', 'Connected Since', 'Connected Since (time_t)', 'Username', 'Client ID',
+                      'Peer ID', 'Data Channel Cipher']
+ROUTING_TABLE_HEADER = ['Virtual Address', 'Common Name', 'Real Address', 'Last Ref', 'Last Ref (time_t)']
+
+# Counters of a client status file, in the order OpenVPN writes them
+CLIENT_STATISTICS = ['TUN/TAP read bytes', 'TUN/TAP write bytes', 'TCP/UDP read bytes', 'TCP/UDP write bytes',
+                     'Auth read bytes', 'pre-compress bytes', 'post-compress bytes', 'pre-decompress bytes',
+                     'post-decompress bytes']
+
+
+def _real_address(i: int) -> str:
+    return f'198.51.{(i >> 8) & 255}.{i & 255}:{1024 + i % 60000}'
+
+
+def _virtual_address(i: int) -> str:
+    return f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}'
+
+
+def _virtual_ipv6_address(i: int) -> str:
+    return f'fd00::{i + 2:x}'
+
+
+def _reorder(row: List[str], order: Optional[List[int]]) -> List[str]:
+    """Reorder the columns after the row type"""
+    return row if order is None else row[:1] + [row[1 + idx] for idx in order]
+
+
+def server_status(clients: int, separator: str = ',', seed: Optional[int] = 0, routes: Optional[int] = None,
+                  ipv6: bool = False, shuffle_columns: bool = False) -> str:
+    """Generate a server status file (v2 comma or v3 tab delimited) with the given number of clients.
+
+    There is one route per client unless routes is given; routes beyond
+    the clients' own are IPv6 addresses of clients, cycling through them.
+    With ipv6 clients get a virtual IPv6 address, and with shuffle_columns
+    the HEADER lines list the columns in a random order, followed by the rows.
+    """
+    rng = random.Random(seed)
+    routes = clients if routes is None else routes
+    client_order = routing_order = None
+    if shuffle_columns:
+        shuffler = random.Random(seed)
+        client_order = shuffler.sample(range(len(CLIENT_LIST_HEADER)), len(CLIENT_LIST_HEADER))
+        routing_order = shuffler.sample(range(len(ROUTING_TABLE_HEADER)), len(ROUTING_TABLE_HEADER))
+
+    now = 1727420000
+    lines = [
+        separator.join(['TITLE', 'OpenVPN 2.6.12 x86_64-pc-linux-gnu']),
+        separator.join(['TIME', 'Fri Sep 27 07:33:20 2024', str(now)]),
+        separator.join(['HEADER'] + _reorder(['CLIENT_LIST'] + CLIENT_LIST_HEADER, client_order)),
+    ]
+    routing_rows = []
+    for i in range(clients):
+        common_name = f'client{i}'
+        real_address = _real_address(i)
+        virtual_address = _virtual_address(i)
+        connected = now - rng.randint(60, 86400)
+        lines.append(separator.join(_reorder([
+            'CLIENT_LIST', common_name, real_address, virtual_address, _virtual_ipv6_address(i) if ipv6 else '',
+            str(rng.randint(0, 10 ** 10)), str(rng.randint(0, 10 ** 10)),
+            'Fri Sep 27 07:00:00 2024', str(connected), common_name, str(i), str(i), 'AES-256-GCM',
+        ], client_order)))
+        if i < routes:
+            routing_rows.append(separator.join(_reorder([
+                'ROUTING_TABLE', virtual_address, common_name, real_address,
+                'Fri Sep 27 07:30:00 2024', str(now - rng.randint(0, 600)),
+            ], routing_order)))
+    for j in range(clients, routes):
+        i = j % clients
+        routing_rows.append(separator.join(_reorder([
+            'ROUTING_TABLE', _virtual_ipv6_address(j), f'client{i}', _real_address(i),
+            'Fri Sep 27 07:30:00 2024', str(now - rng.randint(0, 600)),
+        ], routing_order)))
+    lines.append(separator.join(['HEADER'] + _reorder(['ROUTING_TABLE'] + ROUTING_TABLE_HEADER, routing_order)))
+    lines.extend(routing_rows)
+    lines.append(separator.join(['GLOBAL_STATS', 'Max bcast/mcast queue length', '0']))
+    lines.append('END')
+    return '\n'.join(lines) + '\n'
+
+
+def client_list(clients: int, seed: Optional[int] = 0, routes: Optional[int] = None) -> str:
+    """Generate an "OpenVPN CLIENT LIST" status file with the given number of clients.
+
+    There is one route per client unless routes is given; routes beyond
+    the clients' own cycle through the clients.
+    """
+    rng = random.Random(seed)
+    routes = clients if routes is None else routes
+    lines = ['OpenVPN CLIENT LIST', 'Updated,2024-09-27 07:33:20',
+             'Common Name,Real Address,Bytes Received,Bytes Sent,Connected Since']
+    routing_rows = ['ROUTING TABLE', 'Virtual Address,Common Name,Real Address,Last Ref']
+    for i in range(clients):
+        common_name = f'client{i}'
+        real_address = _real_address(i)
+        lines.append(','.join([
+            common_name, real_address, str(rng.randint(0, 10 ** 10)), str(rng.randint(0, 10 ** 10)),
+            f'2024-09-27 {rng.randint(0, 6):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}',
+        ]))
+    for j in range(routes):
+        i = j % clients
+        virtual_address = _virtual_address(i) if j < clients else _virtual_ipv6_address(j)
+        routing_rows.append(','.join([virtual_address, f'client{i}', _real_address(i), '2024-09-27 07:30:00']))
+    lines.extend(routing_rows)
+    lines.extend(['GLOBAL STATS', 'Max bcast/mcast queue length,0', 'END'])
+    return '\n'.join(lines) + '\n'
+
+
+def client_statistics(seed: Optional[int] = 0) -> str:
+    """Generate an "OpenVPN STATISTICS" client status file"""
+    rng = random.Random(seed)
+    lines = ['OpenVPN STATISTICS', 'Updated,Fri Sep 27 07:33:20 2024']
+    lines.extend(f'{name},{rng.randint(0, 10 ** 10)}' for name in CLIENT_STATISTICS)
+    lines.append('END')
+    return '\n'.join(lines) + '\n'
@@ -13,33 +13,75 @@ Security improvements:
 - Content validation
 """
 
+import io
 import os
 import sys
 import logging
 import argparse
+import asyncio
 import time
+import math
 import re
 import hashlib
 import hmac
+import ipaddress
+import zoneinfo
+import importlib.metadata
+import platform
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Union
-from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple, Any, Union
+from datetime import datetime, timezone, tzinfo
 import json
-from functools import wraps
-from collections import defaultdict
+from functools import lru_cache, partial, wraps
+from bisect import bisect_right
+from operator import itemgetter
+from collections import OrderedDict, defaultdict
 import threading
+import select
+import socket
+import struct
+import gzip
+import tempfile
+import ctypes
+import ctypes.util
+from itertools import chain
+import multiprocessing
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from urllib.parse import urlparse
+from http import HTTPStatus
+from email.utils import formatdate, parsedate_to_datetime
 
 from prometheus_client import (
     Counter, Gauge, Histogram, Info, 
     generate_latest, CONTENT_TYPE_LATEST,
     CollectorRegistry, REGISTRY
 )
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.metrics_core import Metric
+from prometheus_client.samples import Sample
+from prometheus_client.utils import floatToGoString
+from prometheus_client.openmetrics.exposition import (
+    generate_latest as generate_openmetrics, CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE
+)
 from flask import Flask, Response, request, jsonify, abort
 from dotenv import load_dotenv
-import validators
 import structlog
 
+try:
+    import fcntl
+except ImportError:  # Windows; shared snapshots between server workers need it
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:  # Optional; /metrics is then compressed with gzip only
+    zstandard = None
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # Optional; main() falls back to the development server
+    BaseApplication = None
+
 # Load environment variables
 load_dotenv()
 
@@ -64,6 +106,238 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+class RowTracer:
+    """Sampled, rate-limited debug trace of individual status file rows.
+    
+    Disabled unless every is set: then every n-th row is traced, at most
+    max_per_second rows a second. Call sites check `every` and sample()
+    before building the log event, so untraced rows cost an attribute
+    lookup. Sampling is approximate when files are parsed concurrently.
+    """
+    
+    def __init__(self, every: int = 0, max_per_second: float = 10.0):
+        self.configure(every, max_per_second)
+    
+    def configure(self, every: int, max_per_second: float):
+        self.every = every
+        self.max_per_second = max_per_second
+        self._countdown = every
+        self._tokens = max_per_second
+        self._refilled_at = time.monotonic()
+        self.suppressed = 0  # Sampled rows dropped by the rate limit
+    
+    def sample(self) -> bool:
+        """Whether to trace the current row"""
+        self._countdown -= 1
+        if self._countdown > 0:
+            return False
+        self._countdown = self.every
+        
+        now = time.monotonic()
+        self._tokens = min(self.max_per_second, self._tokens + (now - self._refilled_at) * self.max_per_second)
+        self._refilled_at = now
+        if self._tokens < 1:
+            self.suppressed += 1
+            return False
+        self._tokens -= 1
+        return True
+
+# Per-row tracing of status file parsing, set up by configure_logging
+ROW_TRACE = RowTracer()
+
+class RateLimiter:
+    """Per-client token buckets with constant-time checks and a bounded client table.
+    
+    Each client may burst up to capacity requests, refilled at
+    capacity / window per second. Clients are spread over independently
+    locked shards, each keeping its clients in least recently seen order, so
+    idle clients (whose bucket has refilled) and the least recently seen ones
+    beyond max_clients are dropped without scanning the table.
+    """
+    
+    SHARDS = 16
+    
+    def __init__(self, capacity: int, window: float, max_clients: int = 10000):
+        self.capacity = capacity
+        self.window = window
+        self.rate = capacity / window if window > 0 else float('inf')
+        self._shard_size = max(1, max_clients // self.SHARDS)
+        # client -> [tokens, last request time]
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(self.SHARDS)]
+    
+    def allow(self, client: str) -> bool:
+        """Take a token from the client's bucket; False if it is empty"""
+        lock, buckets = self._shards[hash(client) % self.SHARDS]
+        now = time.monotonic()
+        with lock:
+            bucket = buckets.get(client)
+            if bucket is None:
+                bucket = buckets[client] = [float(self.capacity), now]
+            else:
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                buckets.move_to_end(client)
+            
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            
+            # A client idle for a whole window is indistinguishable from a new one
+            oldest, (_, last_seen) = next(iter(buckets.items()))
+            if now - last_seen >= self.window or len(buckets) > self._shard_size:
+                del buckets[oldest]
+            return allowed
+    
+    def __len__(self) -> int:
+        return sum(len(buckets) for _, buckets in self._shards)
+
+class IPNetworkSet:
+    """Set of IP networks with logarithmic membership tests.
+    
+    Entries are addresses or CIDR networks. They are compiled into sorted,
+    merged integer ranges per IP version and looked up by bisection; the
+    result for each address string is cached, so repeated scrapers are
+    answered from the cache.
+    """
+    
+    CACHE_SIZE = 4096
+    
+    def __init__(self, entries: Iterable[str]):
+        ranges: Dict[int, List[Tuple[int, int]]] = {4: [], 6: []}
+        for entry in entries:
+            try:
+                network = ipaddress.ip_network(entry.strip(), strict=False)
+            except ValueError:
+                logger.warning("Ignoring invalid IP network", entry=entry)
+                continue
+            ranges[network.version].append((int(network.network_address), int(network.broadcast_address)))
+        
+        # version -> (range starts, range ends), non-overlapping and sorted
+        self._ranges: Dict[int, Tuple[List[int], List[int]]] = {}
+        for version, version_ranges in ranges.items():
+            starts: List[int] = []
+            ends: List[int] = []
+            for start, end in sorted(version_ranges):
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._ranges[version] = (starts, ends)
+        self._contains = lru_cache(maxsize=self.CACHE_SIZE)(self._lookup)
+    
+    def __contains__(self, address: str) -> bool:
+        return self._contains(address)
+    
+    def __len__(self) -> int:
+        return sum(len(starts) for starts, _ in self._ranges.values())
+    
+    def _lookup(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address.strip())
+        except ValueError:
+            return False
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        starts, ends = self._ranges[ip.version]
+        value = int(ip)
+        index = bisect_right(starts, value) - 1
+        return index >= 0 and value <= ends[index]
+
+def resolve_client_ip(remote_addr: str, forwarded_for: Optional[str], trusted_proxies: IPNetworkSet) -> str:
+    """Address of the client behind any trusted proxies.
+    
+    X-Forwarded-For is only honoured when the connection comes from a
+    trusted proxy. Its hops are then walked from the nearest one, and the
+    first address that is not itself a trusted proxy is the client.
+    """
+    if not forwarded_for or remote_addr not in trusted_proxies:
+        return remote_addr
+    hops = [hop.strip() for hop in forwarded_for.split(',') if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in trusted_proxies:
+            return hop
+    return hops[0] if hops else remote_addr
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Integer setting from the environment, falling back to default when unset or invalid.
+    
+    Read when the module is imported, so a malformed value (e.g. an inline
+    comment kept by docker --env-file) is logged instead of failing the import.
+    """
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+    if number is None or number < minimum:
+        logger.warning("Invalid integer setting, using the default", setting=name, value=value[:50], default=default)
+        return default
+    return number
+
+# Client identities repeat across scrapes, so the per-row validators are
+# memoized in bounded least recently used caches shared by all validators. The
+# caches are sized when the module is imported, so only the environment sets it
+VALIDATION_CACHE_SIZE = _env_int('VALIDATION_CACHE_SIZE', 65536)
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _sanitize_label(value: str) -> str:
+    # Remove any path traversal attempts
+    value = value.replace('..', '').replace('/', '').replace('\\', '')
+    # Remove any non-alphanumeric characters except dots, hyphens, and underscores
+    value = re.sub(r'[^a-zA-Z0-9.\-_]', '', value)
+    
+    # Limit length
+    return value[:100] or "unknown"
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _is_ip_address(value: str) -> bool:
+    try:
+        if '/' in value:
+            ipaddress.ip_interface(value)  # Networks, e.g. iroute entries in the routing table
+        else:
+            ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+MONTHS = {name: number for number, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def parse_status_time(value: str, tz: Optional[tzinfo] = None) -> float:
+    """Seconds since the epoch of a status file time in the zone tz, or this host's local time for None.
+    
+    OpenVPN writes times as "2024-09-27 07:30:00" or "Fri Sep 27 07:30:00 2024",
+    both parsed by slicing. Connection times repeat across scrapes, so results
+    are memoized on the raw string.
+    """
+    if len(value) == 19 and value[4] == '-' and value[7] == '-' and value[10] == ' ':
+        year, month, day, clock = int(value[0:4]), int(value[5:7]), int(value[8:10]), value[11:]
+    else:
+        parts = value.split()
+        if len(parts) != 5 or parts[1] not in MONTHS:
+            raise ValueError(f"Unrecognized status file time: {value[:50]!r}")
+        year, month, day, clock = int(parts[4]), MONTHS[parts[1]], int(parts[2]), parts[3]
+    if len(clock) != 8 or clock[2] != ':' or clock[5] != ':':
+        raise ValueError(f"Unrecognized status file time: {value[:50]!r}")
+    return datetime(year, month, day, int(clock[0:2]), int(clock[3:5]), int(clock[6:8]), tzinfo=tz).timestamp()
+
+def status_timezone(name: Optional[str]) -> Optional[tzinfo]:
+    """The zone of status file times: an IANA name, None/empty for UTC, or 'local' for this host's local time"""
+    if not name or name.upper() == 'UTC':
+        return timezone.utc
+    if name.lower() == 'local':
+        return None
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone: {name}") from e
+
+VALIDATION_CACHES = {'sanitize': _sanitize_label, 'ip_address': _is_ip_address, 'status_time': parse_status_time}
+
 class SecurityValidator:
     """Enhanced security validation utilities"""
     
@@ -75,16 +349,43 @@ class SecurityValidator:
         Path("./examples"),  # For testing
     ]
     
-    # Maximum file size (10MB)
-    MAX_FILE_SIZE = 10 * 1024 * 1024
+    # Maximum file size (64MB by default); status files are streamed, so memory
+    # use does not grow with this limit
+    MAX_FILE_SIZE = _env_int('MAX_FILE_SIZE', 64 * 1024 * 1024)
     
     # Rate limiting
-    RATE_LIMIT_WINDOW = 60  # seconds
-    MAX_REQUESTS_PER_WINDOW = 100
+    RATE_LIMIT_WINDOW = _env_int('RATE_LIMIT_WINDOW', 60)  # seconds
+    MAX_REQUESTS_PER_WINDOW = _env_int('MAX_REQUESTS_PER_WINDOW', 100)
+    RATE_LIMIT_MAX_CLIENTS = _env_int('RATE_LIMIT_MAX_CLIENTS', 10000)
     
-    def __init__(self):
-        self.request_counts = defaultdict(list)
-        self.lock = threading.Lock()
+    # Suspicious content patterns, matched case-insensitively
+    SUSPICIOUS_PATTERNS = [
+        r'<script[^>]*>',
+        r'javascript:',
+        r'vbscript:',
+        r'data:text/html',
+        r'<iframe[^>]*>',
+        r'<object[^>]*>',
+        r'<embed[^>]*>',
+    ]
+    # The same patterns as two scans anchored on a literal '<' or ':', which
+    # re can skip to directly; a case-insensitive alternation of all seven
+    # has no literal prefix and tests every position
+    SUSPICIOUS_CONTENT = (
+        re.compile(r'<(?i:script|iframe|object|embed)[^>]*>'),
+        re.compile(r':(?:(?<=(?i:javascript):)|(?<=(?i:vbscript):)|(?<=(?i:data):)(?i:text/html))'),
+    )
+    # Opening of a suspicious tag; content validated in pieces carries an unclosed one over
+    SUSPICIOUS_TAG_OPENING = re.compile(r'<(?i:script|iframe|object|embed)')
+    
+    def __init__(self, self_metrics: Optional['ExporterSelfMetrics'] = None):
+        self.rate_limiter = RateLimiter(self.MAX_REQUESTS_PER_WINDOW, self.RATE_LIMIT_WINDOW,
+                                        self.RATE_LIMIT_MAX_CLIENTS)
+        self._allowed_requests = self._limited_requests = None
+        if self_metrics is not None:
+            self._allowed_requests = self_metrics.rate_limit_decisions.labels(decision='allowed')
+            self._limited_requests = self_metrics.rate_limit_decisions.labels(decision='limited')
+            self_metrics.rate_limit_tracked_clients.set_function(self.rate_limiter.__len__)
     
     def validate_path(self, path: str) -> bool:
         """Validate file path to prevent path traversal attacks"""
@@ -109,26 +410,14 @@ class SecurityValidator:
         """Sanitize filename to prevent injection attacks"""
         if not filename:
             return "unknown"
-        
-        # Remove any path traversal attempts
-        filename = filename.replace('..', '').replace('/', '').replace('\\', '')
-        # Remove any non-alphanumeric characters except dots, hyphens, and underscores
-        filename = re.sub(r'[^a-zA-Z0-9.\-_]', '', filename)
-        
-        # Limit length
-        filename = filename[:100]
-        
-        return filename or "unknown"
+        return _sanitize_label(filename)
     
     def validate_ip_address(self, ip: str) -> bool:
         """Validate IP address format"""
         if not ip or ip == "unknown":
             return True  # Allow unknown IPs
         
-        try:
-            return validators.ipv4(ip) or validators.ipv6(ip)
-        except Exception:
-            return False
+        return _is_ip_address(ip)
     
     def validate_file_content(self, content: str) -> bool:
         """Validate file content for suspicious patterns"""
@@ -136,18 +425,13 @@ class SecurityValidator:
             return False
         
         # Check for suspicious content
-        suspicious_patterns = [
-            r'<script[^>]*>',
-            r'javascript:',
-            r'vbscript:',
-            r'data:text/html',
-            r'<iframe[^>]*>',
-            r'<object[^>]*>',
-            r'<embed[^>]*>',
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
+        for scanner in self.SUSPICIOUS_CONTENT:
+            match = scanner.search(content)
+            if match:
+                # Name the pattern that matched, from the text around the match
+                context = content[max(0, match.start() - len('javascript')):match.end()]
+                pattern = next((pattern for pattern in self.SUSPICIOUS_PATTERNS
+                                if re.search(pattern, context, re.IGNORECASE)), match.re.pattern)
                 logger.warning("Suspicious content detected", pattern=pattern)
                 return False
         
@@ -155,523 +439,1191 @@ class SecurityValidator:
     
     def check_rate_limit(self, client_ip: str) -> bool:
         """Check if client has exceeded rate limit"""
-        current_time = time.time()
-        
-        with self.lock:
-            # Clean old requests
-            self.request_counts[client_ip] = [
-                req_time for req_time in self.request_counts[client_ip]
-                if current_time - req_time < self.RATE_LIMIT_WINDOW
-            ]
-            
-            # Check if limit exceeded
-            if len(self.request_counts[client_ip]) >= self.MAX_REQUESTS_PER_WINDOW:
-                logger.warning("Rate limit exceeded", client_ip=client_ip)
-                return False
-            
-            # Add current request
-            self.request_counts[client_ip].append(current_time)
+        if self.rate_limiter.allow(client_ip):
+            if self._allowed_requests is not None:
+                self._allowed_requests.inc()
             return True
+        
+        if self._limited_requests is not None:
+            self._limited_requests.inc()
+        logger.warning("Rate limit exceeded", client_ip=client_ip)
+        return False
 
-class OpenVPNStatusParser:
-    """Enhanced OpenVPN status file parser with security improvements"""
+VERSION = "2.0.4"
+JOB_NAME = "openvpn-metrics"
+
+# Phases of a status file parse, timed by openvpn_exporter_parse_phase_duration_seconds
+PARSE_PHASES = ('read', 'validate', 'parse')
+# Seconds; parses of small files take well under a millisecond, large ones seconds
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label names of the per-client and per-route metrics, in exposition order
+CLIENT_LABELS = ['status_path', 'common_name', 'real_address', 'virtual_address', 'username', 'job', 'connection_time']
+ROUTE_LABELS = ['status_path', 'common_name', 'real_address', 'virtual_address', 'job']
+
+# Client-mode statistics counters: metric name -> help text
+CLIENT_STATISTICS_METRICS = {
+    'openvpn_client_tun_tap_read_bytes': 'Total amount of TUN/TAP traffic read, in bytes',
+    'openvpn_client_tun_tap_write_bytes': 'Total amount of TUN/TAP traffic written, in bytes',
+    'openvpn_client_tcp_udp_read_bytes': 'Total amount of TCP/UDP traffic read, in bytes',
+    'openvpn_client_tcp_udp_write_bytes': 'Total amount of TCP/UDP traffic written, in bytes',
+    'openvpn_client_auth_read_bytes': 'Total amount of authentication traffic read, in bytes',
+    'openvpn_client_pre_compress_bytes': 'Total amount of data before compression, in bytes',
+    'openvpn_client_post_compress_bytes': 'Total amount of data after compression, in bytes',
+    'openvpn_client_pre_decompress_bytes': 'Total amount of data before decompression, in bytes',
+    'openvpn_client_post_decompress_bytes': 'Total amount of data after decompression, in bytes',
+}
+
+# Client status file keys -> client statistics metric name
+CLIENT_STATISTICS_FIELDS = {
+    'TUN/TAP read bytes': 'openvpn_client_tun_tap_read_bytes',
+    'TUN/TAP write bytes': 'openvpn_client_tun_tap_write_bytes',
+    'TCP/UDP read bytes': 'openvpn_client_tcp_udp_read_bytes',
+    'TCP/UDP write bytes': 'openvpn_client_tcp_udp_write_bytes',
+    'Auth read bytes': 'openvpn_client_auth_read_bytes',
+    'pre-compress bytes': 'openvpn_client_pre_compress_bytes',
+    'post-compress bytes': 'openvpn_client_post_compress_bytes',
+    'pre-decompress bytes': 'openvpn_client_pre_decompress_bytes',
+    'post-decompress bytes': 'openvpn_client_post_decompress_bytes',
+}
+
+# Management interface load-stats fields: field -> (metric name without _total, help)
+SERVER_STATISTICS_METRICS = {
+    'bytesin': ('openvpn_server_received_bytes', 'Total amount of data received by the VPN server, in bytes'),
+    'bytesout': ('openvpn_server_sent_bytes', 'Total amount of data sent by the VPN server, in bytes'),
+}
+
+# Server status (v2/v3) column lookups: (candidates, default) per extracted field.
+# Candidates are tried in order; header column names are resolved from the HEADER
+# line, integers are positional fallbacks. Positions count the leading row type field.
+CLIENT_LIST_COLUMNS = (
+    (('common name', 1), 'unknown'),
+    (('real address', 2), 'unknown'),
+    (('virtual address', 3), 'unknown'),
+    (('username', 8), 'unknown'),
+    (('connected since (time_t)', 7, 'connected since'), ''),
+    (('bytes received', 4), '0'),
+    (('bytes sent', 5), '0'),
+)
+CLIENT_LIST_IPV6_COLUMNS = (
+    (('virtual ipv6 address', 'virtual ipv6'), ''),
+)
+ROUTING_TABLE_COLUMNS = (
+    (('virtual address', 1), 'unknown'),
+    (('common name', 2), 'unknown'),
+    (('real address', 3), 'unknown'),
+    (('last ref (time_t)', 5, 'last ref', 4), ''),
+)
+
+class ClientRecord(NamedTuple):
+    """A connected client, as produced by every status file parser.
     
-    def __init__(self, status_paths: List[str], ignore_individuals: bool = False):
-        self.status_paths = status_paths
-        self.ignore_individuals = ignore_individuals
-        self.validator = SecurityValidator()
+    The label fields identify the client's series. Parsers share one string
+    per distinct name or address between a file's client and route records.
+    """
+    common_name: str
+    real_address: str
+    virtual_address: str
+    username: str
+    connection_time: str
+    received_bytes: float
+    sent_bytes: float
+    
+    @property
+    def key(self) -> Tuple[str, str, str, str, str]:
+        return self[:5]
+
+class RouteRecord(NamedTuple):
+    """A routing table entry, identified by its label fields"""
+    common_name: str
+    real_address: str
+    virtual_address: str
+    last_reference: float
+    
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self[:3]
+
+class SnapshotDiff(NamedTuple):
+    """Changes between consecutive snapshots of one status file"""
+    connects: int
+    disconnects: int
+    changed: int  # Client and route series that are new or have new values
+    unchanged: int
+
+def _normalize_column(name: str) -> str:
+    """Normalize a header column name (case-insensitive, underscores as spaces)"""
+    return name.strip().lower().replace('_', ' ')
+
+class ColumnAccessor:
+    """Row field extractor compiled once from a status file HEADER line"""
+    
+    __slots__ = ('_columns', '_getter', '_min_fields', '_defaults')
+    
+    def __init__(self, columns: Tuple, header: Optional[List[str]] = None):
+        index = {}
+        for idx, name in enumerate(header or ()):
+            index[_normalize_column(name)] = idx + 1  # +1 because fields[0] is the row type
         
-        # Validate all paths before processing
-        self._validate_paths()
+        self._columns = tuple(
+            (tuple(index[_normalize_column(c)] if isinstance(c, str) else c
+                   for c in candidates
+                   if not isinstance(c, str) or _normalize_column(c) in index),
+             default)
+            for candidates, default in columns
+        )
+        self._defaults = tuple(default for _, default in columns)
         
-        # Initialize metrics
-        self._init_metrics()
+        # Fast path: rows long enough for every field's first candidate
+        first = [candidates[0] for candidates, _ in self._columns if candidates]
+        if len(first) == len(self._columns):
+            getter = itemgetter(*first)
+            self._getter = getter if len(first) > 1 else (lambda fields: (getter(fields),))
+            self._min_fields = max(first) + 1
+        else:
+            self._getter = None
+            self._min_fields = 0
     
-    def _validate_paths(self):
-        """Validate all status file paths"""
-        for path in self.status_paths:
-            if not self.validator.validate_path(path):
-                raise ValueError(f"Invalid or unsafe path: {path}")
-            if not os.path.exists(path):
-                logger.warning("Status file does not exist", path=path)
+    def __call__(self, fields: List[str]) -> Tuple[str, ...]:
+        if self._getter is not None and len(fields) >= self._min_fields:
+            return self._getter(fields)
+        if not any(candidates for candidates, _ in self._columns):
+            return self._defaults
+        count = len(fields)
+        return tuple(
+            next((fields[idx] for idx in candidates if idx < count), default)
+            for candidates, default in self._columns
+        )
+
+class OpenVPNMetricsCollector:
+    """Custom collector rendering the latest parsed status snapshots"""
     
-    def _init_metrics(self):
-        """Initialize Prometheus metrics"""
-        self.registry = CollectorRegistry()
+    def __init__(self, parser: 'OpenVPNStatusParser'):
+        self.parser = parser
+        # status_path -> series key -> (record, its samples). Records the parser
+        # found unchanged are the same objects, so their samples are reused.
+        self._client_samples: Dict[str, Dict[Tuple[str, ...], Tuple[ClientRecord, Tuple[Sample, Sample]]]] = {}
+        self._route_samples: Dict[str, Dict[Tuple[str, ...], Tuple[RouteRecord, Sample]]] = {}
+        # (state key, families) of the last collect, reused while nothing changed
+        self._families: Tuple[Optional[Tuple[Any, ...]], List[Metric]] = (None, [])
+    
+    def _state_key(self) -> Tuple[Any, ...]:
+        """Everything collect() renders from; snapshots change generation whenever they are replaced"""
+        parser = self.parser
+        return (
+            tuple((status_path, snapshot['generation']) for status_path, snapshot in list(parser.snapshots.items())),
+            tuple(parser.up_status.items()),
+            tuple((status_path, tuple(stats.items())) for status_path, stats in list(parser.server_stats.items())),
+            tuple((status_path, tuple(events)) for status_path, events in list(parser.session_events.items())),
+            parser.rate_smoothing is not None,
+        )
+    
+    def collect(self):
+        """Metric families of the parser's current snapshots, rebuilt only when they changed"""
+        key = self._state_key()
+        cached_key, families = self._families
+        if key != cached_key:
+            families = list(self._build_families())
+            self._families = (key, families)
+        return iter(families)
+    
+    def _build_families(self):
+        """Build metric families from the parser's current snapshots"""
+        snapshots = list(self.parser.snapshots.items())
         
-        # Common metrics
-        self.openvpn_up = Gauge(
+        up = GaugeMetricFamily(
             'openvpn_up',
             'Whether scraping OpenVPN metrics was successful',
-            ['status_path', 'job'],
-            registry=self.registry
+            labels=['status_path', 'job']
         )
+        for status_path, value in list(self.parser.up_status.items()):
+            up.add_metric([status_path, JOB_NAME], value)
+        yield up
         
-        self.openvpn_status_update_time = Gauge(
+        update_time = GaugeMetricFamily(
             'openvpn_status_update_time_seconds',
             'UNIX timestamp at which OpenVPN statistics were updated',
-            ['status_path', 'job'],
-            registry=self.registry
+            labels=['status_path', 'job']
         )
-        
-        # Server metrics
-        self.openvpn_connected_clients = Gauge(
+        connected_clients = GaugeMetricFamily(
             'openvpn_openvpn_server_connected_clients',
             'Number of connected clients',
-            ['status_path', 'job'],
+            labels=['status_path', 'job']
+        )
+        received_bytes = CounterMetricFamily(
+            'openvpn_server_client_received_bytes',
+            'Amount of data received over a connection on the VPN server, in bytes',
+            labels=CLIENT_LABELS
+        )
+        sent_bytes = CounterMetricFamily(
+            'openvpn_server_client_sent_bytes',
+            'Amount of data sent over a connection on the VPN server, in bytes',
+            labels=CLIENT_LABELS
+        )
+        route_last_reference = GaugeMetricFamily(
+            'openvpn_server_route_last_reference_time_seconds',
+            'Time at which a route was last referenced, in seconds',
+            labels=ROUTE_LABELS
+        )
+        client_statistics = {
+            name: CounterMetricFamily(name, documentation, labels=['status_path', 'job'])
+            for name, documentation in CLIENT_STATISTICS_METRICS.items()
+        }
+        client_other_statistics = GaugeMetricFamily(
+            'openvpn_client_statistic',
+            'Client status file values without a metric of their own, by their key in the file',
+            labels=['status_path', 'job', 'statistic']
+        )
+        server_statistics = {
+            field: CounterMetricFamily(name, documentation, labels=['status_path', 'job'])
+            for field, (name, documentation) in SERVER_STATISTICS_METRICS.items()
+        }
+        for status_path, stats in list(self.parser.server_stats.items()):
+            for field, value in stats.items():
+                server_statistics[field].add_metric([status_path, JOB_NAME], value)
+        connects = CounterMetricFamily(
+            'openvpn_client_connects',
+            'Client sessions that appeared between consecutive parses of a status file',
+            labels=['status_path', 'job']
+        )
+        disconnects = CounterMetricFamily(
+            'openvpn_client_disconnects',
+            'Client sessions that vanished between consecutive parses of a status file',
+            labels=['status_path', 'job']
+        )
+        for status_path, (connected, disconnected) in list(self.parser.session_events.items()):
+            connects.add_metric([status_path, JOB_NAME], connected)
+            disconnects.add_metric([status_path, JOB_NAME], disconnected)
+        rates = self.parser.rate_smoothing is not None
+        client_received_rate = GaugeMetricFamily(
+            'openvpn_server_client_received_bytes_per_second',
+            'Smoothed rate of data received over a connection on the VPN server, in bytes per second',
+            labels=CLIENT_LABELS
+        )
+        client_sent_rate = GaugeMetricFamily(
+            'openvpn_server_client_sent_bytes_per_second',
+            'Smoothed rate of data sent over a connection on the VPN server, in bytes per second',
+            labels=CLIENT_LABELS
+        )
+        server_received_rate = GaugeMetricFamily(
+            'openvpn_server_received_bytes_per_second',
+            'Smoothed rate of data received from the clients of a status file, in bytes per second',
+            labels=['status_path', 'job']
+        )
+        server_sent_rate = GaugeMetricFamily(
+            'openvpn_server_sent_bytes_per_second',
+            'Smoothed rate of data sent to the clients of a status file, in bytes per second',
+            labels=['status_path', 'job']
+        )
+        if rates:
+            for status_path, (received, sent) in list(self.parser.server_rates.items()):
+                server_received_rate.add_metric([status_path, JOB_NAME], received)
+                server_sent_rate.add_metric([status_path, JOB_NAME], sent)
+        
+        client_samples = {}
+        route_samples = {}
+        for status_path, snapshot in snapshots:
+            if snapshot['update_time'] is not None:
+                update_time.add_metric([status_path, JOB_NAME], snapshot['update_time'])
+            if snapshot['connected_clients'] is not None:
+                connected_clients.add_metric([status_path, JOB_NAME], snapshot['connected_clients'])
+            
+            previous = self._client_samples.get(status_path, {})
+            current = client_samples[status_path] = {}
+            for key, client in snapshot['clients'].items():
+                cached = previous.get(key)
+                if cached is None or cached[0] is not client:
+                    if cached is not None:
+                        labels = cached[1][0].labels
+                    else:
+                        labels = dict(zip(CLIENT_LABELS, [
+                            status_path, client.common_name, client.real_address, client.virtual_address,
+                            client.username, JOB_NAME, client.connection_time,
+                        ]))
+                    cached = (client, (
+                        Sample(received_bytes.name + '_total', labels, client.received_bytes, None, None),
+                        Sample(sent_bytes.name + '_total', labels, client.sent_bytes, None, None),
+                    ))
+                current[key] = cached
+                received_bytes.samples.append(cached[1][0])
+                sent_bytes.samples.append(cached[1][1])
+            
+            if rates:
+                for key, (received, sent) in self.parser.client_rates.get(status_path, {}).items():
+                    cached = current.get(key)
+                    if cached is None:
+                        continue
+                    labels = cached[1][0].labels
+                    client_received_rate.samples.append(Sample(client_received_rate.name, labels, received, None, None))
+                    client_sent_rate.samples.append(Sample(client_sent_rate.name, labels, sent, None, None))
+            
+            previous = self._route_samples.get(status_path, {})
+            current = route_samples[status_path] = {}
+            for key, route in snapshot['routes'].items():
+                cached = previous.get(key)
+                if cached is None or cached[0] is not route:
+                    if cached is not None:
+                        labels = cached[1].labels
+                    else:
+                        labels = dict(zip(ROUTE_LABELS, [
+                            status_path, route.common_name, route.real_address, route.virtual_address, JOB_NAME,
+                        ]))
+                    cached = (route, Sample(route_last_reference.name, labels, route.last_reference, None, None))
+                current[key] = cached
+                route_last_reference.samples.append(cached[1])
+            
+            for name, value in snapshot['client_stats'].items():
+                client_statistics[name].add_metric([status_path, JOB_NAME], value)
+            for key, value in snapshot['client_other_stats'].items():
+                client_other_statistics.add_metric([status_path, JOB_NAME, key], value)
+        
+        yield update_time
+        yield connected_clients
+        yield received_bytes
+        yield sent_bytes
+        yield route_last_reference
+        yield from client_statistics.values()
+        yield client_other_statistics
+        yield from server_statistics.values()
+        yield connects
+        yield disconnects
+        if rates:
+            yield client_received_rate
+            yield client_sent_rate
+            yield server_received_rate
+            yield server_sent_rate
+        self._client_samples = client_samples
+        self._route_samples = route_samples
+
+def _package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+class ExporterSelfMetrics:
+    """Exporter self-instrumentation, kept in a registry of its own"""
+    
+    def __init__(self):
+        self.registry = CollectorRegistry()
+        
+        self.evicted_series = Counter(
+            'openvpn_exporter_evicted_series',
+            'Per-client series removed after not being seen in a status file for the grace period',
+            ['status_path'],
             registry=self.registry
         )
         
-        self.openvpn_client_received_bytes = Counter(
-            'openvpn_server_client_received_bytes_total',
-            'Amount of data received over a connection on the VPN server, in bytes',
-            ['status_path', 'common_name', 'real_address', 'virtual_address', 'username', 'job', 'connection_time'],
+        self.parse_cache_hits = Counter(
+            'openvpn_exporter_parse_cache_hits',
+            'Scrapes that reused the previous parse of an unchanged status file',
+            ['status_path'],
             registry=self.registry
         )
         
-        self.openvpn_client_sent_bytes = Counter(
-            'openvpn_server_client_sent_bytes_total',
-            'Amount of data sent over a connection on the VPN server, in bytes',
-            ['status_path', 'common_name', 'real_address', 'virtual_address', 'username', 'job', 'connection_time'],
+        self.parse_cache_misses = Counter(
+            'openvpn_exporter_parse_cache_misses',
+            'Scrapes that had to parse a new or changed status file',
+            ['status_path'],
             registry=self.registry
         )
         
-        self.openvpn_route_last_reference_time = Gauge(
-            'openvpn_server_route_last_reference_time_seconds',
-            'Time at which a route was last referenced, in seconds',
-            ['status_path', 'common_name', 'real_address', 'virtual_address', 'job'],
+        self.parse_duration = Gauge(
+            'openvpn_exporter_parse_duration_seconds',
+            'Time taken by the last collection of each status file',
+            ['status_path'],
+            registry=self.registry
+        )
+        
+        self.rejected_client_statistics = Counter(
+            'openvpn_exporter_rejected_client_statistics',
+            'Client status file lines with a key unknown to the exporter and a non-numeric value',
+            ['status_path'],
+            registry=self.registry
+        )
+        
+        self.parse_timeouts = Counter(
+            'openvpn_exporter_parse_timeouts',
+            'Status file parses abandoned after exceeding the per-file timeout',
+            ['status_path'],
             registry=self.registry
         )
         
-        # Client metrics
-        self.openvpn_client_tun_tap_read_bytes = Counter(
-            'openvpn_client_tun_tap_read_bytes_total',
-            'Total amount of TUN/TAP traffic read, in bytes',
-            ['status_path', 'job'],
+        self.rate_limit_decisions = Counter(
+            'openvpn_exporter_rate_limit_decisions',
+            'Rate limit checks of /metrics requests, by outcome',
+            ['decision'],
             registry=self.registry
         )
         
-        self.openvpn_client_tun_tap_write_bytes = Counter(
-            'openvpn_client_tun_tap_write_bytes_total',
-            'Total amount of TUN/TAP traffic written, in bytes',
-            ['status_path', 'job'],
+        self.rate_limit_tracked_clients = Gauge(
+            'openvpn_exporter_rate_limit_tracked_clients',
+            'Client addresses currently tracked by the rate limiter',
             registry=self.registry
         )
         
-        self.openvpn_client_tcp_udp_read_bytes = Counter(
-            'openvpn_client_tcp_udp_read_bytes_total',
-            'Total amount of TCP/UDP traffic read, in bytes',
-            ['status_path', 'job'],
+        self.parse_cache_saved_seconds = Counter(
+            'openvpn_exporter_parse_cache_saved_seconds',
+            'Parse time saved by reusing cached results, estimated from the last parse of each file',
+            ['status_path'],
             registry=self.registry
         )
         
-        self.openvpn_client_tcp_udp_write_bytes = Counter(
-            'openvpn_client_tcp_udp_write_bytes_total',
-            'Total amount of TCP/UDP traffic written, in bytes',
-            ['status_path', 'job'],
+        self.parse_phase_duration = Histogram(
+            'openvpn_exporter_parse_phase_duration_seconds',
+            'Time spent reading, validating and parsing each status file, per parse',
+            ['status_path', 'phase'],
+            buckets=DURATION_BUCKETS,
             registry=self.registry
         )
         
-        self.openvpn_client_auth_read_bytes = Counter(
-            'openvpn_client_auth_read_bytes_total',
-            'Total amount of authentication traffic read, in bytes',
-            ['status_path', 'job'],
+        self.read_bytes = Counter(
+            'openvpn_exporter_read_bytes',
+            'Status file content read by parses, in bytes',
+            ['status_path'],
             registry=self.registry
         )
         
-        self.openvpn_client_pre_compress_bytes = Counter(
-            'openvpn_client_pre_compress_bytes_total',
-            'Total amount of data before compression, in bytes',
-            ['status_path', 'job'],
+        self.parsed_rows = Counter(
+            'openvpn_exporter_parsed_rows',
+            'Status file rows parsed, by section (CLIENT_LIST, ROUTING_TABLE)',
+            ['status_path', 'section'],
             registry=self.registry
         )
         
-        self.openvpn_client_post_compress_bytes = Counter(
-            'openvpn_client_post_compress_bytes_total',
-            'Total amount of data after compression, in bytes',
-            ['status_path', 'job'],
+        self.serialize_duration = Histogram(
+            'openvpn_exporter_serialize_duration_seconds',
+            'Time spent rendering a snapshot in an exposition format',
+            ['format'],
+            buckets=DURATION_BUCKETS,
             registry=self.registry
         )
         
-        self.openvpn_client_pre_decompress_bytes = Counter(
-            'openvpn_client_pre_decompress_bytes_total',
-            'Total amount of data before decompression, in bytes',
-            ['status_path', 'job'],
+        self.scrapes_in_flight = Gauge(
+            'openvpn_exporter_scrapes_in_flight',
+            '/metrics requests currently being served',
             registry=self.registry
         )
         
-        self.openvpn_client_post_decompress_bytes = Counter(
-            'openvpn_client_post_decompress_bytes_total',
-            'Total amount of data after decompression, in bytes',
-            ['status_path', 'job'],
+        self.build_info = Info(
+            'openvpn_exporter_build',
+            'Exporter version and runtime',
             registry=self.registry
         )
+        self.build_info.info({
+            'version': VERSION,
+            'python_version': platform.python_version(),
+            'python_implementation': platform.python_implementation(),
+            'prometheus_client_version': _package_version('prometheus_client'),
+        })
+        
+        self.registry.register(ValidationCacheCollector())
+
+class ValidationCacheCollector:
+    """Reports hits, misses and size of the validation caches"""
+    
+    def collect(self):
+        hits = CounterMetricFamily(
+            'openvpn_exporter_validation_cache_hits',
+            'Label sanitizations and IP address validations answered from cache',
+            labels=['cache']
+        )
+        misses = CounterMetricFamily(
+            'openvpn_exporter_validation_cache_misses',
+            'Label sanitizations and IP address validations computed and cached',
+            labels=['cache']
+        )
+        entries = GaugeMetricFamily(
+            'openvpn_exporter_validation_cache_entries',
+            'Entries currently held by each validation cache',
+            labels=['cache']
+        )
+        capacity = GaugeMetricFamily(
+            'openvpn_exporter_validation_cache_capacity',
+            'Maximum entries of each validation cache (VALIDATION_CACHE_SIZE)',
+            labels=['cache']
+        )
+        for name, cached in VALIDATION_CACHES.items():
+            info = cached.cache_info()
+            hits.add_metric([name], info.hits)
+            misses.add_metric([name], info.misses)
+            entries.add_metric([name], info.currsize)
+            capacity.add_metric([name], info.maxsize)
+        yield hits
+        yield misses
+        yield entries
+        yield capacity
+
+class OpenVPNStatusParser:
+    """Enhanced OpenVPN status file parser with security improvements"""
+    
+    # Snapshot sections holding per-client series subject to eviction
+    SERIES_SECTIONS = ('clients', 'routes')
+    
+    # Streamed lines are validated in batches of roughly this many characters
+    VALIDATION_BATCH_SIZE = 64 * 1024
+    
+    def __init__(self, status_paths: List[str], ignore_individuals: bool = False,
+                 stale_grace_period: float = 0.0, self_metrics: Optional[ExporterSelfMetrics] = None,
+                 rate_smoothing: Optional[float] = None, timezone_name: Optional[str] = None):
+        self.status_paths = status_paths
+        self.ignore_individuals = ignore_individuals
+        self.stale_grace_period = stale_grace_period
+        # Zone of the times OpenVPN writes as text ("Connected Since", "Updated")
+        self.timezone_name = timezone_name
+        self.timezone = status_timezone(timezone_name)
+        # EWMA time constant of the bytes/sec gauges in seconds (0 for unsmoothed); None disables them
+        self.rate_smoothing = rate_smoothing
+        self.self_metrics = self_metrics or ExporterSelfMetrics()
+        self.validator = SecurityValidator()
+        # Whether _publish logs its per-parse summary; the parser adopting a worker's parse logs it instead
+        self.log_parses = True
+        # Unknown client status keys with non-numeric values, logged once each
+        self._rejected_statistic_keys: Set[str] = set()
+        # Parses abandoned after timing out are dropped by _publish (see abandon_parse)
+        self._publish_lock = threading.Lock()
+        self._parse_context = threading.local()
+        
+        # Validate all paths before processing
+        self._validate_paths()
+        
+        # Initialize metrics
+        self._init_metrics()
+    
+    def _validate_paths(self):
+        """Validate all status file paths"""
+        for path in self.status_paths:
+            if not self.validator.validate_path(path):
+                raise ValueError(f"Invalid or unsafe path: {path}")
+            if not os.path.exists(path):
+                logger.warning("Status file does not exist", path=path)
+    
+    def _init_metrics(self):
+        """Initialize Prometheus metrics"""
+        self.registry = CollectorRegistry()
+        
+        # Latest parse result and scrape outcome per status file. Each parse
+        # replaces its file's snapshot wholesale, so the collector always
+        # renders absolute values instead of accumulating them.
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        self.up_status: Dict[str, float] = {}
+        # Management interface load-stats per address: field -> value
+        self.server_stats: Dict[str, Dict[str, float]] = {}
+        # Client sessions connected and disconnected per status file, from snapshot diffs
+        self.session_events: Dict[str, List[int]] = {}
+        # Smoothed bytes/sec per status file: ClientRecord.key -> (received, sent), and server totals
+        self.client_rates: Dict[str, Dict[Tuple[str, ...], Tuple[float, float]]] = {}
+        self.server_rates: Dict[str, Tuple[float, float]] = {}
+        
+        self.metrics_collector = OpenVPNMetricsCollector(self)
+        self.registry.register(self.metrics_collector)
+        
+        # status_path -> ((st_ino, st_size, st_mtime_ns), parse result, parse duration)
+        self._parse_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any], float]] = {}
+    
+    def set_up(self, status_path: str, up: bool):
+        """Record whether the last scrape of a status file succeeded"""
+        self.up_status[status_path] = 1.0 if up else 0.0
+    
+    @staticmethod
+    def _new_snapshot() -> Dict[str, Any]:
+        """Create an empty parse result for a single status file"""
+        return {
+            'update_time': None,
+            'connected_clients': None,
+            # ClientRecord.key -> ClientRecord
+            'clients': {},
+            # RouteRecord.key -> RouteRecord
+            'routes': {},
+            # client statistics metric name -> value
+            'client_stats': {},
+            # client status file keys without a metric of their own -> value
+            'client_other_stats': {},
+            # Changes from the previous snapshot of the file
+            'diff': None,
+            # Rows parsed per section (CLIENT_LIST, ROUTING_TABLE), and the parse's
+            # phase durations and bytes read (see _parse_stream)
+            'rows': {},
+            'parse_stats': None,
+            # Parse generation of the status file and when it was published; series
+            # retained past their last sighting keep that time in last_seen
+            'generation': 0,
+            'published_at': None,
+            'last_seen': {section: {} for section in OpenVPNStatusParser.SERIES_SECTIONS},
+        }
+    
+    def _publish(self, status_path: str, snapshot: Dict[str, Any]):
+        """Replace a file's snapshot unless the parse producing it was abandoned"""
+        cancelled = getattr(self._parse_context, 'cancelled', None)
+        with self._publish_lock:
+            if cancelled is not None and cancelled.is_set():
+                raise TimeoutError("Parse abandoned after timing out; dropping its result")
+            self._replace_snapshot(status_path, snapshot)
+    
+    def abandon_parse(self, cancelled: threading.Event):
+        """Make the parse given this event drop its result instead of publishing it.
+        
+        Once this returns, the parse has either published already or never will.
+        """
+        with self._publish_lock:
+            cancelled.set()
+    
+    def _replace_snapshot(self, status_path: str, snapshot: Dict[str, Any]):
+        """Replace a file's snapshot, retaining vanished series until the grace period expires"""
+        now = time.time()
+        previous = self.snapshots.get(status_path)
+        evicted = 0
+        
+        if previous is not None:
+            diff = snapshot['diff'] = self._diff(previous, snapshot)
+            if snapshot['connected_clients'] is not None:
+                events = self.session_events.setdefault(status_path, [0, 0])
+                events[0] += diff.connects
+                events[1] += diff.disconnects
+        elif snapshot['connected_clients'] is not None:
+            # Sessions already connected when first seen are not counted as connects
+            self.session_events.setdefault(status_path, [0, 0])
+        if previous is not None and self.rate_smoothing is not None:
+            self._update_rates(status_path, previous, snapshot, now)
+        
+        for section in self.SERIES_SECTIONS:
+            current = snapshot[section]
+            last_seen = {}
+            if previous is not None:
+                previous_last_seen = previous['last_seen'][section]
+                for key, value in previous[section].items():
+                    if key in current:
+                        continue
+                    seen = previous_last_seen.get(key, previous['published_at'])
+                    if now - seen < self.stale_grace_period:
+                        current[key] = value
+                        last_seen[key] = seen
+                    else:
+                        evicted += 1
+            snapshot['last_seen'][section] = last_seen
+        
+        snapshot['generation'] = previous['generation'] + 1 if previous else 1
+        snapshot['published_at'] = now
+        self.snapshots[status_path] = snapshot
+        
+        if evicted:
+            self.self_metrics.evicted_series.labels(status_path=status_path).inc(evicted)
+        
+        # One summary per parse; rows are only traced at DEBUG level (see RowTracer)
+        if not self.log_parses:
+            return
+        diff = snapshot['diff']
+        changes = {'changed': diff.changed, 'connects': diff.connects, 'disconnects': diff.disconnects} if diff else {}
+        logger.info("Parsed status file", path=status_path, generation=snapshot['generation'],
+                    connected_clients=snapshot['connected_clients'], clients=len(snapshot['clients']),
+                    routes=len(snapshot['routes']), evicted=evicted, **changes)
     
-    def parse_status_file(self, status_path: str) -> Dict[str, Any]:
-        """Parse OpenVPN status file with enhanced security"""
+    def parse_status_file(self, status_path: str, cancelled: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Parse OpenVPN status file with enhanced security.
+        
+        A parse whose cancelled event is set (see abandon_parse) raises
+        TimeoutError instead of publishing its result.
+        """
+        self._parse_context.cancelled = cancelled
         try:
-            # Check file size
-            file_size = os.path.getsize(status_path)
-            if file_size > self.validator.MAX_FILE_SIZE:
-                raise ValueError(f"File too large: {file_size} bytes")
+            # Reuse the previous parse while the file is unchanged
+            cached = self.cached_result(status_path)
+            if cached is not None:
+                return cached
             
             with open(status_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Validate content
-            if not self.validator.validate_file_content(content):
-                raise ValueError("Suspicious content detected in status file")
-            
-            return self._parse_content(content, status_path)
+                # Check file size of the opened file
+                st = os.fstat(f.fileno())
+                if st.st_size > self.validator.MAX_FILE_SIZE:
+                    raise ValueError(f"File too large: {st.st_size} bytes")
+                
+                self.self_metrics.parse_cache_misses.labels(status_path=status_path).inc()
+                start = time.perf_counter()
+                result = self._parse_stream(f, status_path)
+                self._parse_cache[status_path] = (
+                    (st.st_ino, st.st_size, st.st_mtime_ns), result, time.perf_counter() - start
+                )
+                return result
             
         except Exception as e:
             logger.error("Error parsing status file", path=status_path, error=str(e))
             raise
+        finally:
+            self._parse_context.cancelled = None
+    
+    def parse_management(self, client: 'ManagementClient') -> Dict[str, Any]:
+        """Parse `status 3` and `load-stats` from an OpenVPN management interface"""
+        try:
+            start = time.perf_counter()
+            lines = client.command('status 3')
+            result = self._parse_stream(lines, client.address, read_time=time.perf_counter() - start)
+            
+            stats = {}
+            for field in client.command('load-stats')[0].partition(':')[2].strip().split(','):
+                name, _, value = field.partition('=')
+                if name in SERVER_STATISTICS_METRICS:
+                    stats[name] = float(value)
+            self.server_stats[client.address] = stats
+            return result
+        
+        except Exception as e:
+            logger.error("Error querying management interface", address=client.address, error=str(e))
+            raise
+    
+    @staticmethod
+    def _diff(previous: Dict[str, Any], snapshot: Dict[str, Any]) -> 'SnapshotDiff':
+        """Compare a new parse of a file with its previous snapshot.
+        
+        Records equal to their previous version are replaced by it, so
+        everything derived from a series (e.g. rendered samples) can be
+        reused by identity. Sessions are client series keyed by
+        (common_name, real_address, connection_time).
+        """
+        changed = unchanged = 0
+        for section in OpenVPNStatusParser.SERIES_SECTIONS:
+            previous_records = previous[section]
+            current = snapshot[section]
+            for key, record in current.items():
+                previous_record = previous_records.get(key)
+                if previous_record == record:
+                    current[key] = previous_record
+                    unchanged += 1
+                else:
+                    changed += 1
+        
+        # Series retained after vanishing were already counted as disconnected
+        retained = previous['last_seen']['clients']
+        previous_sessions = {(client.common_name, client.real_address, client.connection_time)
+                             for key, client in previous['clients'].items() if key not in retained}
+        sessions = {(client.common_name, client.real_address, client.connection_time)
+                    for client in snapshot['clients'].values()}
+        return SnapshotDiff(
+            connects=len(sessions - previous_sessions),
+            disconnects=len(previous_sessions - sessions),
+            changed=changed,
+            unchanged=unchanged,
+        )
+    
+    def _update_rates(self, status_path: str, previous: Dict[str, Any], snapshot: Dict[str, Any], now: float):
+        """Fold the byte counter deltas since the previous snapshot into the rate gauges.
+        
+        The interval is taken from the files' own update times, falling back
+        to when the snapshots were published. Each client session gets a rate
+        from its second sighting on; a reconnect is a new session, and bytes
+        lower than before are a counter reset, counted from zero like rate()
+        does. The server rate adds the sessions that connected within the
+        interval; bytes of sessions that ended within it are lost. Rates
+        only change when the file is rewritten and hold in between, as the
+        file's counters do.
+        """
+        if snapshot['update_time'] is not None and previous['update_time'] is not None \
+                and snapshot['update_time'] > previous['update_time']:
+            elapsed = snapshot['update_time'] - previous['update_time']
+            interval_start = previous['update_time']
+        else:
+            elapsed = now - previous['published_at']
+            interval_start = previous['published_at']
+        if elapsed <= 0:
+            return
+        # Weight of the latest interval in the moving averages
+        alpha = 1.0 - math.exp(-elapsed / self.rate_smoothing) if self.rate_smoothing > 0 else 1.0
+        
+        previous_clients = previous['clients']
+        previous_rates = self.client_rates.get(status_path, {})
+        rates = {}
+        server_received = server_sent = 0.0
+        for key, client in snapshot['clients'].items():
+            before = previous_clients.get(key)
+            if before is None:
+                try:
+                    connected_within = float(client.connection_time) >= interval_start
+                except ValueError:
+                    connected_within = False
+                if connected_within:
+                    server_received += client.received_bytes
+                    server_sent += client.sent_bytes
+                continue
+            received = client.received_bytes - before.received_bytes
+            sent = client.sent_bytes - before.sent_bytes
+            if received < 0:
+                received = client.received_bytes
+            if sent < 0:
+                sent = client.sent_bytes
+            server_received += received
+            server_sent += sent
+            received /= elapsed
+            sent /= elapsed
+            rate = previous_rates.get(key)
+            if rate is not None:
+                received = rate[0] + alpha * (received - rate[0])
+                sent = rate[1] + alpha * (sent - rate[1])
+            rates[key] = (received, sent)
+        self.client_rates[status_path] = rates
+        
+        server_received /= elapsed
+        server_sent /= elapsed
+        rate = self.server_rates.get(status_path)
+        if rate is not None:
+            server_received = rate[0] + alpha * (server_received - rate[0])
+            server_sent = rate[1] + alpha * (server_sent - rate[1])
+        self.server_rates[status_path] = (server_received, server_sent)
+    
+    def cached_result(self, status_path: str) -> Optional[Dict[str, Any]]:
+        """Return the previous parse result if the status file is unchanged since"""
+        cached = self._parse_cache.get(status_path)
+        if cached is None or status_path not in self.snapshots:
+            return None
+        st = os.stat(status_path)
+        if cached[0] != (st.st_ino, st.st_size, st.st_mtime_ns):
+            return None
+        self.self_metrics.parse_cache_hits.labels(status_path=status_path).inc()
+        self.self_metrics.parse_cache_saved_seconds.labels(status_path=status_path).inc(cached[2])
+        self._evict_expired(status_path)
+        return cached[1]
+    
+    def _evict_expired(self, status_path: str):
+        """Evict series retained past the grace period from an unchanged file's snapshot.
+        
+        A parse evicts them too, but an unchanged file is not re-parsed. The
+        snapshot is replaced rather than modified since renders may hold it.
+        """
+        current = self.snapshots[status_path]
+        now = time.time()
+        expired = {section: [key for key, seen in current['last_seen'][section].items()
+                             if now - seen >= self.stale_grace_period]
+                   for section in self.SERIES_SECTIONS}
+        evicted = sum(len(keys) for keys in expired.values())
+        if not evicted:
+            return
+        
+        snapshot = dict(current, last_seen={})
+        for section, keys in expired.items():
+            series = snapshot[section] = dict(current[section])
+            last_seen = snapshot['last_seen'][section] = dict(current['last_seen'][section])
+            for key in keys:
+                del series[key]
+                del last_seen[key]
+        rates = self.client_rates.get(status_path)
+        if rates:
+            self.client_rates[status_path] = {key: rate for key, rate in rates.items()
+                                              if key in snapshot['clients']}
+        snapshot['diff'] = SnapshotDiff(connects=0, disconnects=0, changed=0,
+                                        unchanged=len(snapshot['clients']) + len(snapshot['routes']))
+        snapshot['generation'] = current['generation'] + 1
+        self.snapshots[status_path] = snapshot
+        
+        self.self_metrics.evicted_series.labels(status_path=status_path).inc(evicted)
+        logger.info("Evicted stale series", path=status_path, generation=snapshot['generation'], evicted=evicted)
+    
+    def adopt_parse(self, status_path: str, parsed: 'IsolatedParse') -> Dict[str, Any]:
+        """Publish a parse performed by another parser (e.g. in a worker process)"""
+        self.self_metrics.parse_cache_misses.labels(status_path=status_path).inc()
+        self._publish(status_path, parsed.snapshot)
+        self._observe_parse(status_path, parsed.snapshot)
+        self._parse_cache[status_path] = (parsed.signature, parsed.result, parsed.duration)
+        return parsed.result
     
     def _parse_content(self, content: str, status_path: str) -> Dict[str, Any]:
         """Parse the content of the status file"""
-        lines = content.strip().split('\n')
+        return self._parse_stream(io.StringIO(content), status_path)
+    
+    def _parse_stream(self, stream: Iterable[str], status_path: str, read_time: float = 0.0) -> Dict[str, Any]:
+        """Detect the status file format, parse it line by line and record the parse's statistics.
         
-        if not lines:
+        read_time is added to the read phase, for content read before streaming.
+        """
+        stats = {'read': 0.0, 'validate': 0.0, 'bytes': 0}
+        start = time.perf_counter()
+        result = self._parse_lines(self._validated_lines(stream, stats), status_path)
+        stats['parse'] = time.perf_counter() - start - stats['read'] - stats['validate']
+        stats['read'] += read_time
+        
+        snapshot = self.snapshots[status_path]
+        snapshot['parse_stats'] = stats
+        self._observe_parse(status_path, snapshot)
+        return result
+    
+    def _observe_parse(self, status_path: str, snapshot: Dict[str, Any]):
+        """Record a published parse's phase durations, bytes read and rows in the self metrics"""
+        stats = snapshot['parse_stats']
+        if stats is None:
+            return
+        for phase in PARSE_PHASES:
+            self.self_metrics.parse_phase_duration.labels(status_path=status_path, phase=phase).observe(stats[phase])
+        self.self_metrics.read_bytes.labels(status_path=status_path).inc(stats['bytes'])
+        for section, rows in snapshot['rows'].items():
+            self.self_metrics.parsed_rows.labels(status_path=status_path, section=section).inc(rows)
+    
+    def _parse_lines(self, lines: Iterator[str], status_path: str) -> Dict[str, Any]:
+        """Detect the status file format and dispatch to its parser"""
+        # Detect file type from the first line, skipping blank lines and comments
+        for first_line in lines:
+            first_line = first_line.strip()
+            if first_line and not first_line.startswith('#'):
+                break
+        else:
             raise ValueError("Empty status file")
+        lines = chain((first_line,), lines)
         
-        # Detect file type
-        if lines[0].startswith('TITLE,'):
+        if first_line.startswith('TITLE,'):
             return self._parse_server_status_v2(lines, status_path)
-        elif lines[0].startswith('TITLE\t'):
+        elif first_line.startswith('TITLE\t'):
             return self._parse_server_status_v3(lines, status_path)
-        elif lines[0].startswith('OpenVPN STATISTICS'):
+        elif first_line.startswith('OpenVPN STATISTICS'):
             return self._parse_client_status(lines, status_path)
-        elif lines[0].startswith('OpenVPN CLIENT LIST'):
+        elif first_line.startswith('OpenVPN CLIENT LIST'):
             return self._parse_openvpn_client_list(lines, status_path)
         else:
-            raise ValueError(f"Unknown status file format: {lines[0][:50]}")
+            raise ValueError(f"Unknown status file format: {first_line[:50]}")
+    
+    def _validated_lines(self, stream: Iterable[str], stats: Dict[str, float]) -> Iterator[str]:
+        """Yield lines without newlines, enforcing size and content checks as they stream.
+        
+        Content is read and validated in bounded batches before its lines are
+        yielded, so a rejected file never reaches the metrics. Time spent
+        reading and validating, and the size read, are added to stats.
+        """
+        max_size = self.validator.MAX_FILE_SIZE
+        total_size = 0
+        carry: List[str] = []
+        batches = self._line_batches(stream)
+        
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            validating = time.perf_counter()
+            stats['read'] += validating - start
+            if batch is None:
+                break
+            
+            # Lines are decoded; count their UTF-8 size, the file's for valid UTF-8
+            chunk = ''.join(batch)
+            total_size += len(chunk) if chunk.isascii() else len(chunk.encode('utf-8', 'surrogatepass'))
+            stats['bytes'] = total_size
+            if total_size > max_size:
+                raise ValueError(f"File too large: more than {max_size} bytes")
+            
+            batch = [line.rstrip('\n') for line in batch]
+            # Validate with the opening of a tag left unclosed by the previous batches,
+            # so tags spanning any number of lines across the boundary are still caught
+            carry = self._validate_batch(carry + batch)
+            stats['validate'] += time.perf_counter() - validating
+            
+            yield from batch
+    
+    def _line_batches(self, stream: Iterable[str]) -> Iterator[List[str]]:
+        """Lines of a stream in batches of about VALIDATION_BATCH_SIZE characters"""
+        if hasattr(stream, 'readlines'):
+            yield from iter(partial(stream.readlines, self.VALIDATION_BATCH_SIZE), [])
+            return
+        batch = []
+        batch_size = 0
+        for line in stream:
+            batch.append(line)
+            batch_size += len(line)
+            if batch_size >= self.VALIDATION_BATCH_SIZE:
+                yield batch
+                batch = []
+                batch_size = 0
+        if batch:
+            yield batch
+    
+    def _validate_batch(self, batch: List[str]) -> List[str]:
+        """Validate a batch of streamed lines for suspicious content.
+        
+        Returns the lines to validate with the next batch: the opening of a
+        suspicious tag not closed by a '>' yet, if any. What follows it up to
+        the end of the batch contains no '>', so the opening alone decides
+        whether the tag matches once closed, and the carry stays bounded.
+        The other patterns never span lines, and batches end at line ends.
+        """
+        content = '\n'.join(batch)
+        if content and not self.validator.validate_file_content(content):
+            raise ValueError("Suspicious content detected in status file")
+        opening = self.validator.SUSPICIOUS_TAG_OPENING.search(content, content.rfind('>') + 1)
+        return [opening.group()] if opening else []
     
-    def _parse_server_status_v2(self, lines: List[str], status_path: str) -> Dict[str, Any]:
+    def _parse_server_status_v2(self, lines: Iterable[str], status_path: str) -> Dict[str, Any]:
         """Parse server status file version 2 (comma delimited)"""
         return self._parse_server_status(lines, status_path, ',')
     
-    def _parse_server_status_v3(self, lines: List[str], status_path: str) -> Dict[str, Any]:
+    def _parse_server_status_v3(self, lines: Iterable[str], status_path: str) -> Dict[str, Any]:
         """Parse server status file version 3 (tab delimited)"""
         return self._parse_server_status(lines, status_path, '\t')
     
-    def _parse_server_status(self, lines: List[str], status_path: str, separator: str) -> Dict[str, Any]:
-        """Parse server status file using HEADER to determine column indices"""
-        headers = {}
-        column_indices = {}  # Store column name -> index mapping for CLIENT_LIST and ROUTING_TABLE
+    def _parse_server_status(self, lines: Iterable[str], status_path: str, separator: str) -> Dict[str, Any]:
+        """Parse server status file in a single pass, using HEADER lines to resolve columns"""
         connected_clients = 0
+        routing_rows = 0
+        snapshot = self._new_snapshot()
+        clients = snapshot['clients']
+        routes = snapshot['routes']
+        validator = self.validator
+        trace = ROW_TRACE
+        # One string per distinct address, shared by the client and route records
+        share = {}.setdefault
+        
+        # Positional accessors until a HEADER line says otherwise
+        client_columns = ColumnAccessor(CLIENT_LIST_COLUMNS)
+        client_ipv6_columns = ColumnAccessor(CLIENT_LIST_IPV6_COLUMNS)
+        routing_columns = ColumnAccessor(ROUTING_TABLE_COLUMNS)
         
-        # First pass: collect headers and build column index maps
         for line in lines:
             if not line.strip():
                 continue
-                
-            fields = line.split(separator)
             
-            if fields[0] == 'HEADER' and len(fields) > 2:
-                header_type = fields[1]
-                header_columns = fields[2:]
-                headers[header_type] = header_columns
-                
-                # Build column index map for this header type
-                column_indices[header_type] = {}
-                for idx, col_name in enumerate(header_columns):
-                    # Normalize column name (case-insensitive, handle variations)
-                    col_name_lower = col_name.lower().strip()
-                    column_indices[header_type][col_name_lower] = idx
-        
-        # Second pass: parse data using column indices
-        for line in lines:
-            if not line.strip():
-                continue
-                
             fields = line.split(separator)
+            row_type = fields[0]
             
-            if fields[0] == 'TIME' and len(fields) >= 3:
-                try:
-                    timestamp = float(fields[2])
-                    self.openvpn_status_update_time.labels(status_path=status_path, job="openvpn-metrics").set(timestamp)
-                except ValueError:
-                    logger.warning("Invalid timestamp", path=status_path, timestamp=fields[2])
-            
-            elif fields[0] == 'CLIENT_LIST' and len(fields) > 1:
+            if row_type == 'CLIENT_LIST' and len(fields) > 1:
                 connected_clients += 1
+                if self.ignore_individuals:
+                    continue
                 
-                if not self.ignore_individuals:
+                try:
+                    (common_name, real_address, virtual_address_ipv4, username, connection_time,
+                     received_bytes_str, sent_bytes_str) = client_columns(fields)
+                    (virtual_address_ipv6,) = client_ipv6_columns(fields)
+                    
+                    common_name = validator.sanitize_filename(common_name)
+                    if not validator.validate_ip_address(real_address.split(':')[0]):
+                        real_address = 'unknown'
+                    if not validator.validate_ip_address(virtual_address_ipv4):
+                        virtual_address_ipv4 = 'unknown'
+                    
+                    # Combine IPv4 and IPv6 addresses for virtual_address label
+                    if (virtual_address_ipv6 and virtual_address_ipv6 != 'unknown'
+                            and validator.validate_ip_address(virtual_address_ipv6)):
+                        virtual_address = f"{virtual_address_ipv4}/{virtual_address_ipv6}"
+                    else:
+                        virtual_address = virtual_address_ipv4
+                    
+                    username = validator.sanitize_filename(username)
+                    
                     try:
-                        # Get column indices from header
-                        client_indices = column_indices.get('CLIENT_LIST', {})
+                        received_bytes = float(received_bytes_str) if received_bytes_str else 0
+                        sent_bytes = float(sent_bytes_str) if sent_bytes_str else 0
                         
-                        # Helper function to get field by column name
-                        def get_field(col_name, default='unknown'):
-                            # If we have column indices from header, use them
-                            if client_indices:
-                                col_variations = [
-                                    col_name.lower(),
-                                    col_name.lower().replace(' ', '_'),
-                                    col_name.lower().replace('_', ' '),
-                                ]
-                                for var in col_variations:
-                                    if var in client_indices:
-                                        idx = client_indices[var]
-                                        if idx + 1 < len(fields):
-                                            return fields[idx + 1]  # +1 because fields[0] is 'CLIENT_LIST'
-                            # Fallback: use positional indices for backward compatibility
-                            # Format: CLIENT_LIST,common_name,real_address,virtual_address,received_bytes,sent_bytes,...
-                            fallback_map = {
-                                'common name': 1,
-                                'real address': 2,
-                                'virtual address': 3,
-                                'bytes received': 4,
-                                'bytes sent': 5,
-                                'username': 8,
-                                'connected since (time_t)': 7,
-                            }
-                            col_lower = col_name.lower()
-                            if col_lower in fallback_map:
-                                idx = fallback_map[col_lower]
-                                if idx < len(fields):
-                                    return fields[idx]
-                            return default
-                        
-                        # Extract fields using column names
-                        common_name = self.validator.sanitize_filename(
-                            get_field('Common Name', get_field('common name', 'unknown'))
-                        )
-                        real_address_raw = get_field('Real Address', get_field('real address', 'unknown'))
-                        real_address = real_address_raw if self.validator.validate_ip_address(
-                            real_address_raw.split(':')[0]) else 'unknown'
-                        
-                        # Get virtual addresses (IPv4 and IPv6)
-                        virtual_address_ipv4 = get_field('Virtual Address', get_field('virtual address', 'unknown'))
-                        if not self.validator.validate_ip_address(virtual_address_ipv4):
-                            virtual_address_ipv4 = 'unknown'
-                        
-                        virtual_address_ipv6 = get_field('Virtual IPv6 Address', 
-                                                         get_field('virtual ipv6 address',
-                                                                   get_field('Virtual IPv6',
-                                                                            get_field('virtual ipv6', ''))))
-                        # Validate IPv6 address
-                        if virtual_address_ipv6 and virtual_address_ipv6 != 'unknown' and virtual_address_ipv6:
-                            if not self.validator.validate_ip_address(virtual_address_ipv6):
-                                virtual_address_ipv6 = None
-                        else:
-                            virtual_address_ipv6 = None
-                        
-                        # Combine IPv4 and IPv6 addresses for virtual_address label
-                        if virtual_address_ipv6:
-                            virtual_address = f"{virtual_address_ipv4}/{virtual_address_ipv6}"
-                        else:
-                            virtual_address = virtual_address_ipv4 if virtual_address_ipv4 != 'unknown' else 'unknown'
-                        
-                        # Get username
-                        username = self.validator.sanitize_filename(
-                            get_field('Username', get_field('username', 'unknown'))
-                        )
-                        
-                        # Get connection time
-                        connection_time = get_field('Connected Since (time_t)', 
-                                                    get_field('connected since (time_t)',
-                                                              get_field('Connected Since',
-                                                                       get_field('connected since', ''))))
-                        
-                        # Get bytes received and sent
-                        received_bytes_str = get_field('Bytes Received', get_field('bytes received', '0'))
-                        sent_bytes_str = get_field('Bytes Sent', get_field('bytes sent', '0'))
+                        # Use connection_time as a label if available
+                        connection_time_label = ''
+                        if connection_time and connection_time != 'unknown':
+                            try:
+                                # Try to parse as timestamp
+                                connection_time_label = str(int(float(connection_time)))
+                            except (ValueError, TypeError):
+                                connection_time_label = ''
                         
-                        try:
-                            received_bytes = float(received_bytes_str) if received_bytes_str else 0
-                            sent_bytes = float(sent_bytes_str) if sent_bytes_str else 0
-                            
-                            # Build labels dict - all labels must be present
-                            labels = {
-                                'status_path': status_path,
-                                'common_name': common_name,
-                                'real_address': real_address,
-                                'virtual_address': virtual_address,
-                                'username': username,
-                                'job': "openvpn-metrics",
-                                'connection_time': ''  # Default empty, will be set if available
-                            }
-                            
-                            # Add connection_time if available
-                            if connection_time and connection_time != 'unknown' and connection_time:
-                                try:
-                                    # Try to parse as timestamp
-                                    labels['connection_time'] = str(int(float(connection_time)))
-                                except (ValueError, TypeError):
-                                    labels['connection_time'] = ''
-                            
-                            self.openvpn_client_received_bytes.labels(**labels).inc(received_bytes)
-                            self.openvpn_client_sent_bytes.labels(**labels).inc(sent_bytes)
-                            
-                        except (ValueError, TypeError) as e:
-                            logger.warning("Error parsing client data", error=str(e), 
-                                         received_bytes=received_bytes_str, sent_bytes=sent_bytes_str)
-                    except (ValueError, IndexError, KeyError) as e:
-                        logger.warning("Error parsing client data", error=str(e), line=line[:100])
+                        client = ClientRecord(common_name, share(real_address, real_address),
+                                              share(virtual_address, virtual_address), username,
+                                              connection_time_label, received_bytes, sent_bytes)
+                        clients[client.key] = client
+                        if trace.every and trace.sample():
+                            logger.debug("Parsed client row", path=status_path, client=client._asdict())
+                    except (ValueError, TypeError) as e:
+                        logger.warning("Error parsing client data", error=str(e), 
+                                     received_bytes=received_bytes_str, sent_bytes=sent_bytes_str)
+                except (ValueError, IndexError, KeyError) as e:
+                    logger.warning("Error parsing client data", error=str(e), line=line[:100])
             
-            elif fields[0] == 'ROUTING_TABLE' and len(fields) >= 3:
-                if not self.ignore_individuals:
+            elif row_type == 'ROUTING_TABLE' and len(fields) >= 3:
+                routing_rows += 1
+                if self.ignore_individuals:
+                    continue
+                
+                try:
+                    virtual_address, common_name, real_address, last_ref_time_str = routing_columns(fields)
+                    
+                    if not validator.validate_ip_address(virtual_address):
+                        virtual_address = 'unknown'
+                    common_name = validator.sanitize_filename(common_name)
+                    if not validator.validate_ip_address(real_address.split(':')[0]):
+                        real_address = 'unknown'
+                    
                     try:
-                        # Get column indices from header
-                        routing_indices = column_indices.get('ROUTING_TABLE', {})
-                        
-                        # Helper function to get field by column name
-                        def get_routing_field(col_name, default='unknown'):
-                            # If we have column indices from header, use them
-                            if routing_indices:
-                                col_variations = [
-                                    col_name.lower(),
-                                    col_name.lower().replace(' ', '_'),
-                                    col_name.lower().replace('_', ' '),
-                                ]
-                                for var in col_variations:
-                                    if var in routing_indices:
-                                        idx = routing_indices[var]
-                                        if idx + 1 < len(fields):
-                                            return fields[idx + 1]  # +1 because fields[0] is 'ROUTING_TABLE'
-                            # Fallback: use positional indices for backward compatibility
-                            # Format: ROUTING_TABLE,virtual_address,common_name,real_address,last_ref,last_ref (time_t)
-                            fallback_map = {
-                                'virtual address': 1,
-                                'common name': 2,
-                                'real address': 3,
-                                'last ref': 4,
-                                'last ref (time_t)': 5,
-                            }
-                            col_lower = col_name.lower()
-                            if col_lower in fallback_map:
-                                idx = fallback_map[col_lower]
-                                if idx < len(fields):
-                                    return fields[idx]
-                            return default
-                        
-                        # Extract fields using column names
-                        virtual_address = get_routing_field('Virtual Address', get_routing_field('virtual address', 'unknown'))
-                        if not self.validator.validate_ip_address(virtual_address):
-                            virtual_address = 'unknown'
-                        
-                        common_name = self.validator.sanitize_filename(
-                            get_routing_field('Common Name', get_routing_field('common name', 'unknown'))
-                        )
-                        real_address_raw = get_routing_field('Real Address', get_routing_field('real address', 'unknown'))
-                        real_address = real_address_raw if self.validator.validate_ip_address(
-                            real_address_raw.split(':')[0]) else 'unknown'
-                        
-                        last_ref_time_str = get_routing_field('Last Ref (time_t)', 
-                                                              get_routing_field('last ref (time_t)',
-                                                                                get_routing_field('Last Ref',
-                                                                                                 get_routing_field('last ref', ''))))
-                        
-                        try:
-                            last_ref_time = float(last_ref_time_str) if last_ref_time_str else time.time()
-                            self.openvpn_route_last_reference_time.labels(
-                                status_path=status_path,
-                                common_name=common_name,
-                                real_address=real_address,
-                                virtual_address=virtual_address,
-                                job="openvpn-metrics"
-                            ).set(last_ref_time)
-                        except (ValueError, TypeError) as e:
-                            logger.warning("Error parsing routing data", error=str(e), last_ref_time=last_ref_time_str)
-                    except (ValueError, IndexError, KeyError) as e:
-                        logger.warning("Error parsing routing data", error=str(e), line=line[:100])
+                        last_ref_time = float(last_ref_time_str) if last_ref_time_str else time.time()
+                        route = RouteRecord(common_name, share(real_address, real_address),
+                                            share(virtual_address, virtual_address), last_ref_time)
+                        routes[route.key] = route
+                    except (ValueError, TypeError) as e:
+                        logger.warning("Error parsing routing data", error=str(e), last_ref_time=last_ref_time_str)
+                except (ValueError, IndexError, KeyError) as e:
+                    logger.warning("Error parsing routing data", error=str(e), line=line[:100])
+            
+            elif row_type == 'HEADER' and len(fields) > 2:
+                # Resolve the column layout once; it applies to the rows that follow
+                if fields[1] == 'CLIENT_LIST':
+                    client_columns = ColumnAccessor(CLIENT_LIST_COLUMNS, fields[2:])
+                    client_ipv6_columns = ColumnAccessor(CLIENT_LIST_IPV6_COLUMNS, fields[2:])
+                elif fields[1] == 'ROUTING_TABLE':
+                    routing_columns = ColumnAccessor(ROUTING_TABLE_COLUMNS, fields[2:])
+            
+            elif row_type == 'TIME' and len(fields) >= 3:
+                try:
+                    snapshot['update_time'] = float(fields[2])
+                except ValueError:
+                    logger.warning("Invalid timestamp", path=status_path, timestamp=fields[2])
         
         # Set connected clients count
-        self.openvpn_connected_clients.labels(status_path=status_path, job="openvpn-metrics").set(connected_clients)
+        snapshot['connected_clients'] = connected_clients
+        snapshot['rows'] = {'CLIENT_LIST': connected_clients, 'ROUTING_TABLE': routing_rows}
+        self._publish(status_path, snapshot)
         
         return {"connected_clients": connected_clients}
     
-    def _parse_client_status(self, lines: List[str], status_path: str) -> Dict[str, Any]:
-        """Parse client status file"""
+    def _parse_client_status(self, lines: Iterable[str], status_path: str) -> Dict[str, Any]:
+        """Parse client status file, looking each line's key up in CLIENT_STATISTICS_FIELDS"""
+        snapshot = self._new_snapshot()
+        client_stats = snapshot['client_stats']
+        other_stats = snapshot['client_other_stats']
+        fields_table = CLIENT_STATISTICS_FIELDS
+        
         for line in lines:
-            if not line.strip():
-                continue
-                
-            fields = line.split(',')
-            
-            if fields[0] == 'Updated' and len(fields) >= 2:
-                try:
-                    # Parse timestamp
-                    time_str = fields[1].strip()
-                    time_obj = datetime.strptime(time_str, "%a %b %d %H:%M:%S %Y")
-                    timestamp = time_obj.replace(tzinfo=timezone.utc).timestamp()
-                    self.openvpn_status_update_time.labels(status_path=status_path, job="openvpn-metrics").set(timestamp)
-                except ValueError as e:
-                    logger.warning("Error parsing timestamp", error=str(e))
-            
-            elif fields[0] == 'TUN/TAP read bytes' and len(fields) >= 2:
-                try:
-                    value = float(fields[1])
-                    self.openvpn_client_tun_tap_read_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
-                except ValueError:
-                    pass
-            
-            elif fields[0] == 'TUN/TAP write bytes' and len(fields) >= 2:
-                try:
-                    value = float(fields[1])
-                    self.openvpn_client_tun_tap_write_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
-                except ValueError:
-                    pass
-            
-            elif fields[0] == 'TCP/UDP read bytes' and len(fields) >= 2:
-                try:
-                    value = float(fields[1])
-                    self.openvpn_client_tcp_udp_read_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
-                except ValueError:
-                    pass
+            key, separator, value = line.partition(',')
+            if not separator:
+                continue  # Title, END and blank lines
             
-            elif fields[0] == 'TCP/UDP write bytes' and len(fields) >= 2:
+            name = fields_table.get(key)
+            if name is not None:
                 try:
-                    value = float(fields[1])
-                    self.openvpn_client_tcp_udp_write_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
+                    client_stats[name] = float(value)
                 except ValueError:
-                    pass
+                    logger.warning("Invalid client statistic", path=status_path, key=key, value=value[:100])
             
-            elif fields[0] == 'Auth read bytes' and len(fields) >= 2:
+            elif key == 'Updated':
                 try:
-                    value = float(fields[1])
-                    self.openvpn_client_auth_read_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
-                except ValueError:
-                    pass
-            
-            elif fields[0] == 'pre-compress bytes' and len(fields) >= 2:
-                try:
-                    value = float(fields[1])
-                    self.openvpn_client_pre_compress_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
-                except ValueError:
-                    pass
-            
-            elif fields[0] == 'post-compress bytes' and len(fields) >= 2:
-                try:
-                    value = float(fields[1])
-                    self.openvpn_client_post_compress_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
-                except ValueError:
-                    pass
-            
-            elif fields[0] == 'pre-decompress bytes' and len(fields) >= 2:
-                try:
-                    value = float(fields[1])
-                    self.openvpn_client_pre_decompress_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
-                except ValueError:
-                    pass
+                    snapshot['update_time'] = parse_status_time(value.strip(), self.timezone)
+                except ValueError as e:
+                    logger.warning("Error parsing timestamp", error=str(e))
             
-            elif fields[0] == 'post-decompress bytes' and len(fields) >= 2:
+            else:
+                # Counters added by newer OpenVPN versions are exposed generically
                 try:
-                    value = float(fields[1])
-                    self.openvpn_client_post_decompress_bytes.labels(status_path=status_path, job="openvpn-metrics").inc(value)
+                    other_stats[self.validator.sanitize_filename(key)] = float(value)
                 except ValueError:
-                    pass
+                    self.self_metrics.rejected_client_statistics.labels(status_path=status_path).inc()
+                    if key not in self._rejected_statistic_keys and len(self._rejected_statistic_keys) < 1000:
+                        self._rejected_statistic_keys.add(key)
+                        logger.warning("Unknown non-numeric client statistic", path=status_path, key=key[:100],
+                                       value=value[:100])
+        
+        self._publish(status_path, snapshot)
         
         return {"status": "parsed"}
     
-    def _parse_openvpn_client_list(self, lines: List[str], status_path: str) -> Dict[str, Any]:
+    def _parse_openvpn_client_list(self, lines: Iterable[str], status_path: str) -> Dict[str, Any]:
         """Parse OpenVPN CLIENT LIST format with full routing table support"""
         connected_clients = 0
+        routing_rows = 0
+        update_time = None
         current_section = None
-        client_data = {}  # Store client data for routing table matching
-        routing_entries = {}  # Store routing table data
+        client_data: Dict[str, ClientRecord] = {}  # Store client data for routing table matching
+        routing_entries: Dict[str, RouteRecord] = {}  # Store routing table data
+        # First IPv4 and IPv6 host route of each client, ignoring further routes and iroutes
+        virtual_addresses: Dict[str, Dict[bool, str]] = {}
+        snapshot = self._new_snapshot()
+        trace = ROW_TRACE
+        # One string per distinct address, shared by the client and route records
+        share = {}.setdefault
         
         for line in lines:
             if not line.strip():
@@ -691,8 +1643,15 @@ class OpenVPNStatusParser:
                 current_section = None
                 continue
                 
+            if line.startswith('Updated,'):
+                try:
+                    update_time = parse_status_time(line[len('Updated,'):].strip(), self.timezone)
+                except ValueError as e:
+                    logger.warning("Error parsing timestamp", error=str(e))
+                continue
+            
             # Skip header lines
-            if line.startswith('Updated,') or line.startswith('Common Name,') or line.startswith('Virtual Address,'):
+            if line.startswith('Common Name,') or line.startswith('Virtual Address,'):
                 continue
                 
             # Parse client list section
@@ -704,6 +1663,7 @@ class OpenVPNStatusParser:
                     try:
                         common_name = self.validator.sanitize_filename(fields[0].strip()) if fields[0].strip() else 'unknown'
                         real_address = fields[1].strip() if self.validator.validate_ip_address(fields[1].strip().split(':')[0]) else 'unknown'
+                        real_address = share(real_address, real_address)
                         received_bytes = float(fields[2].strip()) if fields[2].strip() else 0
                         sent_bytes = float(fields[3].strip()) if fields[3].strip() else 0
                         connected_since = fields[4].strip() if len(fields) > 4 else 'unknown'
@@ -712,55 +1672,23 @@ class OpenVPNStatusParser:
                         connection_timestamp = None
                         if connected_since != 'unknown' and connected_since:
                             try:
-                                # Parse format like "2025-09-25 14:30:36"
-                                from datetime import datetime
-                                dt = datetime.strptime(connected_since, "%Y-%m-%d %H:%M:%S")
-                                # Convert to UTC timestamp
-                                connection_timestamp = dt.replace(tzinfo=None).timestamp()
-                                logger.info("Parsed connection time", 
-                                          connected_since=connected_since, 
-                                          timestamp=connection_timestamp)
+                                connection_timestamp = parse_status_time(connected_since, self.timezone)
                             except ValueError as e:
                                 logger.warning("Could not parse connection time", 
                                              connected_since=connected_since, 
                                              error=str(e))
                         
-                        # Store client data for routing table matching
-                        client_data[common_name] = {
-                            'real_address': real_address,
-                            'received_bytes': received_bytes,
-                            'sent_bytes': sent_bytes,
-                            'connected_since': connected_since,
-                            'connection_timestamp': connection_timestamp
-                        }
+                        # Store client data for routing table matching; the virtual
+                        # address is resolved from the routing table afterwards
+                        client_data[common_name] = ClientRecord(
+                            common_name, real_address, 'unknown', 'unknown',
+                            str(int(connection_timestamp)) if connection_timestamp else '',
+                            received_bytes, sent_bytes
+                        )
                         
-                        if not self.ignore_individuals:
-                            # Set initial virtual address as unknown, will be updated from routing table
-                            virtual_address = 'unknown'
-                            
-                            # Create labels with connection_time for dashboard compatibility
-                            labels = {
-                                'status_path': status_path,
-                                'common_name': common_name,
-                                'real_address': real_address,
-                                'virtual_address': virtual_address,
-                                'username': 'unknown',
-                                'job': "openvpn-metrics"
-                            }
-                            
-                            # Add connection_time label if available
-                            if connection_timestamp:
-                                labels['connection_time'] = str(int(connection_timestamp))
-                            
-                            self.openvpn_client_received_bytes.labels(**labels).inc(received_bytes)
-                            self.openvpn_client_sent_bytes.labels(**labels).inc(sent_bytes)
-                            
-                            logger.info("Parsed client data", 
-                                      common_name=common_name, 
-                                      real_address=real_address,
-                                      received_bytes=received_bytes,
-                                      sent_bytes=sent_bytes,
-                                      connected_since=connected_since)
+                        if trace.every and trace.sample():
+                            logger.debug("Parsed client row", path=status_path,
+                                         client=client_data[common_name]._asdict(), connected_since=connected_since)
                     except (ValueError, IndexError) as e:
                         logger.warning("Error parsing client entry", error=str(e), line=line)
             
@@ -768,141 +1696,1327 @@ class OpenVPNStatusParser:
             elif current_section == 'routing_table' and ',' in line:
                 fields = line.split(',')
                 if len(fields) >= 3:  # Virtual Address, Common Name, Real Address, Last Ref
+                    routing_rows += 1
                     try:
                         virtual_address = fields[0].strip()
+                        virtual_address = share(virtual_address, virtual_address)
                         common_name = self.validator.sanitize_filename(fields[1].strip()) if fields[1].strip() else 'unknown'
                         real_address = fields[2].strip() if len(fields) > 2 else 'unknown'
-                        last_ref = fields[3].strip() if len(fields) > 3 else 'unknown'
+                        real_address = share(real_address, real_address)
                         
-                        # Store routing data
-                        routing_entries[common_name] = {
-                            'virtual_address': virtual_address,
-                            'real_address': real_address,
-                            'last_ref': last_ref
-                        }
+                        # Store routing data, referenced now
+                        route = RouteRecord(common_name, real_address, virtual_address, time.time())
+                        routing_entries[common_name] = route
+                        if self.validator.validate_ip_address(virtual_address):
+                            virtual_addresses.setdefault(common_name, {}).setdefault(':' in virtual_address,
+                                                                                     virtual_address)
                         
-                        # Update client metrics with virtual address if client exists
+                        # Update route timing if client exists
                         if common_name in client_data and not self.ignore_individuals:
-                            # Get client data
-                            client_info = client_data[common_name]
-                            
-                            # Create updated labels with virtual address and connection time
-                            labels = {
-                                'status_path': status_path,
-                                'common_name': common_name,
-                                'real_address': real_address,
-                                'virtual_address': virtual_address,
-                                'username': 'unknown',
-                                'job': "openvpn-metrics"
-                            }
-                            
-                            # Add connection_time if available
-                            if client_info.get('connection_timestamp'):
-                                labels['connection_time'] = str(int(client_info['connection_timestamp']))
-                            
-                            # Update the existing client metrics with virtual address
-                            # We need to create new metrics with updated labels since Prometheus doesn't allow label updates
-                            received_bytes = client_info.get('received_bytes', 0)
-                            sent_bytes = client_info.get('sent_bytes', 0)
-                            
-                            # Set new metrics with correct virtual address
-                            self.openvpn_client_received_bytes.labels(**labels).inc(received_bytes)
-                            self.openvpn_client_sent_bytes.labels(**labels).inc(sent_bytes)
-                            
-                            # Update route timing
-                            self.openvpn_route_last_reference_time.labels(
-                                status_path=status_path,
-                                common_name=common_name,
-                                real_address=real_address,
-                                virtual_address=virtual_address,
-                                job="openvpn-metrics"
-                            ).set(time.time())
-                            
-                            logger.info("Updated client metrics with routing info", 
-                                      common_name=common_name,
-                                      virtual_address=virtual_address,
-                                      real_address=real_address,
-                                      connection_time=client_info.get('connected_since'))
+                            snapshot['routes'][route.key] = route
+                            if trace.every and trace.sample():
+                                logger.debug("Parsed route row", path=status_path, route=route._asdict())
                     except (ValueError, IndexError) as e:
                         logger.warning("Error parsing routing entry", error=str(e), line=line)
         
-        # Set connected clients count
-        self.openvpn_connected_clients.labels(status_path=status_path, job="openvpn-metrics").set(connected_clients)
-        
-        # Set status update time
-        self.openvpn_status_update_time.labels(status_path=status_path, job="openvpn-metrics").set(time.time())
+        # Emit one series per client, with the virtual address resolved from the routing
+        # table and combined like the server status formats' IPv4 and IPv6 columns
+        if not self.ignore_individuals:
+            for common_name, client in client_data.items():
+                addresses = virtual_addresses.get(common_name)
+                if addresses:
+                    virtual_address = addresses.get(False, 'unknown')
+                    if True in addresses:
+                        virtual_address = f"{virtual_address}/{addresses[True]}"
+                        virtual_address = share(virtual_address, virtual_address)
+                    client = client._replace(virtual_address=virtual_address)
+                snapshot['clients'][client.key] = client
         
-        # Initialize client-specific metrics with default values (OpenVPN CLIENT LIST format doesn't provide this data)
-        # These metrics are available in other OpenVPN status formats but not in CLIENT LIST format
-        # Always initialize these metrics to ensure they appear in Prometheus
-        self.openvpn_client_tun_tap_read_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
+        snapshot['connected_clients'] = connected_clients
+        snapshot['update_time'] = update_time if update_time is not None else time.time()
+        snapshot['rows'] = {'CLIENT_LIST': connected_clients, 'ROUTING_TABLE': routing_rows}
         
-        self.openvpn_client_tun_tap_write_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
+        # OpenVPN CLIENT LIST format doesn't provide client statistics, but always
+        # expose them so the series appear in Prometheus
+        snapshot['client_stats'] = dict.fromkeys(CLIENT_STATISTICS_METRICS, 0.0)
         
-        self.openvpn_client_tcp_udp_read_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
+        self._publish(status_path, snapshot)
         
-        self.openvpn_client_tcp_udp_write_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
-        
-        self.openvpn_client_auth_read_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
-        
-        self.openvpn_client_pre_compress_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
-        
-        self.openvpn_client_post_compress_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
+        return {"connected_clients": connected_clients, "routing_entries": len(routing_entries)}
+
+class IsolatedParse(NamedTuple):
+    """Picklable outcome of parsing one status file outside the main parser"""
+    result: Dict[str, Any]
+    snapshot: Dict[str, Any]
+    signature: Tuple[int, int, int]
+    duration: float
+
+def parse_status_file_isolated(status_path: str, ignore_individuals: bool = False,
+                               timezone_name: Optional[str] = None) -> IsolatedParse:
+    """Parse a status file with a throwaway parser; used by process pool workers"""
+    parser = OpenVPNStatusParser([], ignore_individuals, timezone_name=timezone_name)
+    parser.log_parses = False
+    result = parser.parse_status_file(status_path)
+    signature, _, duration = parser._parse_cache[status_path]
+    return IsolatedParse(result, parser.snapshots[status_path], signature, duration)
+
+# Exposition formats served from /metrics, negotiated from the Accept header
+PROTOBUF_CONTENT_TYPE = ('application/vnd.google.protobuf; proto=io.prometheus.client.MetricFamily; '
+                         'encoding=delimited')
+EXPOSITION_FORMATS = {
+    'text': CONTENT_TYPE_LATEST,
+    'openmetrics': OPENMETRICS_CONTENT_TYPE,
+    'protobuf': PROTOBUF_CONTENT_TYPE,
+}
+
+# Per-client counters whose connection_time label doubles as their _created timestamp
+CLIENT_COUNTER_FAMILIES = ('openvpn_server_client_received_bytes', 'openvpn_server_client_sent_bytes')
+
+class FrozenFamilies:
+    """Registry-like view of metric families collected once"""
+    
+    def __init__(self, families: Iterable[Metric]):
+        self.families = families
+    
+    def collect(self) -> Iterable[Metric]:
+        return self.families
+
+def negotiate_exposition_format(accept: str) -> str:
+    """Pick the exposition format preferred by an Accept header, defaulting to text"""
+    best, best_quality = 'text', 0.0
+    for media_range in accept.split(','):
+        media_type, *params = [part.strip() for part in media_range.split(';')]
+        params = dict(param.partition('=')[::2] for param in params)
+        try:
+            quality = float(params.get('q', 1.0))
+        except ValueError:
+            continue
+        if media_type == 'application/openmetrics-text':
+            candidate = 'openmetrics'
+        elif (media_type == 'application/vnd.google.protobuf'
+              and params.get('proto') == 'io.prometheus.client.MetricFamily'
+              and params.get('encoding') == 'delimited'):
+            candidate = 'protobuf'
+        elif media_type in ('text/plain', '*/*', 'text/*'):
+            candidate = 'text'
+        else:
+            continue
+        # Ties keep the earlier, i.e. the scraper's own order
+        if quality > best_quality:
+            best, best_quality = candidate, quality
+    return best
+
+def with_created_timestamps(families: Iterable[Metric]) -> Iterator[Metric]:
+    """Add _created samples to per-client counters, from their connection time"""
+    for family in families:
+        if family.name not in CLIENT_COUNTER_FAMILIES:
+            yield family
+            continue
+        created = Metric(family.name, family.documentation, family.type, family.unit)
+        created_name = family.name + '_created'
+        # Each series' samples must be contiguous, so _created follows its own _total
+        for sample in family.samples:
+            created.samples.append(sample)
+            connection_time = sample.labels.get('connection_time')
+            if connection_time:
+                created.samples.append(Sample(created_name, sample.labels, float(connection_time), None, None))
+        yield created
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+def render_sample_line(sample: Sample) -> str:
+    """Exposition line of a sample without timestamp or exemplar, the same in text and OpenMetrics"""
+    labels = ''
+    if sample.labels:
+        labels = '{' + ','.join(f'{name}="{_escape_label_value(value)}"'
+                                for name, value in sorted(sample.labels.items())) + '}'
+    return f'{sample.name}{labels} {floatToGoString(sample.value)}\n'
+
+class SampleLineCache:
+    """Rendered sample lines, reused across snapshots while a series is unchanged.
+    
+    Lines are keyed by sample name, value and the identity of the labels
+    dict, which the collector keeps for as long as a series exists; each
+    entry holds on to its dict, so an identity is never reused while cached.
+    Entries not used since the previous rotate() are dropped by the next.
+    """
+    
+    def __init__(self):
+        self._current: Dict[Tuple[str, int, float], Tuple[Dict[str, str], str]] = {}
+        self._previous: Dict[Tuple[str, int, float], Tuple[Dict[str, str], str]] = {}
+    
+    def rotate(self):
+        """Start a new generation; call once per rendered snapshot"""
+        self._previous, self._current = self._current, {}
+    
+    def line(self, sample: Sample) -> str:
+        key = (sample.name, id(sample.labels), sample.value)
+        entry = self._current.get(key)
+        if entry is None:
+            entry = self._previous.get(key)
+            if entry is None:
+                entry = (sample.labels, render_sample_line(sample))
+            self._current[key] = entry
+        return entry[1]
+
+def _encode_text_family(family: Metric, line: Callable[[Sample], str], output: List[str]):
+    # Follows prometheus_client.exposition.generate_latest
+    name, mtype = family.name, family.type
+    if mtype == 'counter':
+        name += '_total'
+    elif mtype == 'info':
+        name += '_info'
+        mtype = 'gauge'
+    elif mtype == 'stateset':
+        mtype = 'gauge'
+    elif mtype == 'gaugehistogram':
+        mtype = 'histogram'
+    elif mtype == 'unknown':
+        mtype = 'untyped'
+    documentation = family.documentation.replace('\\', r'\\').replace('\n', r'\n')
+    output.append(f'# HELP {name} {documentation}\n# TYPE {name} {mtype}\n')
+    
+    # OpenMetrics-only samples become gauges of their own after the family
+    om_samples: Dict[str, List[str]] = {}
+    om_names = {family.name + suffix: suffix for suffix in ('_created', '_gsum', '_gcount')}
+    for sample in family.samples:
+        suffix = om_names.get(sample.name)
+        if suffix is None:
+            output.append(line(sample))
+        else:
+            om_samples.setdefault(suffix, []).append(line(sample))
+    for suffix, lines in sorted(om_samples.items()):
+        output.append(f'# HELP {family.name}{suffix} {documentation}\n# TYPE {family.name}{suffix} gauge\n')
+        output.extend(lines)
+
+def _encode_openmetrics_family(family: Metric, line: Callable[[Sample], str], output: List[str]):
+    # Follows prometheus_client.openmetrics.exposition.generate_latest
+    documentation = _escape_label_value(family.documentation)
+    output.append(f'# HELP {family.name} {documentation}\n# TYPE {family.name} {family.type}\n')
+    if family.unit:
+        output.append(f'# UNIT {family.name} {family.unit}\n')
+    output.extend(map(line, family.samples))
+
+def _generate_openmetrics_without_eof(registry: FrozenFamilies) -> bytes:
+    return generate_openmetrics(registry)[:-len(OPENMETRICS_EOF)]
+
+def encode_families(families: Iterable[Metric], exposition_format: str,
+                    sample_lines: Optional[SampleLineCache] = None) -> bytes:
+    """Render metric families in an exposition format.
+    
+    Text and OpenMetrics sample lines are taken from sample_lines when
+    given. The OpenMetrics rendering omits the final # EOF so that more
+    families can be appended; close it with OPENMETRICS_EOF.
+    """
+    if exposition_format == 'protobuf':
+        return encode_protobuf(with_created_timestamps(families))
+    if exposition_format == 'text':
+        encode_family, encode_library = _encode_text_family, generate_latest
+    elif exposition_format == 'openmetrics':
+        families = with_created_timestamps(families)
+        encode_family, encode_library = _encode_openmetrics_family, _generate_openmetrics_without_eof
+    else:
+        raise ValueError(f"Unknown exposition format: {exposition_format}")
+    
+    line = sample_lines.line if sample_lines is not None else render_sample_line
+    output: List[str] = []
+    for family in families:
+        if any(sample.timestamp is not None or sample.exemplar is not None for sample in family.samples):
+            # Rare; leave timestamp and exemplar formatting to prometheus_client
+            output.append(encode_library(FrozenFamilies([family])).decode('utf-8'))
+        else:
+            encode_family(family, line, output)
+    return ''.join(output).encode('utf-8')
+
+OPENMETRICS_EOF = b'# EOF\n'
+
+# io.prometheus.client.MetricType values
+PROTOBUF_METRIC_TYPES = {'counter': 0, 'gauge': 1, 'summary': 2, 'unknown': 3, 'histogram': 4,
+                         'gaugehistogram': 5, 'info': 1, 'stateset': 1}
+
+def _varint(value: int) -> bytes:
+    if 0 <= value < 0x80:
+        return _SMALL_VARINTS[value]
+    value &= (1 << 64) - 1  # int64 fields encode negatives as ten byte varints
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+_SMALL_VARINTS = [bytes((value,)) for value in range(0x80)]
+_pack_double = struct.Struct('<d').pack
+
+def _field_bytes(field: int, data: bytes) -> bytes:
+    return _SMALL_VARINTS[field << 3 | 2] + _varint(len(data)) + data
+
+def _field_double(field: int, value: float) -> bytes:
+    return _SMALL_VARINTS[field << 3 | 1] + _pack_double(value)
+
+def _field_varint(field: int, value: int) -> bytes:
+    return _SMALL_VARINTS[field << 3] + _varint(value)
+
+def _protobuf_timestamp(field: int, seconds: float) -> bytes:
+    whole = int(seconds)
+    return _field_bytes(field, _field_varint(1, whole) + _field_varint(2, int((seconds - whole) * 1e9)))
+
+def encode_protobuf(families: Iterable[Metric]) -> bytes:
+    """Encode metric families as length-delimited io.prometheus.client.MetricFamily messages"""
+    output = []
+    # Label pairs repeat across series, and whole label sets across families (e.g. sent/received)
+    label_pairs: Dict[Tuple[str, str], bytes] = {}
+    label_sets: Dict[Tuple[Tuple[str, str], ...], bytes] = {}
+    
+    def encode_labels(labels: Tuple[Tuple[str, str], ...]) -> bytes:
+        encoded = label_sets.get(labels)
+        if encoded is not None:
+            return encoded
+        pairs = []
+        for pair in labels:
+            data = label_pairs.get(pair)
+            if data is None:
+                data = label_pairs[pair] = _field_bytes(1, _field_bytes(1, pair[0].encode())
+                                                        + _field_bytes(2, pair[1].encode()))
+            pairs.append(data)
+        encoded = label_sets[labels] = b''.join(pairs)
+        return encoded
+    
+    for family in families:
+        mtype = family.type
+        name = family.name
+        if mtype == 'counter':
+            name += '_total'
+        elif mtype == 'info':
+            name += '_info'
+        grouped = mtype in ('histogram', 'gaugehistogram', 'summary')
         
-        self.openvpn_client_pre_decompress_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
+        # Group samples into one Metric message per label set
+        series: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]] = {}
+        for sample in family.samples:
+            labels = sample.labels
+            if grouped:
+                labels = {k: v for k, v in labels.items() if k not in ('le', 'quantile')}
+            key = tuple(labels.items())
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = {}
+            suffix = sample.name[len(family.name):]
+            if not grouped:
+                entry[suffix] = sample.value
+            elif suffix in ('_bucket', '_gbucket'):
+                entry.setdefault('buckets', []).append((float(sample.labels['le']), sample.value))
+            elif 'quantile' in sample.labels:
+                entry.setdefault('quantiles', []).append((float(sample.labels['quantile']), sample.value))
+            else:
+                entry[suffix] = sample.value
         
-        self.openvpn_client_post_decompress_bytes.labels(
-            status_path=status_path, job="openvpn-metrics"
-        ).inc(0)
+        metrics = []
+        for labels, entry in series.items():
+            if mtype == 'counter':
+                value = _field_double(1, entry.get('_total', 0.0))
+                if '_created' in entry:
+                    value += _protobuf_timestamp(3, entry['_created'])
+                value = _field_bytes(3, value)
+            elif mtype in ('histogram', 'gaugehistogram'):
+                count_suffix, sum_suffix = ('_count', '_sum') if mtype == 'histogram' else ('_gcount', '_gsum')
+                value = (_field_varint(1, int(entry.get(count_suffix, 0)))
+                         + _field_double(2, entry.get(sum_suffix, 0.0)))
+                for upper_bound, cumulative_count in entry.get('buckets', []):
+                    value += _field_bytes(3, _field_varint(1, int(cumulative_count)) + _field_double(2, upper_bound))
+                if '_created' in entry:
+                    value += _protobuf_timestamp(15, entry['_created'])
+                value = _field_bytes(7, value)
+            elif mtype == 'summary':
+                value = _field_varint(1, int(entry.get('_count', 0))) + _field_double(2, entry.get('_sum', 0.0))
+                for quantile, quantile_value in entry.get('quantiles', []):
+                    value += _field_bytes(3, _field_double(1, quantile) + _field_double(2, quantile_value))
+                if '_created' in entry:
+                    value += _protobuf_timestamp(4, entry['_created'])
+                value = _field_bytes(4, value)
+            elif mtype == 'unknown':
+                value = _field_bytes(5, _field_double(1, entry.get('', 0.0)))
+            else:
+                value = _field_bytes(2, _field_double(1, entry.get('_info' if mtype == 'info' else '', 1.0)))
+            metrics.append(_field_bytes(4, encode_labels(labels) + value))
         
-        logger.info("Parsed OpenVPN CLIENT LIST with routing", 
-                   connected_clients=connected_clients,
-                   routing_entries=len(routing_entries))
+        message = b''.join([
+            _field_bytes(1, name.encode()),
+            _field_bytes(2, family.documentation.encode()),
+            _field_varint(3, PROTOBUF_METRIC_TYPES.get(mtype, 3)),
+        ] + metrics)
+        output.append(_varint(len(message)) + message)
+    return b''.join(output)
+
+class MetricsSnapshot(NamedTuple):
+    """Immutable, pre-rendered exposition of a single collection run.
+    
+    body is the text exposition; families, when kept, are the collected
+    metric families other exposition formats are rendered from. Snapshots
+    shared between processes carry those formats pre-rendered in bodies,
+    as (exposition format, body) pairs, instead.
+    """
+    body: bytes
+    generation: int
+    created_at: float
+    families: Tuple[Metric, ...] = ()
+    bodies: Tuple[Tuple[str, bytes], ...] = ()
+
+    def age_trailer(self, now: Optional[float] = None, exposition_format: str = 'text') -> bytes:
+        """Render the snapshot age gauge appended to the served body"""
+        age = GaugeMetricFamily('openvpn_exporter_snapshot_age_seconds',
+                                'Seconds since the served metrics snapshot was collected',
+                                value=max(0.0, (time.time() if now is None else now) - self.created_at))
+        trailer = encode_families([age], exposition_format)
+        return trailer + OPENMETRICS_EOF if exposition_format == 'openmetrics' else trailer
+
+class ManagementClient:
+    """Persistent connection to an OpenVPN management interface.
+    
+    Addresses are tcp://host:port or unix:///path/to/socket. The connection
+    is opened on first use and reused across collections; after a failure
+    it is dropped and reconnection is retried with exponential backoff.
+    """
+    
+    MIN_BACKOFF = 1.0
+    MAX_BACKOFF = 60.0
+    MAX_LINE_LENGTH = 64 * 1024
+    
+    def __init__(self, address: str, password: Optional[str] = None, timeout: float = 5.0):
+        parsed = urlparse(address)
+        if parsed.scheme == 'tcp' and parsed.hostname and parsed.port:
+            self._target: Union[Tuple[str, int], str] = (parsed.hostname, parsed.port)
+        elif parsed.scheme == 'unix' and parsed.path:
+            self._target = parsed.path
+        else:
+            raise ValueError(f"Invalid management address: {address}")
+        self.address = address
+        self.password = password
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[io.BufferedReader] = None
+        self._lock = threading.Lock()
+        self._backoff = 0.0
+        self._retry_at = 0.0
+    
+    def command(self, command: str) -> List[str]:
+        """Send a command and return its response lines, without notifications.
         
-        return {"connected_clients": connected_clients, "routing_entries": len(routing_entries)}
+        Single-line SUCCESS responses are returned as is, multi-line responses
+        (e.g. status) up to their END line. ERROR responses raise ValueError.
+        """
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                self._sock.sendall(command.encode() + b'\n')
+                lines = self._read_response()
+            except (OSError, ValueError):
+                self._disconnect()
+                raise
+        if lines and lines[0].startswith('ERROR:'):
+            raise ValueError(f"Management command '{command}' failed: {lines[0][6:].strip()}")
+        return lines
+    
+    def close(self):
+        with self._lock:
+            self._disconnect(backoff=False)
+    
+    def _connect(self):
+        now = time.monotonic()
+        if now < self._retry_at:
+            raise ConnectionError(f"Reconnecting to {self.address} in {self._retry_at - now:.1f}s")
+        try:
+            if isinstance(self._target, str):
+                self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._sock.settimeout(self.timeout)
+                self._sock.connect(self._target)
+            else:
+                self._sock = socket.create_connection(self._target, self.timeout)
+            self._reader = self._sock.makefile('rb')
+            if self.password is not None:
+                self._authenticate()
+        except (OSError, ValueError):
+            self._disconnect()
+            raise
+        self._backoff = 0.0
+        logger.info("Connected to OpenVPN management interface", address=self.address)
+    
+    def _authenticate(self):
+        # The prompt is not newline terminated
+        prompt = b''
+        while not prompt.endswith(b'ENTER PASSWORD:'):
+            data = self._reader.read1(len(b'ENTER PASSWORD:'))
+            if not data or len(prompt) > self.MAX_LINE_LENGTH:
+                raise ConnectionError(f"No password prompt from management interface: {self.address}")
+            prompt += data
+        self._sock.sendall(self.password.encode() + b'\n')
+        response = self._read_response()
+        if not response or not response[0].startswith('SUCCESS:'):
+            raise ValueError(f"Management interface rejected the password: {self.address}")
+    
+    def _disconnect(self, backoff: bool = True):
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = self._reader = None
+        if backoff:
+            self._backoff = min(max(self._backoff * 2, self.MIN_BACKOFF), self.MAX_BACKOFF)
+            self._retry_at = time.monotonic() + self._backoff
+    
+    def _read_line(self) -> str:
+        line = self._reader.readline(self.MAX_LINE_LENGTH)
+        if not line.endswith(b'\n'):
+            if len(line) < self.MAX_LINE_LENGTH:
+                raise ConnectionError(f"Management interface closed the connection: {self.address}")
+            raise ValueError(f"Management interface line too long: more than {self.MAX_LINE_LENGTH} bytes")
+        return line.decode('utf-8', errors='ignore').rstrip('\r\n')
+    
+    def _read_response(self) -> List[str]:
+        lines = []
+        size = 0
+        while True:
+            line = self._read_line()
+            if line.startswith('>'):
+                continue  # Real-time notification, not part of the response
+            if not lines and line.startswith(('SUCCESS:', 'ERROR:')):
+                return [line]
+            if line == 'END':
+                return lines
+            size += len(line) + 1
+            if size > SecurityValidator.MAX_FILE_SIZE:
+                raise ValueError(f"Management response too large: more than {SecurityValidator.MAX_FILE_SIZE} bytes")
+            lines.append(line)
 
 class OpenVPNExporter:
     """Main OpenVPN Exporter class"""
     
-    def __init__(self, status_paths: List[str], ignore_individuals: bool = False):
+    def __init__(self, status_paths: List[str], ignore_individuals: bool = False, stale_grace_period: float = 0.0,
+                 workers: int = 1, worker_type: str = 'thread', file_timeout: float = 0.0,
+                 management_addresses: Optional[List[str]] = None, management_password: Optional[str] = None,
+                 rate_smoothing: Optional[float] = None, timezone_name: Optional[str] = None):
+        if worker_type not in ('thread', 'process'):
+            raise ValueError(f"Unknown worker type: {worker_type}")
         self.status_paths = status_paths
         self.ignore_individuals = ignore_individuals
-        self.parser = OpenVPNStatusParser(status_paths, ignore_individuals)
+        self.self_metrics = ExporterSelfMetrics()
+        self.parser = OpenVPNStatusParser(status_paths, ignore_individuals, stale_grace_period, self.self_metrics,
+                                          rate_smoothing, timezone_name)
         self.validator = SecurityValidator()
+        self._collect_lock = threading.Lock()
+        self._generation = 0
+        # Rendered lines of unchanged series carry over between snapshots
+        self.sample_lines = SampleLineCache()
+        
+        # Parallel collection; with a single worker files are parsed inline
+        self.workers = workers
+        self.worker_type = worker_type
+        self.file_timeout = file_timeout
+        self._executor: Optional[Executor] = None
+        self._abandoned: Dict[str, Future] = {}  # status_path -> parse that exceeded the timeout
+        self._cancel_events: Dict[Future, threading.Event] = {}  # Thread pool parse -> its abandon_parse event
+        
+        # Management interfaces are queried over persistent connections, one per address
+        self.management_clients = [ManagementClient(address, management_password)
+                                   for address in management_addresses or []]
     
-    def collect_metrics(self):
-        """Collect metrics from all status files"""
-        for status_path in self.status_paths:
-            try:
-                self.parser.parse_status_file(status_path)
-                self.parser.openvpn_up.labels(status_path=status_path, job="openvpn-metrics").set(1)
-            except Exception as e:
-                logger.error("Failed to collect metrics", path=status_path, error=str(e))
-                self.parser.openvpn_up.labels(status_path=status_path, job="openvpn-metrics").set(0)
+    def collect_metrics(self, status_paths: Optional[Iterable[str]] = None):
+        """Collect metrics from the given status files (all of them, and the management interfaces, by default)"""
+        if status_paths is None:
+            for client in self.management_clients:
+                self._collect_management(client)
+        status_paths = list(self.status_paths if status_paths is None else status_paths)
+        if self.workers > 1 and len(status_paths) > 1:
+            self._collect_parallel(status_paths)
+        else:
+            for status_path in status_paths:
+                self._collect_file(status_path)
+    
+    def _collect_management(self, client: ManagementClient):
+        """Query one management interface in the calling thread"""
+        start = time.perf_counter()
+        try:
+            self.parser.parse_management(client)
+            self.parser.set_up(client.address, True)
+        except Exception as e:
+            logger.error("Failed to collect metrics", address=client.address, error=str(e))
+            self.parser.set_up(client.address, False)
+        finally:
+            self.self_metrics.parse_duration.labels(status_path=client.address).set(time.perf_counter() - start)
+    
+    def _collect_file(self, status_path: str):
+        """Parse one status file in the calling thread"""
+        start = time.perf_counter()
+        try:
+            self.parser.parse_status_file(status_path)
+            self.parser.set_up(status_path, True)
+        except Exception as e:
+            logger.error("Failed to collect metrics", path=status_path, error=str(e))
+            self.parser.set_up(status_path, False)
+        finally:
+            self.self_metrics.parse_duration.labels(status_path=status_path).set(time.perf_counter() - start)
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.worker_type == 'process':
+                # Spawn rather than fork: the exporter process runs server and collector threads
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='openvpn-parser')
+        return self._executor
+    
+    def _submit(self, status_path: str) -> Optional[Future]:
+        """Schedule a parse of one status file; None if it needs no worker"""
+        if self.worker_type == 'thread':
+            cancelled = threading.Event()
+            future = self._get_executor().submit(self.parser.parse_status_file, status_path, cancelled)
+            self._cancel_events[future] = cancelled
+            return future
+        
+        # Cache checks are cheap and need the parser's state, so they stay in this process
+        start = time.perf_counter()
+        try:
+            if self.parser.cached_result(status_path) is not None:
+                self.parser.set_up(status_path, True)
+                # Recorded like the thread and sequential modes record their cache hits
+                self.self_metrics.parse_duration.labels(status_path=status_path).set(time.perf_counter() - start)
+                return None
+        except OSError:
+            pass  # Let the worker report the failure
+        return self._get_executor().submit(parse_status_file_isolated, status_path, self.ignore_individuals,
+                                           self.parser.timezone_name)
+    
+    def _finish(self, status_path: str, future: Future, started: float):
+        """Record the outcome of a completed parallel parse"""
+        self._cancel_events.pop(future, None)
+        try:
+            result = future.result()
+            if self.worker_type == 'process':
+                self.parser.adopt_parse(status_path, result)
+            self.parser.set_up(status_path, True)
+        except Exception as e:
+            logger.error("Failed to collect metrics", path=status_path, error=str(e))
+            self.parser.set_up(status_path, False)
+        self.self_metrics.parse_duration.labels(status_path=status_path).set(time.monotonic() - started)
+    
+    def _collect_parallel(self, status_paths: List[str]):
+        """Parse status files concurrently, abandoning any that exceed the per-file timeout"""
+        futures: Dict[Future, str] = {}
+        for status_path in status_paths:
+            abandoned = self._abandoned.get(status_path)
+            if abandoned is not None:
+                if not abandoned.done():
+                    logger.warning("Previous parse still running, skipping", path=status_path)
+                    self.parser.set_up(status_path, False)
+                    continue
+                del self._abandoned[status_path]
+            future = self._submit(status_path)
+            if future is not None:
+                futures[future] = status_path
+        
+        # Timeouts count from when a parse starts running, not from when it was queued
+        started: Dict[Future, float] = {}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            for future in pending:
+                if future not in started and (future.running() or future.done()):
+                    started[future] = now
+            
+            if not self.file_timeout:
+                timeout = None
+            elif len(started) < len(futures):
+                timeout = 0.05  # Re-check soon for queued parses that start running
+            else:
+                timeout = max(0.0, min(started[f] for f in pending) + self.file_timeout - now)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                self._finish(futures[future], future, started.get(future, now))
+            
+            if self.file_timeout:
+                now = time.monotonic()
+                for future in [f for f in pending if f in started and now - started[f] >= self.file_timeout]:
+                    status_path = futures[future]
+                    pending.discard(future)
+                    cancelled = self._cancel_events.pop(future, None)
+                    if cancelled is not None:
+                        # The worker thread keeps running; its result must not be published late
+                        self.parser.abandon_parse(cancelled)
+                    self._abandoned[status_path] = future
+                    self.parser.set_up(status_path, False)
+                    self.self_metrics.parse_timeouts.labels(status_path=status_path).inc()
+                    self.self_metrics.parse_duration.labels(status_path=status_path).set(now - started[future])
+                    logger.error("Status file parse timed out", path=status_path, timeout=self.file_timeout)
+    
+    def close(self):
+        """Shut down the worker pool, if any, and management connections"""
+        for client in self.management_clients:
+            client.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def render_snapshot(self, status_paths: Optional[Iterable[str]] = None) -> MetricsSnapshot:
+        """Collect metrics and render them into a new immutable snapshot.
+        
+        Only the given status files are re-parsed; the others keep their
+        current snapshot.
+        """
+        # Serialize collections so concurrent scrapes never interleave parses
+        with self._collect_lock:
+            self.collect_metrics(status_paths)
+            self._generation += 1
+            families = tuple(chain(self.parser.registry.collect(), self.self_metrics.registry.collect()))
+            self.sample_lines.rotate()
+            start = time.perf_counter()
+            body = encode_families(families, 'text', self.sample_lines)
+            self.self_metrics.serialize_duration.labels(format='text').observe(time.perf_counter() - start)
+            return MetricsSnapshot(
+                body=body,
+                generation=self._generation,
+                created_at=time.time(),
+                families=families,
+            )
     
     def get_metrics(self) -> str:
         """Get metrics in Prometheus format"""
-        self.collect_metrics()
-        return generate_latest(self.parser.registry)
+        return self.render_snapshot().body.decode('utf-8')
+
+class StatusFileWatcher:
+    """Base class for status file change watchers.
+    
+    Subclasses report raw changes through _read_changes(); wait() debounces
+    bursts (e.g. OpenVPN truncating and rewriting a file in several writes)
+    into a single set of changed status paths.
+    """
+    
+    # Quiet period after a change before the burst is reported
+    DEFAULT_DEBOUNCE = 0.2
+    
+    def __init__(self, status_paths: List[str], debounce: float = DEFAULT_DEBOUNCE):
+        self.status_paths = list(status_paths)
+        self.debounce = debounce
+    
+    def wait(self, timeout: float) -> Set[str]:
+        """Block up to timeout for changes; return the changed status paths"""
+        changed = self._read_changes(timeout)
+        if changed and self.debounce > 0:
+            # Keep collecting until the files have been quiet for the debounce period
+            deadline = time.monotonic() + self.debounce * 10
+            while time.monotonic() < deadline:
+                more = self._read_changes(self.debounce)
+                if not more:
+                    break
+                changed |= more
+        return changed
+    
+    def _read_changes(self, timeout: float) -> Set[str]:
+        raise NotImplementedError
+    
+    def wakeup(self):
+        """Interrupt a wait() blocked in another thread"""
+    
+    def close(self):
+        """Release watcher resources"""
+
+class PollingWatcher(StatusFileWatcher):
+    """Detects status file changes by comparing (inode, size, mtime) signatures"""
+    
+    POLL_INTERVAL = 1.0
+    
+    def __init__(self, status_paths: List[str], debounce: float = StatusFileWatcher.DEFAULT_DEBOUNCE,
+                 poll_interval: float = POLL_INTERVAL):
+        super().__init__(status_paths, debounce)
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._signatures = {path: self._signature(path) for path in self.status_paths}
+    
+    @staticmethod
+    def _signature(status_path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(status_path)
+            return (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+    
+    def poll(self) -> Set[str]:
+        """Return the status paths whose signature changed since the last poll"""
+        changed = set()
+        for status_path in self.status_paths:
+            signature = self._signature(status_path)
+            if signature != self._signatures.get(status_path):
+                self._signatures[status_path] = signature
+                changed.add(status_path)
+        return changed
+    
+    def _read_changes(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = self.poll()
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0 or self._wakeup.wait(min(self.poll_interval, remaining)):
+                self._wakeup.clear()
+                return changed
+    
+    def wakeup(self):
+        self._wakeup.set()
 
-def create_app(status_paths: List[str], ignore_individuals: bool = False, allowed_ips: Optional[List[str]] = None) -> Flask:
-    """Create Flask application with security enhancements"""
+class InotifyWatcher(StatusFileWatcher):
+    """Watches the directories of the status files with Linux inotify (via ctypes).
+    
+    Directories rather than files are watched, so both in-place rewrites
+    (IN_MODIFY / IN_CLOSE_WRITE) and write-then-rename replacements
+    (IN_MOVED_TO / IN_CREATE) are seen, and watches survive the file's inode
+    changing. A directory that goes away (IN_IGNORED, e.g. removed and
+    recreated by config management) is watched again once it reappears.
+    """
+    
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+    
+    # Seconds between attempts to watch a directory that went away again
+    REWATCH_INTERVAL = 1.0
+    
+    _libc = None
+    
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            cls._libc = libc
+        return cls._libc
+    
+    @classmethod
+    def available(cls) -> bool:
+        """Whether inotify can be used on this platform"""
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            libc = cls._load_libc()
+            return hasattr(libc, 'inotify_init1') and hasattr(libc, 'inotify_add_watch')
+        except OSError:
+            return False
+    
+    def __init__(self, status_paths: List[str], debounce: float = StatusFileWatcher.DEFAULT_DEBOUNCE):
+        super().__init__(status_paths, debounce)
+        libc = self._load_libc()
+        
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        
+        # (directory, file name) -> status paths, for both the path and its symlink target
+        self._targets: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        for status_path in self.status_paths:
+            for target in {os.path.abspath(status_path), os.path.realpath(status_path)}:
+                directory, name = os.path.split(target)
+                self._targets[(directory, name)].add(status_path)
+        
+        self._directories: Dict[int, str] = {}
+        self._unwatched: Set[str] = set()  # Directories that went away, until they can be watched again
+        for directory in {directory for directory, _ in self._targets}:
+            try:
+                self._watch(directory)
+            except OSError:
+                os.close(self._fd)
+                raise
+        
+        # Self-pipe used to interrupt select() from other threads
+        self._wakeup_read, self._wakeup_write = os.pipe()
+    
+    def _watch(self, directory: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+        self._directories[wd] = directory
+    
+    def _rewatch(self) -> Set[str]:
+        """Watch directories that went away again; their status paths count as changed"""
+        changed = set()
+        for directory in list(self._unwatched):
+            try:
+                self._watch(directory)
+            except OSError:
+                continue
+            self._unwatched.discard(directory)
+            logger.info("Watching status file directory again", directory=directory)
+            for (target_directory, _), status_paths in self._targets.items():
+                if target_directory == directory:
+                    changed.update(status_paths)
+        return changed
+    
+    def _read_changes(self, timeout: float) -> Set[str]:
+        if self._fd < 0:
+            return set()
+        changed = self._rewatch()
+        if self._unwatched:
+            timeout = min(timeout, self.REWATCH_INTERVAL)
+        try:
+            readable, _, _ = select.select([self._fd, self._wakeup_read], [], [], timeout)
+            if self._wakeup_read in readable:
+                os.read(self._wakeup_read, 512)
+                return changed
+            if not readable:
+                return changed
+            data = os.read(self._fd, 64 * 1024)
+        except (BlockingIOError, InterruptedError):
+            return changed
+        
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b'\0')
+            offset += name_length
+            
+            if mask & (self.IN_Q_OVERFLOW | self.IN_IGNORED):
+                # Events were lost or a watched directory went away: treat everything as changed
+                changed.update(self.status_paths)
+                if mask & self.IN_IGNORED:
+                    directory = self._directories.pop(wd, None)
+                    if directory is not None:
+                        logger.warning("Status file directory is no longer watched, retrying",
+                                       directory=directory)
+                        self._unwatched.add(directory)
+                continue
+            directory = self._directories.get(wd)
+            if directory is not None:
+                changed.update(self._targets.get((directory, os.fsdecode(name)), ()))
+        return changed
+    
+    def wakeup(self):
+        if self._fd >= 0:
+            os.write(self._wakeup_write, b'\0')
+    
+    def close(self):
+        if self._fd >= 0:
+            fd, self._fd = self._fd, -1
+            for descriptor in (fd, self._wakeup_read, self._wakeup_write):
+                os.close(descriptor)
+
+def create_watcher(status_paths: List[str], mode: str = 'auto',
+                   debounce: float = StatusFileWatcher.DEFAULT_DEBOUNCE) -> StatusFileWatcher:
+    """Create a status file watcher: inotify, stat polling, or the best available ('auto')"""
+    if mode not in ('auto', 'inotify', 'poll'):
+        raise ValueError(f"Unknown watch mode: {mode}")
+    if mode != 'poll' and InotifyWatcher.available():
+        try:
+            return InotifyWatcher(status_paths, debounce)
+        except OSError as e:
+            if mode == 'inotify':
+                raise
+            logger.warning("inotify unavailable, falling back to polling", error=str(e))
+    elif mode == 'inotify':
+        raise OSError("inotify is not available on this platform")
+    return PollingWatcher(status_paths, debounce)
+
+class BackgroundCollector:
+    """Refreshes metrics off the request path and keeps the latest snapshot"""
+    
+    # Upper bound on how long the refresh thread blocks before checking for shutdown
+    WAKEUP_INTERVAL = 1.0
+    
+    def __init__(self, exporter: OpenVPNExporter, interval: float = 15.0,
+                 watcher: Optional[StatusFileWatcher] = None,
+                 on_snapshot: Optional[Callable[[MetricsSnapshot], None]] = None):
+        if interval <= 0:
+            raise ValueError(f"Collector interval must be positive: {interval}")
+        self.exporter = exporter
+        self.interval = interval
+        self.watcher = watcher or PollingWatcher(exporter.status_paths)
+        self.on_snapshot = on_snapshot
+        self._snapshot: Optional[MetricsSnapshot] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def snapshot(self) -> Optional[MetricsSnapshot]:
+        """Latest snapshot; swapped atomically, safe to read from any thread"""
+        return self._snapshot
+    
+    def start(self):
+        """Collect once synchronously, then keep refreshing in a daemon thread"""
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name='openvpn-collector', daemon=True)
+        self._thread.start()
+        logger.info("Background collector started", interval=self.interval,
+                    watcher=type(self.watcher).__name__)
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the refresh thread"""
+        self._stop_event.set()
+        self.watcher.wakeup()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.watcher.close()
+    
+    def refresh(self, status_paths: Optional[Iterable[str]] = None):
+        """Re-parse the given status files (all by default) and publish a new snapshot"""
+        try:
+            self._snapshot = self.exporter.render_snapshot(status_paths)
+            if self.on_snapshot is not None:
+                self.on_snapshot(self._snapshot)
+        except Exception as e:
+            logger.error("Background collection failed", error=str(e))
+    
+    def _run(self):
+        next_refresh = time.monotonic() + self.interval
+        while not self._stop_event.is_set():
+            timeout = min(self.WAKEUP_INTERVAL, max(0.0, next_refresh - time.monotonic()))
+            changed = self.watcher.wait(timeout)
+            if self._stop_event.is_set():
+                break
+            if time.monotonic() >= next_refresh:
+                self.refresh()
+                next_refresh = time.monotonic() + self.interval
+            elif changed:
+                self.refresh(sorted(changed))
+
+class SharedSnapshotStore:
+    """Snapshot file shared by several server processes: one publishes, all read"""
+    
+    HEADER = struct.Struct('!QdQQQ')  # generation, created_at, sizes of the text and SHARED_FORMATS bodies
+    # Exposition formats published pre-rendered next to the text body, so
+    # every worker can negotiate them without the metric families
+    SHARED_FORMATS = ('openmetrics', 'protobuf')
+    
+    def __init__(self, directory: str):
+        if fcntl is None:
+            raise OSError("Shared snapshots require fcntl file locking")
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.path = os.path.join(directory, 'metrics.snapshot')
+        self._lock_path = os.path.join(directory, 'collector.lock')
+        self._lock_file = None
+        self._cached: Tuple[Optional[Tuple[int, int, int]], Optional[MetricsSnapshot]] = (None, None)
+    
+    def acquire_leadership(self) -> bool:
+        """Try to become the collecting process; the lock is held until the process exits"""
+        if self._lock_file is not None:
+            return True
+        lock_file = open(self._lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+    
+    def publish(self, snapshot: MetricsSnapshot):
+        """Atomically replace the shared snapshot"""
+        bodies = dict(snapshot.bodies)
+        if snapshot.families:
+            for exposition_format in self.SHARED_FORMATS:
+                bodies[exposition_format] = encode_families(snapshot.families, exposition_format)
+        shared = [bodies.get(exposition_format, b'') for exposition_format in self.SHARED_FORMATS]
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(snapshot.generation, snapshot.created_at, len(snapshot.body),
+                                     *map(len, shared)))
+            f.write(snapshot.body)
+            for body in shared:
+                f.write(body)
+        os.replace(tmp_path, self.path)
+    
+    def load(self) -> Optional[MetricsSnapshot]:
+        """Latest published snapshot, re-read only after it has been replaced"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        cached_signature, cached_snapshot = self._cached
+        if signature == cached_signature:
+            return cached_snapshot
+        
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        generation, created_at, *sizes = self.HEADER.unpack_from(data)
+        bodies, offset = [], self.HEADER.size
+        for size in sizes:
+            bodies.append(data[offset:offset + size])
+            offset += size
+        text, *shared = bodies
+        snapshot = MetricsSnapshot(text, generation, created_at, bodies=tuple(
+            (exposition_format, body) for exposition_format, body in zip(self.SHARED_FORMATS, shared) if body
+        ))
+        self._cached = (signature, snapshot)
+        return snapshot
+
+class SharedCollector:
+    """Runs one BackgroundCollector for all server worker processes.
+    
+    Every process competes for the store's lock. The holder collects and
+    publishes snapshots; the others serve the last published one and take
+    over when the holder exits.
+    """
+    
+    LEADERSHIP_RETRY_INTERVAL = 5.0
+    FIRST_SNAPSHOT_TIMEOUT = 10.0
+    
+    def __init__(self, collector: BackgroundCollector, store: SharedSnapshotStore):
+        self.collector = collector
+        self.store = store
+        self.collector.on_snapshot = store.publish
+        self.leader = False
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def snapshot(self) -> Optional[MetricsSnapshot]:
+        if self.leader:
+            return self.collector.snapshot
+        return self.store.load()
+    
+    def start(self):
+        """Collect as the leader, or wait for the leader's first snapshot"""
+        if self._try_lead():
+            return
+        self._thread = threading.Thread(target=self._run, name='openvpn-collector-standby', daemon=True)
+        self._thread.start()
+        
+        # Workers booting alongside the leader would otherwise answer scrapes without metrics
+        deadline = time.monotonic() + self.FIRST_SNAPSHOT_TIMEOUT
+        while self.snapshot is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+    
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.leader:
+            self.collector.stop(timeout)
+    
+    def _try_lead(self) -> bool:
+        if not self.store.acquire_leadership():
+            return False
+        logger.info("Collecting metrics for all server workers", pid=os.getpid())
+        self.leader = True
+        self.collector.start()
+        return True
+    
+    def _run(self):
+        while not self._stop_event.wait(self.LEADERSHIP_RETRY_INTERVAL):
+            if self._try_lead():
+                return
+
+class MetricsResponseCache:
+    """Encodes /metrics responses once per snapshot.
+    
+    Other exposition formats and compressed variants of a snapshot body
+    are built on first request and reused until the snapshot changes. The
+    per-request age trailer is rendered and compressed separately, then
+    appended as another gzip member or zstd frame, which decoders
+    concatenate transparently. Snapshots carry weak
+    validators (ETag, Last-Modified) so unchanged ones are answered with
+    304 Not Modified.
+    
+    Only ETag revalidation gets 304s in practice, and only when snapshots
+    outlive a scrape, i.e. with the background collector: in scrape mode
+    every request renders a new snapshot. Last-Modified has whole seconds,
+    so If-Modified-Since only matches snapshots from before that second;
+    echoing Last-Modified back never yields a 304.
+    """
+    
+    GZIP_LEVEL = 6
+    ZSTD_LEVEL = 3
+    
+    def __init__(self, sample_lines: Optional[SampleLineCache] = None,
+                 self_metrics: Optional[ExporterSelfMetrics] = None):
+        self.sample_lines = sample_lines
+        self.self_metrics = self_metrics
+        self.encodings = ('zstd', 'gzip') if zstandard is not None else ('gzip',)
+        self._lock = threading.Lock()
+        self._snapshot_key: Optional[Tuple[int, float]] = None
+        self._encoded: Dict[Tuple[str, str], bytes] = {}
+    
+    def negotiate(self, accept_encoding: str) -> str:
+        """Pick the preferred supported encoding allowed by an Accept-Encoding header"""
+        accepted = {}
+        for item in accept_encoding.split(','):
+            coding, _, params = item.strip().lower().partition(';')
+            quality = 1.0
+            name, _, value = params.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+            accepted[coding.strip()] = quality
+        for encoding in self.encodings:
+            if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+                return encoding
+        return 'identity'
+    
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == 'gzip':
+            return gzip.compress(data, compresslevel=self.GZIP_LEVEL, mtime=0)
+        if encoding == 'zstd':
+            return zstandard.ZstdCompressor(level=self.ZSTD_LEVEL).compress(data)
+        return data
+    
+    def encoded_body(self, snapshot: MetricsSnapshot, exposition_format: str, encoding: str) -> bytes:
+        """The snapshot body in the given format and encoding, rendered at most once per snapshot"""
+        if exposition_format == 'text' and encoding == 'identity':
+            return snapshot.body
+        with self._lock:
+            key = (snapshot.generation, snapshot.created_at)
+            if key != self._snapshot_key:
+                self._snapshot_key = key
+                self._encoded = {}
+            body = self._encoded.get((exposition_format, encoding))
+            if body is None:
+                if exposition_format == 'text':
+                    body = snapshot.body
+                else:
+                    body = self._encoded.get((exposition_format, 'identity'))
+                    if body is None and not snapshot.families:
+                        body = self._encoded[(exposition_format, 'identity')] = dict(snapshot.bodies)[exposition_format]
+                    if body is None:
+                        start = time.perf_counter()
+                        body = self._encoded[(exposition_format, 'identity')] = encode_families(
+                            snapshot.families, exposition_format, self.sample_lines
+                        )
+                        if self.self_metrics is not None:
+                            self.self_metrics.serialize_duration.labels(format=exposition_format).observe(
+                                time.perf_counter() - start
+                            )
+                body = self._encoded[(exposition_format, encoding)] = self.compress(body, encoding)
+            return body
+    
+    @staticmethod
+    def validators(snapshot: MetricsSnapshot, exposition_format: str = 'text') -> Dict[str, str]:
+        # Weak: bodies of one snapshot differ only in the age trailer
+        suffix = '' if exposition_format == 'text' else f'-{exposition_format}'
+        return {
+            'ETag': f'W/"{snapshot.generation}-{int(snapshot.created_at * 1000)}{suffix}"',
+            'Last-Modified': formatdate(snapshot.created_at, usegmt=True),
+        }
+    
+    def respond(self, snapshot: MetricsSnapshot, request_headers: Mapping[str, str]
+                ) -> Tuple[int, Dict[str, str], bytes]:
+        """Status, headers and body answering a /metrics request for a snapshot.
+        
+        Request header names are looked up in lower case.
+        """
+        # Other formats are rendered from the families, or pre-rendered in shared snapshots
+        exposition_format = 'text'
+        if snapshot.families or snapshot.bodies:
+            exposition_format = negotiate_exposition_format(request_headers.get('accept', ''))
+            if not snapshot.families and exposition_format not in dict(snapshot.bodies):
+                exposition_format = 'text'
+
+        headers = self.validators(snapshot, exposition_format)
+        headers['Vary'] = 'Accept, Accept-Encoding'
+        
+        if_none_match = request_headers.get('if-none-match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            # "*" matches any current representation, and /metrics always has one
+            not_modified = '*' in tags or headers['ETag'] in (tag if tag.startswith('W/') else f'W/{tag}'
+                                                              for tag in tags)
+        else:
+            try:
+                since = parsedate_to_datetime(request_headers.get('if-modified-since', ''))
+                # HTTP dates have whole seconds: a snapshot from the same second as
+                # since may be newer than what the scraper has, so it counts as modified
+                not_modified = snapshot.created_at < since.timestamp()
+            except (TypeError, ValueError):
+                not_modified = False
+        if not_modified:
+            return 304, headers, b''
+        
+        encoding = self.negotiate(request_headers.get('accept-encoding', ''))
+        headers['Content-Type'] = EXPOSITION_FORMATS[exposition_format]
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        trailer = snapshot.age_trailer(exposition_format=exposition_format)
+        return 200, headers, self.encoded_body(snapshot, exposition_format, encoding) + self.compress(trailer, encoding)
+
+INDEX_PAGE = '''
+        <html>
+        <head><title>OpenVPN Exporter v2.0</title></head>
+        <body>
+        <h1>OpenVPN Exporter v2.0</h1>
+        <p><a href='/metrics'>Metrics</a></p>
+        <p><a href='/health'>Health Check</a></p>
+        <p>Enhanced security features:</p>
+        <ul>
+        <li>Path traversal protection</li>
+        <li>Input validation and sanitization</li>
+        <li>Rate limiting</li>
+        <li>Secure logging</li>
+        <li>Content validation</li>
+        </ul>
+        </body>
+        </html>
+        '''
+
+def health_status() -> Dict[str, str]:
+    """Health check response body"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "version": VERSION
+    }
+
+def create_collection(status_paths: List[str], ignore_individuals: bool = False,
+                      collector_mode: str = 'scrape', collector_interval: float = 15.0,
+                      stale_grace_period: float = 0.0, collector_watch: str = 'auto',
+                      collector_workers: int = 1, collector_worker_type: str = 'thread',
+                      collector_file_timeout: float = 0.0, snapshot_dir: Optional[str] = None,
+                      management_addresses: Optional[List[str]] = None, management_password: Optional[str] = None,
+                      rate_smoothing: Optional[float] = None, status_timezone: Optional[str] = None
+                      ) -> Tuple[OpenVPNExporter, Optional[Union[BackgroundCollector, SharedCollector]]]:
+    """Create the exporter and, in background mode, its started collector.
+    
+    With snapshot_dir, background collection is shared by every server
+    process using that directory (see SharedCollector).
+    """
+    exporter = OpenVPNExporter(status_paths, ignore_individuals, stale_grace_period,
+                               workers=collector_workers, worker_type=collector_worker_type,
+                               file_timeout=collector_file_timeout,
+                               management_addresses=management_addresses,
+                               management_password=management_password,
+                               rate_smoothing=rate_smoothing,
+                               timezone_name=status_timezone)
+    
+    # In background mode scrapes only ever read the latest pre-rendered snapshot
+    collector = None
+    if collector_mode == 'background':
+        watcher = create_watcher(status_paths, collector_watch)
+        collector = BackgroundCollector(exporter, interval=collector_interval, watcher=watcher)
+        if snapshot_dir:
+            collector = SharedCollector(collector, SharedSnapshotStore(snapshot_dir))
+        collector.start()
+    elif collector_mode != 'scrape':
+        raise ValueError(f"Unknown collector mode: {collector_mode}")
+    return exporter, collector
+
+def create_app(status_paths: List[str], ignore_individuals: bool = False, allowed_ips: Optional[List[str]] = None,
+               trusted_proxies: Optional[List[str]] = None, **collection_options) -> Flask:
+    """Create Flask application with security enhancements.
+    
+    allowed_ips and trusted_proxies are addresses or CIDR networks;
+    collection_options are passed to create_collection.
+    """
     app = Flask(__name__)
     
     # Disable Flask request logging for ERROR level to reduce noise
@@ -911,18 +3025,22 @@ def create_app(status_paths: List[str], ignore_individuals: bool = False, allowe
         logging.getLogger('werkzeug').disabled = True
     
     # Initialize exporter
-    exporter = OpenVPNExporter(status_paths, ignore_individuals)
-    validator = SecurityValidator()
+    exporter, collector = create_collection(status_paths, ignore_individuals, **collection_options)
+    validator = SecurityValidator(exporter.self_metrics)
+    response_cache = MetricsResponseCache(exporter.sample_lines, exporter.self_metrics)
+    allowed_networks = IPNetworkSet(allowed_ips) if allowed_ips else None
+    trusted_networks = IPNetworkSet(trusted_proxies or [])
+    app.extensions['openvpn_collector'] = collector
     
     def get_client_ip() -> str:
         """Get real client IP address"""
-        return request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
+        return resolve_client_ip(request.remote_addr or '', request.headers.get('X-Forwarded-For'), trusted_networks)
     
     def check_ip_access():
         """Check if client IP is allowed"""
-        if allowed_ips:
+        if allowed_networks is not None:
             client_ip = get_client_ip()
-            if client_ip not in allowed_ips:
+            if client_ip not in allowed_networks:
                 logger.warning("Access denied", client_ip=client_ip, allowed_ips=allowed_ips)
                 abort(403)
     
@@ -939,8 +3057,12 @@ def create_app(status_paths: List[str], ignore_individuals: bool = False, allowe
         rate_limit_check()
         
         try:
-            metrics_data = exporter.get_metrics()
-            return Response(metrics_data, mimetype=CONTENT_TYPE_LATEST)
+            with exporter.self_metrics.scrapes_in_flight.track_inprogress():
+                snapshot = collector.snapshot if collector else exporter.render_snapshot()
+                if snapshot is None:
+                    raise RuntimeError("No metrics snapshot available yet")
+                status, headers, body = response_cache.respond(snapshot, request.headers)
+            return Response(body, status=status, headers=headers)
         except Exception as e:
             logger.error("Error generating metrics", error=str(e))
             abort(500)
@@ -949,33 +3071,12 @@ def create_app(status_paths: List[str], ignore_individuals: bool = False, allowe
     def health():
         """Health check endpoint"""
         # Health check is usually allowed from anywhere for monitoring
-        return jsonify({
-            "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "version": "2.0.4"
-        })
+        return jsonify(health_status())
     
     @app.route('/')
     def index():
         """Main page"""
-        return '''
-        <html>
-        <head><title>OpenVPN Exporter v2.0</title></head>
-        <body>
-        <h1>OpenVPN Exporter v2.0</h1>
-        <p><a href='/metrics'>Metrics</a></p>
-        <p><a href='/health'>Health Check</a></p>
-        <p>Enhanced security features:</p>
-        <ul>
-        <li>Path traversal protection</li>
-        <li>Input validation and sanitization</li>
-        <li>Rate limiting</li>
-        <li>Secure logging</li>
-        <li>Content validation</li>
-        </ul>
-        </body>
-        </html>
-        '''
+        return INDEX_PAGE
     
     @app.errorhandler(429)
     def rate_limit_exceeded(e):
@@ -987,62 +3088,360 @@ def create_app(status_paths: List[str], ignore_individuals: bool = False, allowe
     
     return app
 
-def main():
-    """Main function"""
+class AsyncMetricsServer:
+    """Flask-free HTTP server running on a single asyncio event loop.
+    
+    Serves the same endpoints as create_app with the same IP allow-list and
+    rate limiting. Status files are read in the loop's default executor, so
+    a slow parse never stalls health probes or other scrapes.
+    """
+    
+    MAX_REQUEST_LINE = 8192
+    MAX_HEADERS = 100
+    IDLE_TIMEOUT = 30.0
+    
+    def __init__(self, exporter: OpenVPNExporter, allowed_ips: Optional[List[str]] = None,
+                 collector: Optional[Union[BackgroundCollector, SharedCollector]] = None,
+                 trusted_proxies: Optional[List[str]] = None):
+        self.exporter = exporter
+        self.allowed_ips = allowed_ips
+        self.allowed_networks = IPNetworkSet(allowed_ips) if allowed_ips else None
+        self.trusted_networks = IPNetworkSet(trusted_proxies or [])
+        self.collector = collector
+        self.validator = SecurityValidator(exporter.self_metrics)
+        self.response_cache = MetricsResponseCache(exporter.sample_lines, exporter.self_metrics)
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=self.MAX_REQUEST_LINE)
+        return self._server
+    
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.collector is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.collector.stop)
+        self.exporter.close()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info('peername')
+        remote_addr = peer[0] if peer else ''
+        try:
+            keep_alive = True
+            while keep_alive:
+                request_line = await asyncio.wait_for(reader.readline(), self.IDLE_TIMEOUT)
+                if not request_line:
+                    break
+                headers = await self._read_headers(reader)
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    self._write(writer, 400, self._text_headers('text/plain'), b'Bad Request\n', keep_alive=False)
+                    break
+        
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                if method not in ('GET', 'HEAD'):
+                    status, response_headers, body = 405, self._text_headers('text/plain'), b'Method Not Allowed\n'
+                else:
+                    status, response_headers, body = await self._dispatch(urlparse(target).path, headers,
+                                                                          remote_addr)
+                self._write(writer, status, response_headers, b'' if method == 'HEAD' else body,
+                            keep_alive, content_length=len(body))
+                await writer.drain()
+        except (asyncio.TimeoutError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_headers(self, reader: asyncio.StreamReader) -> Dict[str, str]:
+        headers = {}
+        for _ in range(self.MAX_HEADERS):
+            line = await asyncio.wait_for(reader.readline(), self.IDLE_TIMEOUT)
+            if line in (b'\r\n', b'\n', b''):
+                return headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        raise ValueError("Too many request headers")
+    
+    @staticmethod
+    def _text_headers(content_type: str) -> Dict[str, str]:
+        return {'Content-Type': content_type}
+    
+    async def _dispatch(self, path: str, headers: Mapping[str, str], remote_addr: str
+                        ) -> Tuple[int, Dict[str, str], bytes]:
+        if path == '/metrics':
+            client_ip = resolve_client_ip(remote_addr, headers.get('x-forwarded-for'), self.trusted_networks)
+            return await self._metrics(headers, client_ip)
+        if path == '/health':
+            # Health check is usually allowed from anywhere for monitoring
+            return 200, self._text_headers('application/json'), json.dumps(health_status()).encode()
+        if path == '/':
+            return 200, self._text_headers('text/html; charset=utf-8'), INDEX_PAGE.encode()
+        return 404, self._text_headers('text/plain'), b'Not Found\n'
+    
+    async def _metrics(self, headers: Mapping[str, str], client_ip: str) -> Tuple[int, Dict[str, str], bytes]:
+        if self.allowed_networks is not None and client_ip not in self.allowed_networks:
+            logger.warning("Access denied", client_ip=client_ip, allowed_ips=self.allowed_ips)
+            return 403, self._text_headers('text/plain'), b'Forbidden\n'
+        if not self.validator.check_rate_limit(client_ip):
+            return 429, self._text_headers('application/json'), json.dumps({"error": "Rate limit exceeded"}).encode()
+        
+        try:
+            with self.exporter.self_metrics.scrapes_in_flight.track_inprogress():
+                if self.collector:
+                    snapshot = self.collector.snapshot
+                else:
+                    snapshot = await asyncio.get_running_loop().run_in_executor(None, self.exporter.render_snapshot)
+                if snapshot is None:
+                    raise RuntimeError("No metrics snapshot available yet")
+                return self.response_cache.respond(snapshot, headers)
+        except Exception as e:
+            logger.error("Error generating metrics", error=str(e))
+            return 500, self._text_headers('application/json'), json.dumps({"error": "Internal server error"}).encode()
+    
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: bytes,
+               keep_alive: bool, content_length: Optional[int] = None):
+        head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        head.append(f"Content-Length: {len(body) if content_length is None else content_length}")
+        head.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+
+def create_async_server(status_paths: List[str], ignore_individuals: bool = False,
+                        allowed_ips: Optional[List[str]] = None, trusted_proxies: Optional[List[str]] = None,
+                        **collection_options) -> AsyncMetricsServer:
+    """Create the asyncio server; takes the same options as create_app"""
+    exporter, collector = create_collection(status_paths, ignore_individuals, **collection_options)
+    return AsyncMetricsServer(exporter, allowed_ips, collector, trusted_proxies)
+
+async def serve_async(server: AsyncMetricsServer, host: str, port: int):
+    """Serve until cancelled"""
+    listener = await server.start(host, port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line arguments; every option defaults to its environment variable"""
     parser = argparse.ArgumentParser(description='OpenVPN Prometheus Exporter v2.0')
-    parser.add_argument('--web.listen-address', 
+    parser.add_argument('--web.listen-address',
                        default=os.environ.get('LISTEN_ADDRESS', ':9176'),
                        help='Address to listen on for web interface and telemetry')
-    parser.add_argument('--web.telemetry-path', 
+    parser.add_argument('--web.telemetry-path',
                        default=os.environ.get('TELEMETRY_PATH', '/metrics'),
                        help='Path under which to expose metrics')
-    parser.add_argument('--openvpn.status_paths', 
+    parser.add_argument('--web.server',
+                       default=os.environ.get('WEB_SERVER', 'gunicorn'),
+                       choices=['gunicorn', 'async', 'development'],
+                       help='Serve with gunicorn threaded workers, a single asyncio event loop, '
+                            'or the single-threaded Flask development server')
+    parser.add_argument('--web.workers',
+                       type=int,
+                       default=int(os.environ.get('WEB_WORKERS', '1')),
+                       help='Number of gunicorn worker processes')
+    parser.add_argument('--web.threads',
+                       type=int,
+                       default=int(os.environ.get('WEB_THREADS', '4')),
+                       help='Number of request threads per gunicorn worker')
+    parser.add_argument('--web.snapshot-dir',
+                       default=os.environ.get('SNAPSHOT_DIR', ''),
+                       help='Directory through which gunicorn workers share one collector (defaults to a temporary directory)')
+    parser.add_argument('--openvpn.status_paths',
                        default=os.environ.get('STATUS_PATHS', 'examples/client.status,examples/server2.status,examples/server3.status'),
                        help='Paths at which OpenVPN places its status files')
-    parser.add_argument('--ignore.individuals', 
+    parser.add_argument('--openvpn.management_addresses',
+                       default=os.environ.get('MANAGEMENT_ADDRESSES', ''),
+                       help='Comma-separated OpenVPN management interfaces to query (tcp://host:port or unix:///path)')
+    parser.add_argument('--openvpn.management_password',
+                       default=os.environ.get('MANAGEMENT_PASSWORD', ''),
+                       help='Password of the OpenVPN management interfaces, if any')
+    parser.add_argument('--openvpn.status_timezone',
+                       default=os.environ.get('STATUS_TIMEZONE', ''),
+                       help="IANA timezone of the times OpenVPN writes as text, e.g. Europe/Berlin, or 'local' for this host's local time (default: UTC)")
+    parser.add_argument('--ignore.individuals',
                        action='store_true',
                        default=os.environ.get('IGNORE_INDIVIDUALS', 'false').lower() == 'true',
                        help='If ignoring metrics for individuals')
-    parser.add_argument('--web.allowed-ips', 
+    parser.add_argument('--web.allowed-ips',
                        default=os.environ.get('ALLOWED_IPS', ''),
-                       help='Comma-separated list of allowed IP addresses for metrics access')
-    parser.add_argument('--log-level', 
+                       help='Comma-separated list of IP addresses or CIDR networks allowed to access metrics')
+    parser.add_argument('--web.trusted-proxies',
+                       default=os.environ.get('TRUSTED_PROXIES', ''),
+                       help='Comma-separated IP addresses or CIDR networks of reverse proxies whose '
+                            'X-Forwarded-For header is trusted')
+    parser.add_argument('--log-level',
                        default=os.environ.get('LOG_LEVEL', 'INFO'),
                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                        help='Log level')
-    
-    args = parser.parse_args()
-    
-    # Configure logging level for all loggers
-    log_level = getattr(logging, args.log_level)
+    parser.add_argument('--log-trace-every',
+                       type=int,
+                       default=int(os.environ.get('LOG_TRACE_EVERY', '0')),
+                       help='At DEBUG level, trace every n-th parsed status file row (0 disables)')
+    parser.add_argument('--log-trace-rate',
+                       type=float,
+                       default=float(os.environ.get('LOG_TRACE_RATE', '10')),
+                       help='Maximum traced rows per second')
+    parser.add_argument('--collector.mode',
+                       default=os.environ.get('COLLECTOR_MODE', 'scrape'),
+                       choices=['scrape', 'background'],
+                       help='Collect on every scrape, or in a background thread serving pre-rendered snapshots')
+    parser.add_argument('--collector.interval',
+                       type=float,
+                       default=float(os.environ.get('COLLECTOR_INTERVAL', '15')),
+                       help='Seconds between background refreshes (changed files are picked up sooner)')
+    parser.add_argument('--collector.stale-grace-period',
+                       type=float,
+                       default=float(os.environ.get('STALE_GRACE_PERIOD', '0')),
+                       help='Seconds to keep exporting clients that disappeared from a status file before evicting them')
+    parser.add_argument('--collector.watch',
+                       default=os.environ.get('COLLECTOR_WATCH', 'auto'),
+                       choices=['auto', 'inotify', 'poll'],
+                       help='How the background collector detects status file changes')
+    parser.add_argument('--collector.workers',
+                       type=int,
+                       default=int(os.environ.get('COLLECTOR_WORKERS', '1')),
+                       help='Number of status files parsed concurrently (1 parses them one after another)')
+    parser.add_argument('--collector.worker-type',
+                       default=os.environ.get('COLLECTOR_WORKER_TYPE', 'thread'),
+                       choices=['thread', 'process'],
+                       help='Parse in worker threads, or in worker processes to use several CPUs')
+    parser.add_argument('--collector.file-timeout',
+                       type=float,
+                       default=float(os.environ.get('COLLECTOR_FILE_TIMEOUT', '0')),
+                       help='Seconds before a parallel parse of one status file is abandoned (0 waits forever)')
+    parser.add_argument('--collector.rate-smoothing',
+                       type=float,
+                       default=float(os.environ['RATE_SMOOTHING']) if os.environ.get('RATE_SMOOTHING') else None,
+                       help='Export per-client and per-server bytes/sec gauges, smoothed over this many seconds '
+                            '(0 for the last interval only); disabled when unset')
+    return parser
+
+def configure_logging(log_level_name: str, trace_every: int = 0, trace_rate: float = 10.0):
+    """Configure logging level for all loggers, and row tracing at DEBUG level"""
+    log_level = getattr(logging, log_level_name)
     logging.getLogger().setLevel(log_level)
     logging.getLogger('werkzeug').setLevel(log_level)  # Flask's request logger
     logging.getLogger('urllib3').setLevel(log_level)   # HTTP requests logger
     structlog.get_logger().setLevel(log_level)
-    
+    ROW_TRACE.configure(trace_every if log_level <= logging.DEBUG else 0, trace_rate)
+
+def app_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """Translate parsed arguments into create_app keyword arguments"""
     # Parse status paths
-    status_paths = [path.strip() for path in getattr(args, 'openvpn.status_paths').split(',')]
+    status_paths = [path.strip() for path in getattr(args, 'openvpn.status_paths').split(',') if path.strip()]
+    management_addresses = [address.strip() for address in getattr(args, 'openvpn.management_addresses').split(',')
+                            if address.strip()]
     
     # Parse allowed IPs
     allowed_ips_str = getattr(args, 'web.allowed_ips')
     allowed_ips = [ip.strip() for ip in allowed_ips_str.split(',') if ip.strip()] if allowed_ips_str else None
+    trusted_proxies = [ip.strip() for ip in getattr(args, 'web.trusted_proxies').split(',') if ip.strip()]
     
-    logger.info("Starting OpenVPN Exporter v2.0.4",
+    options = {
+        'status_paths': status_paths,
+        'ignore_individuals': getattr(args, 'ignore.individuals'),
+        'allowed_ips': allowed_ips,
+        'trusted_proxies': trusted_proxies,
+        'collector_mode': getattr(args, 'collector.mode'),
+        'collector_interval': getattr(args, 'collector.interval'),
+        'stale_grace_period': getattr(args, 'collector.stale_grace_period'),
+        'collector_watch': getattr(args, 'collector.watch'),
+        'collector_workers': getattr(args, 'collector.workers'),
+        'collector_worker_type': getattr(args, 'collector.worker_type'),
+        'collector_file_timeout': getattr(args, 'collector.file_timeout'),
+        'rate_smoothing': getattr(args, 'collector.rate_smoothing'),
+        'status_timezone': getattr(args, 'openvpn.status_timezone') or None,
+        'snapshot_dir': None,
+        'management_addresses': management_addresses,
+        'management_password': getattr(args, 'openvpn.management_password') or None,
+    }
+    
+    # Several gunicorn workers share one background collector instead of each parsing the files
+    if getattr(args, 'web.server') == 'gunicorn' and getattr(args, 'web.workers') > 1:
+        if options['collector_mode'] != 'background':
+            logger.info("Using background collection to share one collector between server workers")
+            options['collector_mode'] = 'background'
+        options['snapshot_dir'] = getattr(args, 'web.snapshot_dir') or tempfile.mkdtemp(prefix='openvpn-exporter-')
+    return options
+
+def create_wsgi_app() -> Flask:
+    """WSGI application factory configured from the environment, for external servers:
+    
+        gunicorn -k gthread --threads 4 'openvpn_exporter:create_wsgi_app()'
+    
+    With several gunicorn workers, set WEB_WORKERS to match and SNAPSHOT_DIR
+    so that they share one collector.
+    """
+    args = build_arg_parser().parse_args([])
+    configure_logging(args.log_level, args.log_trace_every, args.log_trace_rate)
+    if getattr(args, 'web.workers') > 1 and not getattr(args, 'web.snapshot_dir'):
+        # A temporary directory would be private to each worker
+        logger.warning("SNAPSHOT_DIR is not set, every server worker collects on its own")
+        setattr(args, 'web.workers', 1)
+    return create_app(**app_options(args))
+
+def run_gunicorn(app_factory: Callable[[], Flask], bind: str, workers: int, threads: int, log_level: str):
+    """Serve the application with gunicorn's threaded workers"""
+    
+    class GunicornApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', bind)
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('loglevel', log_level.lower())
+            if log_level == 'DEBUG':
+                self.cfg.set('accesslog', '-')
+        
+        def load(self):
+            # Runs in each worker after fork, so collector threads start there
+            return app_factory()
+    
+    GunicornApplication().run()
+
+def main():
+    """Main function"""
+    args = build_arg_parser().parse_args()
+    configure_logging(args.log_level, args.log_trace_every, args.log_trace_rate)
+    
+    server = getattr(args, 'web.server')
+    if server == 'gunicorn' and BaseApplication is None:
+        logger.warning("gunicorn is not installed, falling back to the development server")
+        server = 'development'
+        setattr(args, 'web.server', server)
+    options = app_options(args)
+    
+    logger.info(f"Starting OpenVPN Exporter v{VERSION}",
                 listen_address=getattr(args, 'web.listen_address'),
                 metrics_path=getattr(args, 'web.telemetry_path'),
-                status_paths=status_paths,
-                ignore_individuals=getattr(args, 'ignore.individuals'),
-                allowed_ips=allowed_ips)
-    
-    # Create Flask app
-    app = create_app(status_paths, getattr(args, 'ignore.individuals'), allowed_ips)
+                server=server,
+                web_workers=getattr(args, 'web.workers'),
+                web_threads=getattr(args, 'web.threads'),
+                **{name: value for name, value in options.items() if name != 'management_password'})
     
     # Start server
     host, port = getattr(args, 'web.listen_address').split(':')
     if not host:
         host = '0.0.0.0'
     
-    app.run(host=host, port=int(port), debug=False)
+    if server == 'gunicorn':
+        run_gunicorn(lambda: create_app(**options), f'{host}:{port}',
+                     getattr(args, 'web.workers'), getattr(args, 'web.threads'), args.log_level)
+    elif server == 'async':
+        try:
+            asyncio.run(serve_async(create_async_server(**options), host, int(port)))
+        except KeyboardInterrupt:
+            pass
+    else:
+        # Create Flask app
+        app = create_app(**options)
+        app.run(host=host, port=int(port), debug=False)
 
 if __name__ == '__main__':
     main()
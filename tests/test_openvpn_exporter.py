@@ -7,14 +7,37 @@ import unittest
 import tempfile
 import os
 import json
-from unittest.mock import patch, mock_open
+import time
+import threading
+import asyncio
+import socketserver
+import gzip
+import struct
+import re
+import math
+import logging
+from unittest.mock import patch
 from pathlib import Path
+from itertools import chain
+from datetime import timezone
 
 # Import the exporter modules
 import sys
 sys.path.insert(0, '.')
 
-from openvpn_exporter import SecurityValidator, OpenVPNStatusParser, OpenVPNExporter
+from openvpn_exporter import (
+    SecurityValidator, OpenVPNStatusParser, OpenVPNExporter, BackgroundCollector, create_app,
+    PollingWatcher, InotifyWatcher, SharedSnapshotStore, SharedCollector, MetricsSnapshot,
+    build_arg_parser, app_options, create_async_server, ManagementClient, MetricsResponseCache,
+    encode_families, negotiate_exposition_format, OPENMETRICS_EOF, RateLimiter,
+    IPNetworkSet, resolve_client_ip, VALIDATION_CACHES, ClientRecord, RouteRecord, SampleLineCache,
+    ROW_TRACE, configure_logging, parse_status_time, status_timezone, parse_status_file_isolated,
+    _env_int
+)
+from prometheus_client import CollectorRegistry, Counter, Histogram, Info, Summary, generate_latest
+from prometheus_client.openmetrics.exposition import generate_latest as generate_openmetrics
+from prometheus_client.openmetrics.parser import text_string_to_metric_families
+from benchmarks.synthetic import client_list, server_status
 
 class TestSecurityValidator(unittest.TestCase):
     """Test security validation functionality"""
@@ -53,10 +76,27 @@ class TestSecurityValidator(unittest.TestCase):
         self.assertTrue(self.validator.validate_ip_address("192.168.1.1"))
         self.assertTrue(self.validator.validate_ip_address("10.0.0.1"))
         self.assertTrue(self.validator.validate_ip_address("unknown"))
+        self.assertTrue(self.validator.validate_ip_address("2001:db8::1"))
+        self.assertTrue(self.validator.validate_ip_address("192.168.10.0/24"))  # iroute
         
         # Invalid IPs
         self.assertFalse(self.validator.validate_ip_address("999.999.999.999"))
         self.assertFalse(self.validator.validate_ip_address("not-an-ip"))
+        self.assertFalse(self.validator.validate_ip_address("10.0.0.1/33"))
+    
+    def test_validation_caches(self):
+        """Test repeated identities are answered from cache and the caches are exported"""
+        for cached in VALIDATION_CACHES.values():
+            cached.cache_clear()
+        for _ in range(3):
+            self.assertEqual(self.validator.sanitize_filename("client/1"), "client1")
+            self.assertTrue(self.validator.validate_ip_address("10.8.0.2"))
+        self.assertEqual(VALIDATION_CACHES['sanitize'].cache_info().hits, 2)
+        self.assertEqual(VALIDATION_CACHES['ip_address'].cache_info().hits, 2)
+        
+        metrics = OpenVPNExporter([]).get_metrics()
+        self.assertIn('openvpn_exporter_validation_cache_hits_total{cache="sanitize"} 2.0', metrics)
+        self.assertIn('openvpn_exporter_validation_cache_entries{cache="ip_address"} 1.0', metrics)
     
     def test_validate_file_content(self):
         """Test file content validation"""
@@ -71,6 +111,137 @@ class TestSecurityValidator(unittest.TestCase):
         # Empty content
         self.assertFalse(self.validator.validate_file_content(""))
         self.assertFalse(self.validator.validate_file_content(None))
+    
+    def test_content_scanners_match_patterns(self):
+        """Test the combined scanners flag exactly what the individual patterns do"""
+        samples = [
+            "x<SCRIPT src=a>", "<script", "<iframe\n>", "<Object data=1>", "<embed>", "<embedded",
+            "JavaScript:alert(1)", "javascript :x", "vbScript:x", "script:x", "DATA:Text/HTML,x",
+            "data:text/plain", "10.8.0.2:1194", "Updated,12:00:00", "a<b>c", ":javascript",
+        ]
+        for sample in samples:
+            expected = not any(re.search(pattern, sample, re.IGNORECASE)
+                               for pattern in SecurityValidator.SUSPICIOUS_PATTERNS)
+            self.assertEqual(self.validator.validate_file_content(sample), expected, sample)
+    
+    def test_env_int(self):
+        """Test integer settings fall back to their default instead of failing the import"""
+        with patch.dict(os.environ, {'MAX_FILE_SIZE': '1024'}):
+            self.assertEqual(_env_int('MAX_FILE_SIZE', 64), 1024)
+        for value in ('67108864  # 64MB in bytes', 'lots', '0', '-5', ''):
+            with self.subTest(value=value), patch.dict(os.environ, {'MAX_FILE_SIZE': value}), \
+                    patch('openvpn_exporter.logger') as logger:
+                self.assertEqual(_env_int('MAX_FILE_SIZE', 64), 64)
+                self.assertEqual(logger.warning.called, bool(value))
+    
+    def test_suspicious_content_across_batches(self):
+        """Test streamed validation catches a tag split over the batch boundary"""
+        parser = OpenVPNStatusParser([])
+        filler = "OpenVPN STATISTICS\n" + "x" * (parser.VALIDATION_BATCH_SIZE - 10) + "<script\n"
+        with self.assertRaises(ValueError):
+            parser._parse_content(filler + "src=x>\nEND\n", "test.status")
+        
+        # Tags spanning several lines across the boundary, opened early in the batch
+        for before, after in (("<script\nfoo\nbar\n", "src=x>\n"),
+                              ("<IFRAME a\n", "b\nc\nsrc=x>\n"),
+                              ("<embed\n" + "y\n" * 10, "z\n" * 3 + ">\n")):
+            padding = "z" * (parser.VALIDATION_BATCH_SIZE - len(before) - 19)
+            content = "OpenVPN STATISTICS\n" + padding + "\n" + before + after + "END\n"
+            with self.subTest(before=before[:7]), self.assertRaises(ValueError):
+                parser._parse_content(content, "test.status")
+        
+        # A closed tag doesn't carry over
+        content = "OpenVPN STATISTICS\n" + "<b>" + "z" * parser.VALIDATION_BATCH_SIZE + "\nsrc=x>\nEND\n"
+        self.assertEqual(parser._parse_content(content, "test.status")["status"], "parsed")
+
+class TestRateLimiter(unittest.TestCase):
+    """Test the token bucket rate limiter"""
+    
+    def test_burst_then_limited(self):
+        """Test a client may burst up to capacity, then waits for refills"""
+        limiter = RateLimiter(capacity=3, window=60)
+        self.assertEqual([limiter.allow("10.0.0.1") for _ in range(4)], [True, True, True, False])
+        self.assertTrue(limiter.allow("10.0.0.2"))
+    
+    def test_refill(self):
+        """Test tokens come back at capacity / window per second"""
+        limiter = RateLimiter(capacity=2, window=0.2)
+        self.assertTrue(limiter.allow("10.0.0.1"))
+        self.assertTrue(limiter.allow("10.0.0.1"))
+        self.assertFalse(limiter.allow("10.0.0.1"))
+        time.sleep(0.15)
+        self.assertTrue(limiter.allow("10.0.0.1"))
+    
+    def test_client_table_is_bounded(self):
+        """Test the least recently seen clients are forgotten beyond max_clients"""
+        limiter = RateLimiter(capacity=1, window=60, max_clients=RateLimiter.SHARDS * 4)
+        for i in range(10000):
+            limiter.allow(f"10.0.{i // 256}.{i % 256}")
+        self.assertLessEqual(len(limiter), RateLimiter.SHARDS * 4)
+    
+    def test_idle_clients_expire(self):
+        """Test clients idle for a whole window are dropped"""
+        limiter = RateLimiter(capacity=1, window=0.05)
+        limiter.allow("10.0.0.1")
+        time.sleep(0.1)
+        for i in range(2, 200):
+            limiter.allow(f"10.0.0.{i}")
+        self.assertNotIn("10.0.0.1", dict(chain.from_iterable(b.items() for _, b in limiter._shards)))
+    
+    def test_decisions_exported(self):
+        """Test rate limit decisions and table size are exported"""
+        with patch.object(SecurityValidator, 'MAX_REQUESTS_PER_WINDOW', 1):
+            app = create_app(["examples/status/server2.status"])
+            client = app.test_client()
+            self.assertEqual(client.get('/metrics').status_code, 200)
+            self.assertEqual(client.get('/metrics').status_code, 429)
+            body = client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.9'}).data
+        self.assertIn(b'openvpn_exporter_rate_limit_decisions_total{decision="limited"} 1.0', body)
+        self.assertIn(b'openvpn_exporter_rate_limit_tracked_clients 2.0', body)
+
+class TestIPAccessControl(unittest.TestCase):
+    """Test CIDR allow-lists and trusted proxy handling"""
+    
+    def test_networks(self):
+        """Test addresses and CIDR networks of both IP versions"""
+        networks = IPNetworkSet(["192.168.1.100", "10.0.0.0/8", "2001:db8::/32", "not-an-ip"])
+        self.assertIn("192.168.1.100", networks)
+        self.assertIn("10.255.0.1", networks)
+        self.assertIn("2001:db8::1", networks)
+        self.assertIn("::ffff:10.1.2.3", networks)
+        self.assertNotIn("192.168.1.101", networks)
+        self.assertNotIn("11.0.0.1", networks)
+        self.assertNotIn("2001:db9::1", networks)
+        self.assertNotIn("unknown", networks)
+    
+    def test_ranges_are_merged(self):
+        """Test overlapping and adjacent networks compile into one range"""
+        networks = IPNetworkSet(["10.0.0.0/25", "10.0.0.128/25", "10.0.0.0/24", "10.0.0.7"])
+        self.assertEqual(len(networks), 1)
+        self.assertIn("10.0.0.200", networks)
+        self.assertNotIn("10.0.1.0", networks)
+    
+    def test_resolve_client_ip(self):
+        """Test X-Forwarded-For is only honoured from trusted proxies"""
+        proxies = IPNetworkSet(["127.0.0.1", "172.16.0.0/12"])
+        self.assertEqual(resolve_client_ip("192.0.2.1", "10.0.0.1", proxies), "192.0.2.1")
+        self.assertEqual(resolve_client_ip("127.0.0.1", None, proxies), "127.0.0.1")
+        self.assertEqual(resolve_client_ip("127.0.0.1", "10.0.0.1", proxies), "10.0.0.1")
+        # A client cannot spoof its address by prepending hops
+        self.assertEqual(resolve_client_ip("127.0.0.1", "10.0.0.9, 192.0.2.7, 172.16.0.2", proxies), "192.0.2.7")
+        self.assertEqual(resolve_client_ip("127.0.0.1", "172.16.0.3, 172.16.0.2", proxies), "172.16.0.3")
+    
+    def test_app_allow_list(self):
+        """Test the Flask app matches CIDRs against the resolved client address"""
+        app = create_app(["examples/status/server2.status"], allowed_ips=["10.0.0.0/24"],
+                         trusted_proxies=["127.0.0.1"])
+        client = app.test_client()
+        self.assertEqual(client.get('/metrics', headers={'X-Forwarded-For': '10.0.0.5'}).status_code, 200)
+        self.assertEqual(client.get('/metrics', headers={'X-Forwarded-For': '10.0.1.5'}).status_code, 403)
+        self.assertEqual(client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.6'}).status_code, 200)
+        response = client.get('/metrics', headers={'X-Forwarded-For': '10.0.0.5'},
+                              environ_base={'REMOTE_ADDR': '192.0.2.1'})
+        self.assertEqual(response.status_code, 403)
 
 class TestOpenVPNStatusParser(unittest.TestCase):
     """Test OpenVPN status file parsing"""
@@ -94,9 +265,58 @@ pre-decompress bytes,162596168
 post-decompress bytes,216965355
 END"""
         
+        self.parser = OpenVPNStatusParser(self.status_paths, ignore_individuals=False)
         result = self.parser._parse_content(client_content, "test_client.status")
         self.assertIsInstance(result, dict)
         self.assertEqual(result["status"], "parsed")
+        client_stats = self.parser.snapshots["test_client.status"]["client_stats"]
+        self.assertEqual(len(client_stats), 9)
+        self.assertEqual(client_stats["openvpn_client_pre_decompress_bytes"], 162596168)
+        self.assertEqual(self.parser.snapshots["test_client.status"]["update_time"], 1490092749)
+    
+    def test_parse_client_status_unknown_keys(self):
+        """Test unknown numeric keys are exposed generically and invalid values are skipped"""
+        content = "OpenVPN STATISTICS\nTUN/TAP read bytes,12\nTUN/TAP write bytes,n/a\nData channel drops,3\nEND"
+        with patch('openvpn_exporter.logger') as logger:
+            self.parser._parse_content(content, "test_client.status")
+        self.assertEqual(logger.warning.call_args.kwargs['key'], 'TUN/TAP write bytes')
+        
+        snapshot = self.parser.snapshots["test_client.status"]
+        self.assertEqual(snapshot["client_stats"], {"openvpn_client_tun_tap_read_bytes": 12.0})
+        body = encode_families(self.parser.registry.collect(), 'text').decode()
+        self.assertRegex(body, r'openvpn_client_statistic\{job="openvpn-metrics",statistic="Data[^"]*drops",'
+                               r'status_path="test_client.status"\} 3.0')
+    
+    def test_parse_client_status_rejected_keys(self):
+        """Test unknown non-numeric keys are counted on every parse and logged once"""
+        content = "OpenVPN STATISTICS\nTUN/TAP read bytes,{}\nCipher,AES-256-GCM\nEND"
+        with patch('openvpn_exporter.logger') as logger:
+            for value in (1, 2):
+                self.parser._parse_content(content.format(value), "test_client.status")
+        rejected = [call for call in logger.warning.call_args_list
+                    if call.args == ("Unknown non-numeric client statistic",)]
+        self.assertEqual([call.kwargs['key'] for call in rejected], ['Cipher'])
+        self.assertEqual(self.parser.self_metrics.registry.get_sample_value(
+            'openvpn_exporter_rejected_client_statistics_total', {'status_path': 'test_client.status'}), 2)
+        self.assertEqual(self.parser.snapshots["test_client.status"]["client_other_stats"], {})
+    
+    def test_collect_reuses_families(self):
+        """Test metric families are rebuilt only when a snapshot or status changed"""
+        content = "OpenVPN STATISTICS\nTUN/TAP read bytes,{}\nEND"
+        self.parser._parse_content(content.format(1), "test_client.status")
+        collector = self.parser.metrics_collector
+        first = list(collector.collect())
+        self.assertEqual([id(family) for family in collector.collect()], [id(family) for family in first])
+        
+        self.parser.set_up("test_client.status", False)
+        second = list(collector.collect())
+        self.assertIsNot(second[0], first[0])
+        
+        self.parser._parse_content(content.format(2), "test_client.status")
+        third = list(collector.collect())
+        self.assertIsNot(third[0], second[0])
+        values = {family.name: family.samples[0].value for family in third if family.samples}
+        self.assertEqual(values['openvpn_client_tun_tap_read_bytes'], 2)
     
     def test_parse_server_status_v2(self):
         """Test parsing server status file v2"""
@@ -113,6 +333,77 @@ END"""
         self.assertIsInstance(result, dict)
         self.assertEqual(result["connected_clients"], 1)
     
+    def test_parse_server_status_header_order(self):
+        """Test server status columns are resolved from HEADER regardless of order"""
+        server_content = """TITLE,OpenVPN 2.6.12 x86_64-pc-linux-gnu
+TIME,Fri Sep 27 07:30:00 2024,1727422200
+HEADER,CLIENT_LIST,Username,Bytes Sent,Common Name,Real Address,Virtual Address,Virtual IPv6 Address,Bytes Received,Connected Since (time_t)
+CLIENT_LIST,user1,200,client1,192.168.1.100:12345,10.8.0.2,fd00::2,100,1727416800
+HEADER,ROUTING_TABLE,Common Name,Virtual Address,Real Address,Last Ref (time_t)
+ROUTING_TABLE,client1,10.8.0.2,192.168.1.100:12345,1727422100
+END"""
+        
+        self.parser._parse_content(server_content, "test_server.status")
+        snapshot = self.parser.snapshots["test_server.status"]
+        client = ClientRecord("client1", "192.168.1.100:12345", "10.8.0.2/fd00::2", "user1", "1727416800",
+                              100.0, 200.0)
+        route = RouteRecord("client1", "192.168.1.100:12345", "10.8.0.2", 1727422100.0)
+        self.assertEqual(snapshot["clients"], {client.key: client})
+        self.assertEqual(snapshot["routes"], {route.key: route})
+        self.assertEqual(snapshot["update_time"], 1727422200.0)
+    
+    def test_parse_streams_large_content(self):
+        """Test content is validated while streaming, beyond the first batch"""
+        rows = "".join(
+            f"CLIENT_LIST,client{i},192.168.1.{i % 250}:1194,10.8.0.{i % 250},1,2,x,1489680543,user{i}\n"
+            for i in range(5000)
+        )
+        header = "TITLE,OpenVPN 2.6.12\nHEADER,CLIENT_LIST,Common Name,Real Address,Virtual Address," \
+                 "Bytes Received,Bytes Sent,Connected Since,Connected Since (time_t),Username\n"
+        
+        result = self.parser._parse_content(header + rows + "END\n", "large.status")
+        self.assertEqual(result["connected_clients"], 5000)
+        
+        with self.assertRaises(ValueError):
+            self.parser._parse_content(header + rows + "<script>alert(1)</script>\nEND\n", "rejected.status")
+        self.assertNotIn("rejected.status", self.parser.snapshots)
+    
+    def test_parse_skips_leading_comments(self):
+        """Test format detection skips blank lines and comments"""
+        result = self.parser._parse_content("# comment\n\nOpenVPN STATISTICS\nTUN/TAP read bytes,5\nEND",
+                                            "commented.status")
+        self.assertEqual(result["status"], "parsed")
+    
+    def test_parse_commented_examples(self):
+        """Test the bundled example status files, which open with comments, are detected"""
+        for path in sorted(Path("examples/status").glob("*.status")):
+            with self.subTest(path=path.name), patch('openvpn_exporter.logger'):
+                self.parser._parse_content(path.read_text(), path.name)
+                self.assertEqual(self.parser.snapshots[path.name]["generation"], 1)
+    
+    def test_counters_are_absolute(self):
+        """Test repeated parses expose the file's totals instead of accumulating them"""
+        server_content = """TITLE,OpenVPN 2.3.2 x86_64-pc-linux-gnu
+TIME,Tue Mar 21 10:39:14 2017,1490089154
+HEADER,CLIENT_LIST,Common Name,Real Address,Virtual Address,Bytes Received,Bytes Sent,Connected Since,Connected Since (time_t),Username
+CLIENT_LIST,client1,192.168.1.100:12345,10.8.0.2,139583,710764,Thu Mar 16 17:09:03 2017,1489680543,user1
+END"""
+        labels = {
+            'status_path': 'test_server.status', 'common_name': 'client1', 'real_address': '192.168.1.100:12345',
+            'virtual_address': '10.8.0.2', 'username': 'user1', 'job': 'openvpn-metrics',
+            'connection_time': '1489680543',
+        }
+        
+        for _ in range(3):
+            self.parser._parse_content(server_content, "test_server.status")
+        
+        registry = self.parser.registry
+        self.assertEqual(registry.get_sample_value('openvpn_server_client_received_bytes_total', labels), 139583)
+        self.assertEqual(registry.get_sample_value('openvpn_server_client_sent_bytes_total', labels), 710764)
+        self.assertEqual(registry.get_sample_value(
+            'openvpn_openvpn_server_connected_clients', {'status_path': 'test_server.status', 'job': 'openvpn-metrics'}
+        ), 1)
+    
     def test_parse_server_status_v3(self):
         """Test parsing server status file v3"""
         server_content = """TITLE	OpenVPN 2.3.2 x86_64-pc-linux-gnu
@@ -128,6 +419,395 @@ END"""
         self.assertIsInstance(result, dict)
         self.assertEqual(result["connected_clients"], 1)
 
+    def test_parse_shuffled_header_columns(self):
+        """Test columns are resolved from HEADER lines in any order and with either separator"""
+        self.parser._parse_content(server_status(50, ','), "ordered.status")
+        self.parser._parse_content(server_status(50, '\t', shuffle_columns=True), "shuffled.status")
+        ordered, shuffled = (self.parser.snapshots[path] for path in ("ordered.status", "shuffled.status"))
+        self.assertEqual(len(shuffled["clients"]), 50)
+        self.assertEqual(shuffled["clients"], ordered["clients"])
+        self.assertEqual(shuffled["routes"], ordered["routes"])
+    
+    def test_parse_client_list_records(self):
+        """Test the CLIENT LIST format yields the same records, addressed from the routing table"""
+        content = """OpenVPN CLIENT LIST
+Updated,2025-09-25 14:35:00
+Common Name,Real Address,Bytes Received,Bytes Sent,Connected Since
+client1,192.168.1.100:12345,100,200,2025-09-25 14:30:36
+client2,192.168.1.101:12345,300,400,2025-09-25 14:31:00
+ROUTING TABLE
+Virtual Address,Common Name,Real Address,Last Ref
+10.8.0.2,client1,192.168.1.100:12345,2025-09-25 14:34:00
+GLOBAL STATS
+Max bcast/mcast queue length,0
+END"""
+        
+        self.parser._parse_content(content, "test_list.status")
+        snapshot = self.parser.snapshots["test_list.status"]
+        clients = {client.common_name: client for client in snapshot["clients"].values()}
+        self.assertIsInstance(clients["client1"], ClientRecord)
+        self.assertEqual(clients["client1"].virtual_address, "10.8.0.2")
+        self.assertEqual(clients["client2"].virtual_address, "unknown")
+        self.assertEqual((clients["client2"].received_bytes, clients["client2"].sent_bytes), (300.0, 400.0))
+        (route,) = snapshot["routes"].values()
+        self.assertEqual(route.key, ("client1", "192.168.1.100:12345", "10.8.0.2"))
+        # Address strings are shared between a client's records
+        self.assertIs(route.real_address, clients["client1"].real_address)
+        self.assertIs(route.virtual_address, clients["client1"].virtual_address)
+    
+    def test_parse_client_list_several_routes(self):
+        """Test a client's extra routes and iroutes don't replace its tunnel address"""
+        content = """OpenVPN CLIENT LIST
+Updated,2025-09-25 14:35:00
+Common Name,Real Address,Bytes Received,Bytes Sent,Connected Since
+client1,192.168.1.100:12345,100,200,2025-09-25 14:30:36
+client2,192.168.1.101:12345,300,400,2025-09-25 14:31:00
+ROUTING TABLE
+Virtual Address,Common Name,Real Address,Last Ref
+10.8.0.2,client1,192.168.1.100:12345,2025-09-25 14:34:00
+fd00::2,client1,192.168.1.100:12345,2025-09-25 14:34:00
+192.168.50.0/24,client1,192.168.1.100:12345,2025-09-25 14:34:00
+10.8.0.6,client1,192.168.1.100:12345,2025-09-25 14:34:00
+fd00::3,client2,192.168.1.101:12345,2025-09-25 14:34:00
+GLOBAL STATS
+END"""
+        
+        self.parser._parse_content(content, "test_list.status")
+        snapshot = self.parser.snapshots["test_list.status"]
+        clients = {client.common_name: client for client in snapshot["clients"].values()}
+        self.assertEqual(len(clients), 2)
+        self.assertEqual(clients["client1"].virtual_address, "10.8.0.2/fd00::2")
+        self.assertEqual(clients["client2"].virtual_address, "unknown/fd00::3")
+        self.assertEqual(len(snapshot["routes"]), 5)
+        
+        # The synthetic routes beyond the clients' own are IPv6 addresses
+        self.parser._parse_content(client_list(3, routes=9), "test_list.status")
+        clients = self.parser.snapshots["test_list.status"]["clients"].values()
+        self.assertEqual(sorted(client.virtual_address for client in clients),
+                         ["10.0.0.0/fd00::5", "10.0.0.1/fd00::6", "10.0.0.2/fd00::7"])
+    
+    def test_parse_status_time(self):
+        """Test both status file time formats in an explicit timezone"""
+        utc = timezone.utc
+        self.assertEqual(parse_status_time("2025-09-25 14:30:36", utc), 1758810636)
+        self.assertEqual(parse_status_time("Thu Sep 25 14:30:36 2025", utc), 1758810636)
+        self.assertEqual(parse_status_time("Sat Mar  1 00:00:00 2025", utc), 1740787200)
+        # CEST is two hours ahead of UTC
+        self.assertEqual(parse_status_time("2025-09-25 14:30:36", status_timezone("Europe/Berlin")), 1758803436)
+        for value in ("", "yesterday", "2025-09-25T14:30:36", "Thu Sep 25 14:30 2025", "Thu Foo 25 14:30:36 2025"):
+            with self.assertRaises(ValueError):
+                parse_status_time(value, utc)
+        with self.assertRaises(ValueError):
+            status_timezone("Nowhere/Nope")
+        self.assertIs(status_timezone(""), utc)
+        self.assertIs(status_timezone(None), utc)
+        self.assertIsNone(status_timezone("local"))
+    
+    def test_parse_client_list_timezone(self):
+        """Test CLIENT LIST times are read in the configured timezone and memoized"""
+        content = """OpenVPN CLIENT LIST
+Updated,2025-09-25 14:35:00
+Common Name,Real Address,Bytes Received,Bytes Sent,Connected Since
+client1,192.168.1.100:12345,100,200,2025-09-25 14:30:36
+client2,192.168.1.101:12345,300,400,Thu Sep 25 14:30:36 2025
+ROUTING TABLE
+Virtual Address,Common Name,Real Address,Last Ref
+GLOBAL STATS
+END"""
+        parser = OpenVPNStatusParser([], timezone_name="UTC")
+        parse_status_time.cache_clear()
+        parser._parse_content(content, "test_list.status")
+        snapshot = parser.snapshots["test_list.status"]
+        self.assertEqual(snapshot["update_time"], 1758810900)
+        self.assertEqual({client.connection_time for client in snapshot["clients"].values()}, {"1758810636"})
+        
+        parser._parse_content(content.replace(",100,", ",150,"), "test_list.status")
+        self.assertEqual(parse_status_time.cache_info().hits, 3)
+
+class TestParseLogging(unittest.TestCase):
+    """Test per-parse summaries and sampled row tracing"""
+    
+    CONTENT = """OpenVPN CLIENT LIST
+Updated,2025-09-25 14:35:00
+Common Name,Real Address,Bytes Received,Bytes Sent,Connected Since
+""" + "".join(f"client{i},192.168.1.{i}:12345,100,200,2025-09-25 14:30:36\n" for i in range(10)) + """ROUTING TABLE
+Virtual Address,Common Name,Real Address,Last Ref
+10.8.0.2,client1,192.168.1.1:12345,2025-09-25 14:34:00
+END"""
+    
+    def tearDown(self):
+        ROW_TRACE.configure(0, 10.0)
+    
+    def test_one_summary_per_parse(self):
+        """Test rows are not logged unless tracing is enabled"""
+        parser = OpenVPNStatusParser([])
+        with patch('openvpn_exporter.logger') as logger:
+            parser._parse_content(self.CONTENT, "test_list.status")
+        logger.info.assert_called_once()
+        self.assertEqual(logger.info.call_args.kwargs['clients'], 10)
+        logger.debug.assert_not_called()
+    
+    def test_sampled_trace(self):
+        """Test every n-th row is traced, within the rate limit"""
+        ROW_TRACE.configure(3, 1000.0)
+        parser = OpenVPNStatusParser([])
+        with patch('openvpn_exporter.logger') as logger:
+            parser._parse_content(self.CONTENT, "test_list.status")
+        # 10 client rows and 1 route row
+        self.assertEqual(logger.debug.call_count, 3)
+        
+        ROW_TRACE.configure(1, 2.0)
+        with patch('openvpn_exporter.logger') as logger:
+            parser._parse_content(self.CONTENT, "test_list.status")
+        self.assertEqual(logger.debug.call_count, 2)
+        self.assertEqual(ROW_TRACE.suppressed, 9)
+    
+    def test_trace_only_at_debug_level(self):
+        """Test tracing stays disabled above DEBUG level"""
+        for name in (None, 'werkzeug', 'urllib3'):
+            self.addCleanup(logging.getLogger(name).setLevel, logging.getLogger(name).level)
+        configure_logging('INFO', 1)
+        self.assertEqual(ROW_TRACE.every, 0)
+        configure_logging('DEBUG', 1)
+        self.assertEqual(ROW_TRACE.every, 1)
+
+class TestStaleSeriesEviction(unittest.TestCase):
+    """Test eviction of series that disappeared from a status file"""
+    
+    HEADER = """TITLE,OpenVPN 2.3.2 x86_64-pc-linux-gnu
+TIME,Tue Mar 21 10:39:14 2017,1490089154
+HEADER,CLIENT_LIST,Common Name,Real Address,Virtual Address,Bytes Received,Bytes Sent,Connected Since,Connected Since (time_t),Username
+"""
+    CLIENT1 = "CLIENT_LIST,client1,192.168.1.100:12345,10.8.0.2,100,200,Thu Mar 16 17:09:03 2017,1489680543,user1\n"
+    CLIENT2 = "CLIENT_LIST,client2,192.168.1.101:12345,10.8.0.3,300,400,Thu Mar 16 17:09:03 2017,1489680600,user2\n"
+    
+    def client_names(self, parser):
+        return {key[0] for key in parser.snapshots["test.status"]["clients"]}
+    
+    def evicted(self, parser):
+        return parser.self_metrics.registry.get_sample_value(
+            'openvpn_exporter_evicted_series_total', {'status_path': 'test.status'}
+        ) or 0
+    
+    def test_evicts_immediately_without_grace_period(self):
+        """Test vanished clients are dropped on the next parse by default"""
+        parser = OpenVPNStatusParser([])
+        parser._parse_content(self.HEADER + self.CLIENT1 + self.CLIENT2 + "END", "test.status")
+        parser._parse_content(self.HEADER + self.CLIENT1 + "END", "test.status")
+        
+        self.assertEqual(self.client_names(parser), {"client1"})
+        self.assertEqual(parser.snapshots["test.status"]["generation"], 2)
+        self.assertEqual(self.evicted(parser), 1)
+    
+    def test_retains_within_grace_period(self):
+        """Test vanished clients are kept until the grace period expires"""
+        parser = OpenVPNStatusParser([], stale_grace_period=60)
+        with patch('openvpn_exporter.time.time', return_value=1000.0):
+            parser._parse_content(self.HEADER + self.CLIENT1 + self.CLIENT2 + "END", "test.status")
+        with patch('openvpn_exporter.time.time', return_value=1030.0):
+            parser._parse_content(self.HEADER + self.CLIENT1 + "END", "test.status")
+        self.assertEqual(self.client_names(parser), {"client1", "client2"})
+        self.assertEqual(self.evicted(parser), 0)
+        
+        with patch('openvpn_exporter.time.time', return_value=1061.0):
+            parser._parse_content(self.HEADER + self.CLIENT1 + "END", "test.status")
+        self.assertEqual(self.client_names(parser), {"client1"})
+        self.assertEqual(self.evicted(parser), 1)
+    
+    def test_evicts_while_file_unchanged(self):
+        """Test retained clients expire even when the unchanged file is served from the parse cache"""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        status_path = os.path.join(tmpdir.name, "test.status")
+        with patch.object(SecurityValidator, 'ALLOWED_DIRS', [Path(tmpdir.name)]):
+            parser = OpenVPNStatusParser([status_path], stale_grace_period=60)
+        
+        def write_and_parse(content, now):
+            if content is not None:
+                with open(status_path, "w") as f:
+                    f.write(self.HEADER + content + "END")
+            with patch('openvpn_exporter.time.time', return_value=now):
+                parser.parse_status_file(status_path)
+        
+        write_and_parse(self.CLIENT1 + self.CLIENT2, 1000.0)
+        write_and_parse(self.CLIENT1, 1030.0)
+        write_and_parse(None, 1050.0)
+        snapshot = parser.snapshots[status_path]
+        self.assertEqual({key[0] for key in snapshot["clients"]}, {"client1", "client2"})
+        self.assertEqual(snapshot["generation"], 2)
+        
+        write_and_parse(None, 1061.0)
+        snapshot = parser.snapshots[status_path]
+        self.assertEqual({key[0] for key in snapshot["clients"]}, {"client1"})
+        self.assertEqual(snapshot["generation"], 3)
+        self.assertEqual(snapshot["last_seen"]["clients"], {})
+        self.assertEqual(parser.self_metrics.registry.get_sample_value(
+            'openvpn_exporter_parse_cache_hits_total', {'status_path': status_path}), 2)
+        self.assertEqual(parser.self_metrics.registry.get_sample_value(
+            'openvpn_exporter_evicted_series_total', {'status_path': status_path}), 1)
+
+class TestSnapshotDiff(unittest.TestCase):
+    """Test the diff between consecutive snapshots of a status file"""
+    
+    HEADER = TestStaleSeriesEviction.HEADER
+    CLIENT1 = TestStaleSeriesEviction.CLIENT1
+    CLIENT2 = TestStaleSeriesEviction.CLIENT2
+    
+    def events(self, parser):
+        labels = {'status_path': 'test.status', 'job': 'openvpn-metrics'}
+        return tuple(parser.registry.get_sample_value(f'openvpn_client_{event}_total', labels)
+                     for event in ('connects', 'disconnects'))
+    
+    def test_first_parse_counts_no_sessions(self):
+        """Test clients already connected at startup are not counted as connects"""
+        parser = OpenVPNStatusParser([])
+        parser._parse_content(self.HEADER + self.CLIENT1 + self.CLIENT2 + "END", "test.status")
+        self.assertIsNone(parser.snapshots["test.status"]["diff"])
+        self.assertEqual(self.events(parser), (0, 0))
+    
+    def test_connects_and_disconnects(self):
+        """Test sessions appearing and vanishing between parses"""
+        parser = OpenVPNStatusParser([])
+        parser._parse_content(self.HEADER + self.CLIENT1 + "END", "test.status")
+        parser._parse_content(self.HEADER + self.CLIENT2 + "END", "test.status")
+        self.assertEqual(self.events(parser), (1, 1))
+        
+        # A reconnect keeps the address but starts a new session
+        reconnected = self.CLIENT2.replace("1489680600", "1489680700")
+        parser._parse_content(self.HEADER + reconnected + "END", "test.status")
+        self.assertEqual(self.events(parser), (2, 2))
+        
+        body = encode_families(parser.registry.collect(), 'text').decode()
+        self.assertIn('openvpn_client_connects_total{job="openvpn-metrics",status_path="test.status"} 2.0', body)
+    
+    def test_retained_series_count_one_disconnect(self):
+        """Test series kept by the grace period are not disconnected twice"""
+        parser = OpenVPNStatusParser([], stale_grace_period=60)
+        with patch('openvpn_exporter.time.time', return_value=1000.0):
+            parser._parse_content(self.HEADER + self.CLIENT1 + self.CLIENT2 + "END", "test.status")
+        for now in (1010.0, 1020.0, 1061.0):
+            with patch('openvpn_exporter.time.time', return_value=now):
+                parser._parse_content(self.HEADER + self.CLIENT1 + "END", "test.status")
+        self.assertEqual(self.events(parser), (0, 1))
+    
+    def test_unchanged_records_are_reused(self):
+        """Test records equal to their previous version keep its identity"""
+        parser = OpenVPNStatusParser([])
+        parser._parse_content(self.HEADER + self.CLIENT1 + self.CLIENT2 + "END", "test.status")
+        before = dict(parser.snapshots["test.status"]["clients"])
+        parser._parse_content(self.HEADER + self.CLIENT1 + self.CLIENT2.replace(",300,", ",301,") + "END",
+                              "test.status")
+        snapshot = parser.snapshots["test.status"]
+        
+        self.assertEqual(snapshot["diff"].changed, 1)
+        self.assertEqual(snapshot["diff"].unchanged, 1)
+        for key, record in snapshot["clients"].items():
+            self.assertEqual(record is before[key], record.common_name == "client1")
+
+class TestThroughputRates(unittest.TestCase):
+    """Test exporter-side bytes/sec gauges"""
+    
+    HEADER = """TITLE,OpenVPN 2.3.2 x86_64-pc-linux-gnu
+TIME,Tue Mar 21 10:39:14 2017,{time}
+HEADER,CLIENT_LIST,Common Name,Real Address,Virtual Address,Bytes Received,Bytes Sent,Connected Since,Connected Since (time_t),Username
+"""
+    CLIENT = "CLIENT_LIST,client1,192.168.1.100:12345,10.8.0.2,{received},{sent},Thu Mar 16 17:09:03 2017,{since},user1\n"
+    
+    def parse(self, parser, time, received, sent, since=1489680543):
+        content = self.HEADER.format(time=time) + self.CLIENT.format(received=received, sent=sent, since=since)
+        parser._parse_content(content + "END", "test.status")
+    
+    def rates(self, parser):
+        families = {family.name: family for family in parser.registry.collect()}
+        client = [(sample.labels['connection_time'], sample.value) for name in ('received', 'sent')
+                  for sample in families[f'openvpn_server_client_{name}_bytes_per_second'].samples]
+        server = [sample.value for name in ('received', 'sent')
+                  for sample in families[f'openvpn_server_{name}_bytes_per_second'].samples]
+        return client, server
+    
+    def test_disabled_by_default(self):
+        """Test no rate gauges are exported unless enabled"""
+        parser = OpenVPNStatusParser([])
+        self.parse(parser, 1000, 0, 0)
+        self.parse(parser, 1010, 1000, 2000)
+        self.assertNotIn(b"_per_second", encode_families(parser.registry.collect(), 'text'))
+    
+    def test_rates_from_update_times(self):
+        """Test rates are byte deltas over the interval between the files' update times"""
+        parser = OpenVPNStatusParser([], rate_smoothing=0)
+        self.parse(parser, 1000, 0, 0)
+        self.assertEqual(self.rates(parser), ([], []))
+        
+        self.parse(parser, 1010, 1000, 2000)
+        self.assertEqual(self.rates(parser), ([('1489680543', 100.0), ('1489680543', 200.0)], [100.0, 200.0]))
+    
+    def test_ewma_smoothing(self):
+        """Test each interval moves the rate towards its own by its weight"""
+        parser = OpenVPNStatusParser([], rate_smoothing=10)
+        self.parse(parser, 1000, 0, 0)
+        self.parse(parser, 1010, 1000, 1000)
+        self.parse(parser, 1020, 1000, 1000)
+        client, server = self.rates(parser)
+        self.assertAlmostEqual(client[0][1], 100 * math.exp(-1))
+        self.assertAlmostEqual(server[0], 100 * math.exp(-1))
+    
+    def test_reconnects_and_counter_resets(self):
+        """Test reconnects start a new session and lower counters count from zero"""
+        parser = OpenVPNStatusParser([], rate_smoothing=0)
+        self.parse(parser, 1000, 5000, 5000)
+        self.parse(parser, 1010, 1000, 100)
+        self.assertEqual(self.rates(parser), ([('1489680543', 100.0), ('1489680543', 10.0)], [100.0, 10.0]))
+        
+        # The new session has no rate of its own yet, but adds its bytes to the server's
+        self.parse(parser, 1020, 500, 500, since=1015)
+        self.assertEqual(self.rates(parser), ([], [50.0, 50.0]))
+        self.parse(parser, 1030, 1500, 500, since=1015)
+        self.assertEqual(self.rates(parser), ([('1015', 100.0), ('1015', 0.0)], [100.0, 0.0]))
+
+class TestParseCache(unittest.TestCase):
+    """Test reuse of parse results for unchanged status files"""
+    
+    CONTENT = """OpenVPN STATISTICS
+Updated,Tue Mar 21 10:39:09 2017
+TUN/TAP read bytes,153789941
+END
+"""
+    
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.status_path = os.path.join(tmpdir.name, "client.status")
+        with open(self.status_path, "w") as f:
+            f.write(self.CONTENT)
+        with patch.object(SecurityValidator, 'ALLOWED_DIRS', [Path(tmpdir.name)]):
+            self.parser = OpenVPNStatusParser([self.status_path])
+    
+    def sample(self, name):
+        return self.parser.self_metrics.registry.get_sample_value(name, {'status_path': self.status_path}) or 0
+    
+    def test_unchanged_file_is_not_reparsed(self):
+        """Test a second parse of an unchanged file is served from the cache"""
+        self.parser.parse_status_file(self.status_path)
+        with patch.object(self.parser, '_parse_stream') as mock_parse:
+            self.assertEqual(self.parser.parse_status_file(self.status_path), {"status": "parsed"})
+            mock_parse.assert_not_called()
+        
+        self.assertEqual(self.sample('openvpn_exporter_parse_cache_hits_total'), 1)
+        self.assertEqual(self.sample('openvpn_exporter_parse_cache_misses_total'), 1)
+        self.assertGreater(self.sample('openvpn_exporter_parse_cache_saved_seconds_total'), 0)
+    
+    def test_changed_file_is_reparsed(self):
+        """Test a modified file misses the cache"""
+        self.parser.parse_status_file(self.status_path)
+        with open(self.status_path, "w") as f:
+            f.write(self.CONTENT.replace("153789941", "1537899999"))
+        self.parser.parse_status_file(self.status_path)
+        
+        self.assertEqual(self.sample('openvpn_exporter_parse_cache_misses_total'), 2)
+        self.assertEqual(
+            self.parser.snapshots[self.status_path]['client_stats']['openvpn_client_tun_tap_read_bytes'], 1537899999
+        )
+
 class TestOpenVPNExporter(unittest.TestCase):
     """Test main exporter functionality"""
     
@@ -163,6 +843,754 @@ class TestOpenVPNExporter(unittest.TestCase):
             # Expected if examples files don't exist
             pass
 
+class TestSelfInstrumentation(unittest.TestCase):
+    """Test the exporter's own parse and scrape metrics"""
+    
+    STATUS_PATH = "examples/status/server2.status"
+    
+    def test_parse_phases_bytes_and_rows(self):
+        """Test each parse records its phases, size and rows per section"""
+        exporter = OpenVPNExporter([self.STATUS_PATH])
+        exporter.render_snapshot()
+        registry = exporter.self_metrics.registry
+        labels = {'status_path': self.STATUS_PATH}
+        
+        for phase in ('read', 'validate', 'parse'):
+            self.assertEqual(registry.get_sample_value('openvpn_exporter_parse_phase_duration_seconds_count',
+                                                       dict(labels, phase=phase)), 1)
+        self.assertEqual(registry.get_sample_value('openvpn_exporter_read_bytes_total', labels),
+                         os.path.getsize(self.STATUS_PATH))
+        for section, rows in (('CLIENT_LIST', 3), ('ROUTING_TABLE', 3)):
+            self.assertEqual(registry.get_sample_value('openvpn_exporter_parsed_rows_total',
+                                                       dict(labels, section=section)), rows)
+        self.assertEqual(registry.get_sample_value('openvpn_exporter_serialize_duration_seconds_count',
+                                                   {'format': 'text'}), 1)
+        
+        # Unchanged files are not parsed again
+        exporter.render_snapshot()
+        self.assertEqual(registry.get_sample_value('openvpn_exporter_parse_phase_duration_seconds_count',
+                                                   dict(labels, phase='parse')), 1)
+    
+    def test_read_bytes_counts_encoded_size(self):
+        """Test non-ASCII rows are counted in bytes, not characters"""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        status_path = os.path.join(tmpdir.name, "server.status")
+        with open(self.STATUS_PATH, encoding="utf-8") as f:
+            content = f.read().replace("client1,", "clïent1-日本,", 1)
+        with open(status_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        self.assertGreater(os.path.getsize(status_path), len(content))
+        
+        with patch.object(SecurityValidator, 'ALLOWED_DIRS', [Path(tmpdir.name)]):
+            exporter = OpenVPNExporter([status_path])
+        exporter.render_snapshot()
+        self.assertEqual(exporter.self_metrics.registry.get_sample_value(
+            'openvpn_exporter_read_bytes_total', {'status_path': status_path}), os.path.getsize(status_path))
+    
+    def test_scrape_metrics(self):
+        """Test build info, in-flight scrapes and per-format serialization are exported"""
+        client = create_app([self.STATUS_PATH]).test_client()
+        client.get('/metrics', headers={'Accept': 'application/openmetrics-text'})
+        body = client.get('/metrics').data.decode()
+        
+        self.assertRegex(body, r'openvpn_exporter_build_info\{.*version="2\.0\.4".*\} 1\.0')
+        self.assertIn('openvpn_exporter_scrapes_in_flight 1.0', body)
+        self.assertIn('openvpn_exporter_serialize_duration_seconds_count{format="openmetrics"} 1.0', body)
+
+class TestParallelCollection(unittest.TestCase):
+    """Test concurrent collection of several status files"""
+    
+    SERVER_CONTENT = """TITLE,OpenVPN 2.6.12 x86_64-pc-linux-gnu
+TIME,Fri Sep 27 07:30:00 2024,1727422200
+HEADER,CLIENT_LIST,Common Name,Real Address,Virtual Address,Bytes Received,Bytes Sent,Connected Since,Connected Since (time_t),Username
+CLIENT_LIST,client1,192.168.1.100:12345,10.8.0.2,100,200,Fri Sep 27 07:00:00 2024,1727416800,user1
+END
+"""
+    
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.status_paths = []
+        for name in ("udp.status", "tcp.status"):
+            path = os.path.join(tmpdir.name, name)
+            with open(path, "w") as f:
+                f.write(self.SERVER_CONTENT)
+            self.status_paths.append(path)
+        self.allowed_dirs = patch.object(SecurityValidator, 'ALLOWED_DIRS', [Path(tmpdir.name)])
+        self.allowed_dirs.start()
+        self.addCleanup(self.allowed_dirs.stop)
+    
+    def make_exporter(self, **kwargs):
+        exporter = OpenVPNExporter(self.status_paths, **kwargs)
+        self.addCleanup(exporter.close)
+        return exporter
+    
+    def up(self, exporter, status_path):
+        return exporter.parser.registry.get_sample_value(
+            'openvpn_up', {'status_path': status_path, 'job': 'openvpn-metrics'}
+        )
+    
+    def test_thread_pool(self):
+        """Test all files are parsed by the thread pool"""
+        exporter = self.make_exporter(workers=2)
+        exporter.collect_metrics()
+        for status_path in self.status_paths:
+            self.assertEqual(self.up(exporter, status_path), 1)
+            self.assertIsNotNone(exporter.self_metrics.registry.get_sample_value(
+                'openvpn_exporter_parse_duration_seconds', {'status_path': status_path}
+            ))
+    
+    def test_process_pool(self):
+        """Test files parsed in worker processes are published in this process"""
+        exporter = self.make_exporter(workers=2, worker_type='process')
+        exporter.collect_metrics()
+        for status_path in self.status_paths:
+            self.assertEqual(self.up(exporter, status_path), 1)
+            self.assertEqual(exporter.parser.snapshots[status_path]['connected_clients'], 1)
+        
+        # Unchanged files are served from the cache without a worker round trip
+        with patch.object(exporter, '_get_executor') as mock_executor:
+            exporter.collect_metrics()
+            mock_executor.assert_not_called()
+    
+    def test_isolated_parse_logged_once(self):
+        """Test a worker's parse is summarized by the adopting parser only"""
+        parser = OpenVPNStatusParser([])
+        with patch('openvpn_exporter.logger') as logger:
+            parsed = parse_status_file_isolated(self.status_paths[0])
+            logger.info.assert_not_called()
+            parser.adopt_parse(self.status_paths[0], parsed)
+        summaries = [call for call in logger.info.call_args_list if call.args == ("Parsed status file",)]
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0].kwargs['generation'], 1)
+    
+    def test_slow_file_times_out(self):
+        """Test one slow file doesn't hold up the others"""
+        exporter = self.make_exporter(workers=2, file_timeout=0.2)
+        slow_path, fast_path = self.status_paths
+        parse = exporter.parser.parse_status_file
+        release = threading.Event()
+        self.addCleanup(release.set)
+        
+        finished = threading.Event()
+        
+        def slow_parse(status_path, cancelled=None):
+            if status_path == slow_path:
+                release.wait(5)
+                try:
+                    return parse(status_path, cancelled)
+                finally:
+                    finished.set()
+            return parse(status_path, cancelled)
+        
+        with patch.object(exporter.parser, 'parse_status_file', side_effect=slow_parse):
+            start = time.monotonic()
+            exporter.collect_metrics()
+            self.assertLess(time.monotonic() - start, 2)
+            
+            self.assertEqual(self.up(exporter, slow_path), 0)
+            self.assertEqual(self.up(exporter, fast_path), 1)
+            self.assertEqual(exporter.self_metrics.registry.get_sample_value(
+                'openvpn_exporter_parse_timeouts_total', {'status_path': slow_path}
+            ), 1)
+            
+            # Still running: the next collection skips it instead of piling up
+            exporter.collect_metrics()
+            self.assertEqual(exporter.self_metrics.registry.get_sample_value(
+                'openvpn_exporter_parse_timeouts_total', {'status_path': slow_path}
+            ), 1)
+            
+            # Finishing late, the abandoned parse doesn't publish its result
+            release.set()
+            self.assertTrue(finished.wait(5))
+            self.assertNotIn(slow_path, exporter.parser.snapshots)
+            self.assertEqual(self.up(exporter, slow_path), 0)
+        
+        # The next collection parses the file again
+        exporter.collect_metrics()
+        self.assertEqual(self.up(exporter, slow_path), 1)
+        self.assertEqual(exporter.parser.snapshots[slow_path]['connected_clients'], 1)
+    
+    def test_process_pool_cache_hits_record_duration(self):
+        """Test cache hits served without a worker still record the parse duration"""
+        exporter = self.make_exporter(workers=2, worker_type='process')
+        exporter.collect_metrics()
+        exporter.self_metrics.parse_duration.labels(status_path=self.status_paths[0]).set(-1)
+        with patch.object(exporter, '_get_executor') as mock_executor:
+            exporter.collect_metrics()
+            mock_executor.assert_not_called()
+        self.assertGreaterEqual(exporter.self_metrics.registry.get_sample_value(
+            'openvpn_exporter_parse_duration_seconds', {'status_path': self.status_paths[0]}), 0)
+
+class TestBackgroundCollector(unittest.TestCase):
+    """Test scrape-independent background collection"""
+    
+    def setUp(self):
+        self.status_paths = ["examples/status/server2.status"]
+        self.exporter = OpenVPNExporter(self.status_paths, ignore_individuals=False)
+    
+    def test_snapshot_generations(self):
+        """Test every render produces a new, newer snapshot"""
+        first = self.exporter.render_snapshot()
+        second = self.exporter.render_snapshot()
+        self.assertEqual(second.generation, first.generation + 1)
+        self.assertIn(b"openvpn_up", second.body)
+    
+    def test_age_trailer(self):
+        """Test snapshot age is rendered relative to collection time"""
+        snapshot = self.exporter.render_snapshot()
+        trailer = snapshot.age_trailer(now=snapshot.created_at + 5)
+        self.assertIn(b"openvpn_exporter_snapshot_age_seconds 5.0", trailer)
+    
+    def test_scrapes_do_not_collect(self):
+        """Test scrapes are served from the snapshot without re-parsing"""
+        collector = BackgroundCollector(self.exporter, interval=3600)
+        collector.start()
+        self.addCleanup(collector.stop)
+        
+        with patch.object(self.exporter, 'collect_metrics') as mock_collect:
+            snapshot = collector.snapshot
+            self.assertIsNotNone(snapshot)
+            self.assertIs(collector.snapshot, snapshot)
+            mock_collect.assert_not_called()
+    
+    def test_refresh_only_changed_files(self):
+        """Test watcher-reported changes re-parse only the changed file"""
+        watcher = PollingWatcher([])
+        watcher.wait = lambda timeout: {"examples/status/server2.status"}
+        exporter = OpenVPNExporter(["examples/status/server2.status", "examples/status/server3.status"])
+        collector = BackgroundCollector(exporter, interval=3600, watcher=watcher)
+        
+        with patch.object(exporter.parser, 'parse_status_file') as mock_parse:
+            collector.start()
+            self.addCleanup(collector.stop)
+            for _ in range(100):
+                if mock_parse.call_count > 2:
+                    break
+                time.sleep(0.01)
+            collector.stop()
+        
+        self.assertGreater(mock_parse.call_count, 2)
+        self.assertEqual([call.args[0] for call in mock_parse.call_args_list[:2]], exporter.status_paths)
+        for call in mock_parse.call_args_list[2:]:
+            self.assertEqual(call.args, ("examples/status/server2.status",))
+    
+    def test_background_app(self):
+        """Test /metrics serves the snapshot and its age in background mode"""
+        app = create_app(self.status_paths, collector_mode='background', collector_interval=3600)
+        self.addCleanup(app.extensions['openvpn_collector'].stop)
+        
+        response = app.test_client().get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"openvpn_up", response.data)
+        self.assertIn(b"openvpn_exporter_snapshot_age_seconds", response.data)
+
+class TestMetricsResponseCache(unittest.TestCase):
+    """Test compressed and conditional /metrics responses"""
+    
+    def setUp(self):
+        self.app = create_app(["examples/status/server2.status"], collector_mode='background',
+                              collector_interval=3600)
+        self.addCleanup(self.app.extensions['openvpn_collector'].stop)
+        self.client = self.app.test_client()
+    
+    def test_gzip_response(self):
+        """Test gzip bodies decode to the snapshot plus its age trailer"""
+        response = self.client.get('/metrics', headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Vary'], 'Accept, Accept-Encoding')
+        body = gzip.decompress(response.data)
+        self.assertIn(b"openvpn_up", body)
+        self.assertIn(b"openvpn_exporter_snapshot_age_seconds", body)
+        
+        plain = self.client.get('/metrics')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(body.split(b"# HELP openvpn_exporter_snapshot_age_seconds")[0],
+                         plain.data.split(b"# HELP openvpn_exporter_snapshot_age_seconds")[0])
+    
+    def test_body_compressed_once_per_snapshot(self):
+        """Test repeat scrapes of a snapshot reuse its compressed body"""
+        with patch.object(MetricsResponseCache, 'compress', autospec=True,
+                          side_effect=lambda cache, data, encoding: gzip.compress(data)) as compress:
+            for _ in range(3):
+                self.client.get('/metrics', headers={'Accept-Encoding': 'gzip'})
+        # One body and three trailers
+        self.assertEqual(compress.call_count, 4)
+    
+    def test_conditional_requests(self):
+        """Test unchanged snapshots are answered with 304 Not Modified"""
+        response = self.client.get('/metrics')
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        
+        self.assertEqual(self.client.get('/metrics', headers={'If-None-Match': etag}).status_code, 304)
+        
+        self.app.extensions['openvpn_collector'].refresh()
+        self.assertEqual(self.client.get('/metrics', headers={'If-None-Match': etag}).status_code, 200)
+    
+    def test_if_modified_since(self):
+        """Test If-Modified-Since only answers 304 for snapshots strictly older than it"""
+        cache = MetricsResponseCache()
+        since = {'if-modified-since': 'Tue, 21 Mar 2017 10:39:14 GMT'}  # 1490092754
+        self.assertEqual(cache.respond(MetricsSnapshot(b'', 1, 1490092753.5), since)[0], 304)
+        # Created within the second since names, possibly after the scraper's copy
+        self.assertEqual(cache.respond(MetricsSnapshot(b'', 2, 1490092754.0), since)[0], 200)
+        self.assertEqual(cache.respond(MetricsSnapshot(b'', 3, 1490092754.6), since)[0], 200)
+        self.assertEqual(cache.respond(MetricsSnapshot(b'', 4, 1490092753.5), {'if-modified-since': 'junk'})[0], 200)
+    
+    def test_if_none_match_any(self):
+        """Test If-None-Match: * matches any snapshot and takes precedence over If-Modified-Since"""
+        cache = MetricsResponseCache()
+        snapshot = MetricsSnapshot(b'', 1, 1490092753.5)
+        self.assertEqual(cache.respond(snapshot, {'if-none-match': '*'})[0], 304)
+        self.assertEqual(cache.respond(snapshot, {'if-none-match': 'W/"0-0", *'})[0], 304)
+        self.assertEqual(cache.respond(snapshot, {'if-none-match': 'W/"0-0"',
+                                                  'if-modified-since': 'Tue, 21 Mar 2017 10:39:14 GMT'})[0], 200)
+    
+    def test_negotiate(self):
+        """Test Accept-Encoding negotiation honours q-values"""
+        cache = MetricsResponseCache()
+        self.assertEqual(cache.negotiate(''), 'identity')
+        self.assertEqual(cache.negotiate('gzip;q=0, br'), 'identity')
+        self.assertEqual(cache.negotiate('GZIP;q=0.5'), 'gzip')
+        self.assertEqual(cache.negotiate('*'), cache.encodings[0])
+
+def read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        result |= (byte & 0x7f) << shift
+        pos += 1
+        shift += 7
+        if not byte & 0x80:
+            return result, pos
+
+def decode_protobuf(data):
+    """Decode protobuf wire format into {field: [values]}; nested messages stay bytes"""
+    fields, pos = {}, 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = struct.unpack_from('<d', data, pos)[0], pos + 8
+        else:
+            length, pos = read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        fields.setdefault(field, []).append(value)
+    return fields
+
+class TestExpositionFormats(unittest.TestCase):
+    """Test OpenMetrics and protobuf exposition"""
+    
+    CONTENT = """TITLE,OpenVPN 2.3.2 x86_64-pc-linux-gnu
+TIME,Tue Mar 21 10:39:14 2017,1490089154
+HEADER,CLIENT_LIST,Common Name,Real Address,Virtual Address,Bytes Received,Bytes Sent,Connected Since,Connected Since (time_t),Username
+CLIENT_LIST,client1,192.168.1.100:12345,10.8.0.2,139583,710764,Thu Mar 16 17:09:03 2017,1489680543,user1
+END"""
+    
+    def setUp(self):
+        parser = OpenVPNStatusParser([])
+        parser._parse_content(self.CONTENT, "server.status")
+        parser.set_up("server.status", True)
+        self.families = list(parser.registry.collect())
+    
+    def test_openmetrics_created_timestamps(self):
+        """Test per-client counters carry their connection time as _created"""
+        body = (encode_families(self.families, 'openmetrics') + OPENMETRICS_EOF).decode()
+        families = {family.name: family for family in text_string_to_metric_families(body)}
+        
+        received = families['openvpn_server_client_received_bytes']
+        self.assertEqual(received.type, 'counter')
+        values = {sample.name: sample.value for sample in received.samples}
+        self.assertEqual(values['openvpn_server_client_received_bytes_total'], 139583)
+        self.assertEqual(values['openvpn_server_client_received_bytes_created'], 1489680543)
+        
+        # The text format keeps exposing the counters alone
+        self.assertNotIn(b"_created", encode_families(self.families, 'text').split(b"openvpn_up")[0])
+    
+    def test_openmetrics_created_timestamps_several_clients(self):
+        """Test each client's _created sample directly follows its own counter sample"""
+        parser = OpenVPNStatusParser([])
+        parser._parse_content(server_status(3), "server.status")
+        parser.set_up("server.status", True)
+        body = (encode_families(list(parser.registry.collect()), 'openmetrics') + OPENMETRICS_EOF).decode()
+        
+        # The strict parser rejects series whose samples are not grouped together
+        families = {family.name: family for family in text_string_to_metric_families(body)}
+        samples = families['openvpn_server_client_received_bytes'].samples
+        self.assertEqual(len(samples), 6)
+        for total, created in zip(samples[::2], samples[1::2]):
+            self.assertEqual(total.name, 'openvpn_server_client_received_bytes_total')
+            self.assertEqual(created.name, 'openvpn_server_client_received_bytes_created')
+            self.assertEqual(created.labels, total.labels)
+    
+    def test_encoders_match_prometheus_client(self):
+        """Test the text and OpenMetrics encoders render like the library"""
+        registry = CollectorRegistry()
+        Counter('requests', 'Requests with "quotes"\nand \\', ['path'], registry=registry).labels('/a"b\\c\n').inc(3)
+        Histogram('latency_seconds', 'Latency', registry=registry, buckets=(0.1, 1.0)).observe(0.5)
+        Summary('size_bytes', 'Size', unit='bytes', registry=registry).observe(42)
+        Info('build', 'Build', registry=registry).info({'version': '1.0'})
+        families = list(registry.collect())
+        
+        lines = SampleLineCache()
+        for _ in range(2):  # The second round renders from cached lines
+            lines.rotate()
+            self.assertEqual(encode_families(families, 'text', lines), generate_latest(registry))
+            self.assertEqual(encode_families(families, 'openmetrics', lines) + OPENMETRICS_EOF,
+                             generate_openmetrics(registry))
+    
+    def test_protobuf(self):
+        """Test length-delimited MetricFamily messages"""
+        data = encode_families(self.families, 'protobuf')
+        messages = {}
+        pos = 0
+        while pos < len(data):
+            length, start = read_varint(data, pos)
+            message = decode_protobuf(data[start:start + length])
+            messages[message[1][0].decode()] = message
+            pos = start + length
+        
+        self.assertEqual(messages['openvpn_up'][3], [1])  # GAUGE
+        received = messages['openvpn_server_client_received_bytes_total']
+        self.assertEqual(received[3], [0])  # COUNTER
+        metric = decode_protobuf(received[4][0])
+        labels = dict((decode_protobuf(pair)[1][0], decode_protobuf(pair)[2][0]) for pair in metric[1])
+        self.assertEqual(labels[b'common_name'], b'client1')
+        counter = decode_protobuf(metric[3][0])
+        self.assertEqual(counter[1], [139583.0])
+        self.assertEqual(decode_protobuf(counter[3][0])[1], [1489680543])
+    
+    def test_negotiation(self):
+        """Test Prometheus' Accept headers select the preferred format"""
+        self.assertEqual(negotiate_exposition_format(''), 'text')
+        self.assertEqual(negotiate_exposition_format('text/plain;version=0.0.4;q=1,*/*;q=0.1'), 'text')
+        self.assertEqual(negotiate_exposition_format(
+            'application/openmetrics-text;version=1.0.0,application/openmetrics-text;version=0.0.1;q=0.75,'
+            'text/plain;version=0.0.4;q=0.5,*/*;q=0.1'), 'openmetrics')
+        self.assertEqual(negotiate_exposition_format(
+            'application/vnd.google.protobuf;proto=io.prometheus.client.MetricFamily;encoding=delimited;q=0.7,'
+            'text/plain;version=0.0.4;q=0.3,*/*;q=0.2'), 'protobuf')
+    
+    def test_app_serves_openmetrics(self):
+        """Test /metrics answers OpenMetrics scrapes with the age gauge before # EOF"""
+        app = create_app(["examples/status/server2.status"])
+        response = app.test_client().get('/metrics', headers={'Accept': 'application/openmetrics-text'})
+        self.assertTrue(response.headers['Content-Type'].startswith('application/openmetrics-text'))
+        self.assertTrue(response.data.endswith(b"openvpn_exporter_snapshot_age_seconds " +
+                                               response.data.split(b"openvpn_exporter_snapshot_age_seconds ")[-1]))
+        self.assertTrue(response.data.endswith(b"# EOF\n"))
+        self.assertEqual(response.data.count(b"# EOF"), 1)
+
+class TestSharedCollector(unittest.TestCase):
+    """Test one collector serving several server worker processes"""
+    
+    def setUp(self):
+        self.snapshot_dir = tempfile.mkdtemp()
+        self.status_paths = ["examples/status/server2.status"]
+    
+    def test_store_round_trip(self):
+        """Test a published snapshot is read back, and re-read once replaced"""
+        store = SharedSnapshotStore(self.snapshot_dir)
+        self.assertIsNone(store.load())
+        
+        store.publish(MetricsSnapshot(b"openvpn_up 1\n", 1, 1000.0))
+        self.assertEqual(store.load(), MetricsSnapshot(b"openvpn_up 1\n", 1, 1000.0))
+        store.publish(MetricsSnapshot(b"openvpn_up 0\n", 2, 1015.0))
+        self.assertEqual(store.load().generation, 2)
+    
+    def test_single_leader(self):
+        """Test only one store holds the collector lock at a time"""
+        leader = SharedSnapshotStore(self.snapshot_dir)
+        self.assertTrue(leader.acquire_leadership())
+        self.assertFalse(SharedSnapshotStore(self.snapshot_dir).acquire_leadership())
+    
+    def test_follower_serves_leader_snapshot(self):
+        """Test a worker without the lock serves what the leader published"""
+        collectors = [
+            SharedCollector(BackgroundCollector(OpenVPNExporter(self.status_paths), interval=3600),
+                            SharedSnapshotStore(self.snapshot_dir))
+            for _ in range(2)
+        ]
+        for collector in collectors:
+            collector.start()
+            self.addCleanup(collector.stop)
+        
+        leader, follower = collectors
+        self.assertTrue(leader.leader)
+        self.assertFalse(follower.leader)
+        self.assertEqual(follower.snapshot.body, leader.snapshot.body)
+        self.assertEqual(follower.snapshot.generation, leader.snapshot.generation)
+        
+        # Followers negotiate every exposition format from the pre-rendered bodies
+        protobuf = 'application/vnd.google.protobuf;proto=io.prometheus.client.MetricFamily;encoding=delimited'
+        for accept in ('application/openmetrics-text', protobuf, 'text/plain'):
+            with self.subTest(accept=accept):
+                expected = MetricsResponseCache().respond(leader.snapshot, {'accept': accept})
+                status, headers, body = MetricsResponseCache().respond(follower.snapshot, {'accept': accept})
+                self.assertEqual(headers['Content-Type'], expected[1]['Content-Type'])
+                self.assertEqual(body.split(b"openvpn_exporter_snapshot_age_seconds")[0],
+                                 expected[2].split(b"openvpn_exporter_snapshot_age_seconds")[0])
+    
+    def test_multiple_workers_share_background_collector(self):
+        """Test several gunicorn workers switch to a shared background collector"""
+        args = build_arg_parser().parse_args(['--web.workers', '4', '--web.snapshot-dir', self.snapshot_dir])
+        options = app_options(args)
+        self.assertEqual(options['collector_mode'], 'background')
+        self.assertEqual(options['snapshot_dir'], self.snapshot_dir)
+        
+        args = build_arg_parser().parse_args(['--web.server', 'development', '--web.workers', '4'])
+        self.assertIsNone(app_options(args)['snapshot_dir'])
+
+class TestAsyncServer(unittest.TestCase):
+    """Test the asyncio server variant"""
+    
+    def request(self, server, path, headers=''):
+        async def exchange():
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}Connection: close\r\n\r\n".encode())
+                response = await reader.read()
+                writer.close()
+                return response
+            finally:
+                await server.close()
+        
+        head, _, body = asyncio.run(exchange()).partition(b"\r\n\r\n")
+        return int(head.split()[1]), body
+    
+    def test_metrics_endpoint(self):
+        """Test /metrics is parsed and rendered like the Flask app"""
+        status, body = self.request(create_async_server(["examples/status/server2.status"]), '/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn(b"openvpn_up", body)
+        self.assertIn(b"openvpn_exporter_snapshot_age_seconds", body)
+    
+    def test_health_and_unknown_paths(self):
+        """Test /health and 404s"""
+        status, body = self.request(create_async_server(["examples/status/server2.status"]), '/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["status"], "healthy")
+        
+        status, _ = self.request(create_async_server(["examples/status/server2.status"]), '/missing')
+        self.assertEqual(status, 404)
+    
+    def test_ip_allow_list(self):
+        """Test /metrics honours the allow-list"""
+        server = create_async_server(["examples/status/server2.status"], allowed_ips=["10.0.0.1"])
+        status, _ = self.request(server, '/metrics', 'X-Forwarded-For: 10.0.0.2\r\n')
+        self.assertEqual(status, 403)
+        
+        server = create_async_server(["examples/status/server2.status"], allowed_ips=["10.0.0.0/24"],
+                                     trusted_proxies=["127.0.0.1"])
+        status, _ = self.request(server, '/metrics', 'X-Forwarded-For: 10.0.0.2\r\n')
+        self.assertEqual(status, 200)
+    
+    def test_background_mode(self):
+        """Test the async server serves background snapshots"""
+        server = create_async_server(["examples/status/server2.status"], collector_mode='background',
+                                     collector_interval=3600)
+        status, body = self.request(server, '/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn(b"openvpn_up", body)
+
+class FakeManagementHandler(socketserver.StreamRequestHandler):
+    """Minimal OpenVPN management interface speaking `status 3` and `load-stats`"""
+    
+    STATUS = [
+        "TITLE\tOpenVPN 2.6.12 x86_64-pc-linux-gnu",
+        "TIME\tFri Sep 27 07:33:20 2024\t1727420000",
+        "HEADER\tCLIENT_LIST\tCommon Name\tReal Address\tVirtual Address\tVirtual IPv6 Address\t"
+        "Bytes Received\tBytes Sent\tConnected Since\tConnected Since (time_t)\tUsername",
+        "CLIENT_LIST\tclient1\t192.168.1.100:12345\t10.8.0.2\t\t1048576\t2097152\t"
+        "Fri Sep 27 07:00:00 2024\t1727416800\tclient1",
+        "HEADER\tROUTING_TABLE\tVirtual Address\tCommon Name\tReal Address\tLast Ref\tLast Ref (time_t)",
+        "ROUTING_TABLE\t10.8.0.2\tclient1\t192.168.1.100:12345\tFri Sep 27 07:33:00 2024\t1727419980",
+        "GLOBAL_STATS\tMax bcast/mcast queue length\t0",
+        "END",
+    ]
+    
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        if server.password:
+            self.wfile.write(b"ENTER PASSWORD:")
+            if self.rfile.readline().strip().decode() != server.password:
+                self.wfile.write(b"ERROR: bad password\r\n")
+                return
+            self.wfile.write(b"SUCCESS: password is correct\r\n")
+        self.wfile.write(b">INFO:OpenVPN Management Interface Version 3 -- type 'help' for more info\r\n")
+        
+        for line in self.rfile:
+            command = line.strip().decode()
+            server.commands.append(command)
+            # Real-time notifications may arrive in the middle of a response
+            self.wfile.write(b">BYTECOUNT:1024,2048\r\n")
+            if command == 'status 3':
+                self.wfile.write("".join(f"{line}\r\n" for line in self.STATUS).encode())
+            elif command == 'load-stats':
+                self.wfile.write(b"SUCCESS: nclients=1,bytesin=5000,bytesout=7000\r\n")
+            else:
+                self.wfile.write(b"ERROR: unknown command, enter 'help' for more options\r\n")
+            if server.drop_after_command:
+                return
+
+class TestManagementInterface(unittest.TestCase):
+    """Test collection from the OpenVPN management interface"""
+    
+    def start_server(self, server_class=socketserver.ThreadingTCPServer, address=('127.0.0.1', 0), password=None):
+        server = server_class(address, FakeManagementHandler)
+        server.daemon_threads = True
+        server.password = password
+        server.commands = []
+        server.connections = 0
+        server.drop_after_command = False
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+    
+    def tcp_address(self, server):
+        host, port = server.server_address[:2]
+        return f"tcp://{host}:{port}"
+    
+    def test_status_and_load_stats(self):
+        """Test management output feeds the server status metrics over one connection"""
+        server = self.start_server()
+        exporter = OpenVPNExporter([], management_addresses=[self.tcp_address(server)])
+        self.addCleanup(exporter.close)
+        
+        exporter.collect_metrics()
+        exporter.collect_metrics()
+        metrics = exporter.get_metrics()
+        
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.commands[:2], ['status 3', 'load-stats'])
+        address = self.tcp_address(server)
+        self.assertIn(f'openvpn_up{{job="openvpn-metrics",status_path="{address}"}} 1.0', metrics)
+        self.assertIn(f'openvpn_openvpn_server_connected_clients{{job="openvpn-metrics",status_path="{address}"}} 1.0',
+                      metrics)
+        self.assertIn('common_name="client1"', metrics)
+        self.assertIn(f'openvpn_server_received_bytes_total{{job="openvpn-metrics",status_path="{address}"}} 5000.0',
+                      metrics)
+    
+    def test_unix_socket_with_password(self):
+        """Test unix socket addresses and password authentication"""
+        path = os.path.join(tempfile.mkdtemp(), 'management.sock')
+        self.start_server(socketserver.ThreadingUnixStreamServer, path, password='secret')
+        
+        client = ManagementClient(f"unix://{path}", password='secret')
+        self.addCleanup(client.close)
+        self.assertEqual(client.command('load-stats'), ["SUCCESS: nclients=1,bytesin=5000,bytesout=7000"])
+        with self.assertRaises(ValueError):
+            client.command('bogus')
+        # An ERROR response leaves the connection usable
+        self.assertEqual(len(client.command('status 3')), len(FakeManagementHandler.STATUS) - 1)
+    
+    def test_reconnect_backoff(self):
+        """Test a dropped connection is re-established once the backoff expires"""
+        server = self.start_server()
+        server.drop_after_command = True
+        client = ManagementClient(self.tcp_address(server), timeout=1.0)
+        client.MIN_BACKOFF = 0.1
+        self.addCleanup(client.close)
+        
+        client.command('load-stats')
+        with self.assertRaises(ConnectionError):
+            client.command('load-stats')  # Server closed the connection
+        with self.assertRaises(ConnectionError):
+            client.command('load-stats')  # Still backing off
+        time.sleep(0.2)
+        self.assertTrue(client.command('load-stats')[0].startswith('SUCCESS:'))
+        self.assertEqual(server.connections, 2)
+    
+    def test_invalid_address(self):
+        """Test unsupported management addresses are rejected"""
+        with self.assertRaises(ValueError):
+            ManagementClient("127.0.0.1:7505")
+
+class TestStatusFileWatchers(unittest.TestCase):
+    """Test status file change detection"""
+    
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+        self.status_path = os.path.join(self.tmpdir, "server.status")
+        self.other_path = os.path.join(self.tmpdir, "other.status")
+        for path in (self.status_path, self.other_path):
+            with open(path, "w") as f:
+                f.write("OpenVPN STATISTICS\nEND\n")
+    
+    def check_watcher(self, watcher):
+        self.addCleanup(watcher.close)
+        self.assertEqual(watcher.wait(0.05), set())
+        
+        # Truncate and rewrite in place
+        with open(self.status_path, "w") as f:
+            f.write("OpenVPN STATISTICS\nTUN/TAP read bytes,1\nEND\n")
+        self.assertEqual(watcher.wait(2), {self.status_path})
+        
+        # Write a temporary file, then rename it over the status file
+        replacement = os.path.join(self.tmpdir, "server.status.tmp")
+        with open(replacement, "w") as f:
+            f.write("OpenVPN STATISTICS\nTUN/TAP read bytes,22\nEND\n")
+        os.replace(replacement, self.status_path)
+        self.assertEqual(watcher.wait(2), {self.status_path})
+    
+    def test_polling_watcher(self):
+        """Test stat polling detects rewrites and replacements"""
+        self.check_watcher(PollingWatcher([self.status_path, self.other_path], poll_interval=0.01))
+    
+    @unittest.skipUnless(InotifyWatcher.available(), "inotify not available")
+    def test_inotify_watcher(self):
+        """Test inotify detects rewrites and replacements"""
+        self.check_watcher(InotifyWatcher([self.status_path, self.other_path]))
+    
+    @unittest.skipUnless(InotifyWatcher.available(), "inotify not available")
+    def test_inotify_debounces_bursts(self):
+        """Test a burst of writes is reported as a single change"""
+        watcher = InotifyWatcher([self.status_path, self.other_path], debounce=0.1)
+        self.addCleanup(watcher.close)
+        with open(self.status_path, "w") as f:
+            for i in range(20):
+                f.write(f"line {i}\n")
+                f.flush()
+        self.assertEqual(watcher.wait(2), {self.status_path})
+        self.assertEqual(watcher.wait(0.05), set())
+    
+    @unittest.skipUnless(InotifyWatcher.available(), "inotify not available")
+    def test_inotify_rewatches_recreated_directory(self):
+        """Test a removed and recreated status directory is watched again"""
+        directory = os.path.join(self.tmpdir, "openvpn")
+        status_path = os.path.join(directory, "server.status")
+        os.mkdir(directory)
+        with open(status_path, "w") as f:
+            f.write("OpenVPN STATISTICS\nEND\n")
+        watcher = InotifyWatcher([status_path], debounce=0)
+        watcher.REWATCH_INTERVAL = 0.05
+        self.addCleanup(watcher.close)
+        
+        os.remove(status_path)
+        os.rmdir(directory)
+        self.assertEqual(watcher.wait(2), {status_path})
+        self.assertEqual(watcher.wait(0.1), set())
+        
+        # Recreated: the directory is watched again and its files reported
+        os.mkdir(directory)
+        with open(status_path, "w") as f:
+            f.write("OpenVPN STATISTICS\nEND\n")
+        self.assertEqual(watcher.wait(2), {status_path})
+        
+        with open(status_path, "w") as f:
+            f.write("OpenVPN STATISTICS\nTUN/TAP read bytes,1\nEND\n")
+        self.assertEqual(watcher.wait(2), {status_path})
+
 class TestIntegration(unittest.TestCase):
     """Integration tests"""
     
@@ -170,9 +1598,9 @@ class TestIntegration(unittest.TestCase):
         """Test complete workflow with real example files"""
         # Check if example files exist
         example_files = [
-            "examples/client.status",
-            "examples/server2.status", 
-            "examples/server3.status"
+            "examples/status/client.status",
+            "examples/status/server2.status",
+            "examples/status/server3.status"
         ]
         
         existing_files = [f for f in example_files if os.path.exists(f)]
@@ -196,8 +1624,24 @@ if __name__ == '__main__':
     
     # Add test cases
     suite.addTest(unittest.makeSuite(TestSecurityValidator))
+    suite.addTest(unittest.makeSuite(TestRateLimiter))
+    suite.addTest(unittest.makeSuite(TestIPAccessControl))
     suite.addTest(unittest.makeSuite(TestOpenVPNStatusParser))
+    suite.addTest(unittest.makeSuite(TestParseLogging))
+    suite.addTest(unittest.makeSuite(TestStaleSeriesEviction))
+    suite.addTest(unittest.makeSuite(TestSnapshotDiff))
+    suite.addTest(unittest.makeSuite(TestThroughputRates))
+    suite.addTest(unittest.makeSuite(TestParseCache))
     suite.addTest(unittest.makeSuite(TestOpenVPNExporter))
+    suite.addTest(unittest.makeSuite(TestSelfInstrumentation))
+    suite.addTest(unittest.makeSuite(TestParallelCollection))
+    suite.addTest(unittest.makeSuite(TestBackgroundCollector))
+    suite.addTest(unittest.makeSuite(TestMetricsResponseCache))
+    suite.addTest(unittest.makeSuite(TestExpositionFormats))
+    suite.addTest(unittest.makeSuite(TestSharedCollector))
+    suite.addTest(unittest.makeSuite(TestAsyncServer))
+    suite.addTest(unittest.makeSuite(TestManagementInterface))
+    suite.addTest(unittest.makeSuite(TestStatusFileWatchers))
     suite.addTest(unittest.makeSuite(TestIntegration))
     
     # Run tests